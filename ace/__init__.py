@@ -1,42 +1,104 @@
 """Agentic Context Engineering (ACE) reproduction framework."""
 
-from .playbook import Bullet, Playbook
-from .delta import DeltaOperation, DeltaBatch
-from .llm import LLMClient, DummyLLMClient, TransformersLLMClient
-from .roles import (
-    Generator,
-    Reflector,
-    Curator,
-    GeneratorOutput,
-    ReflectorOutput,
-    CuratorOutput,
-)
-from .adaptation import (
-    OfflineAdapter,
-    OnlineAdapter,
-    Sample,
-    TaskEnvironment,
-    EnvironmentResult,
-    AdapterStepResult,
-)
-from .logic import (
-    FaultSpec,
-    LogicDiagnosisEnvironment,
-    TesterResponse,
-    ActionDecision,
-    LogicDiagnosisGenerator,
-    LOGIC_DECISION_PROMPT,
-    LOGIC_ACTION_PROMPTS,
-)
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING, Any, Dict, List
 
-# Import production LLM clients if available
-try:
+if TYPE_CHECKING:
+    from .playbook import Bullet, Playbook
+    from .delta import DeltaOperation, DeltaBatch
+    from .llm import (
+        BatchingLLMClient,
+        DummyLLMClient,
+        LLMClient,
+        TransformersLLMClient,
+    )
+    from .cache import LLMCache
+    from .roles import (
+        Generator,
+        Reflector,
+        Curator,
+        GeneratorOutput,
+        ReflectorOutput,
+        CuratorOutput,
+    )
+    from .adaptation import (
+        OfflineAdapter,
+        OnlineAdapter,
+        Sample,
+        TaskEnvironment,
+        EnvironmentResult,
+        AdapterStepResult,
+    )
+    from .logic import (
+        FaultSpec,
+        LogicDiagnosisEnvironment,
+        TesterResponse,
+        TesterResponseColumns,
+        ActionDecision,
+        LogicDiagnosisGenerator,
+        LOGIC_DECISION_PROMPT,
+        LOGIC_ACTION_PROMPTS,
+        LOGIC_FUSED_PROMPT,
+    )
     from .llm_providers import LiteLLMClient
 
-    LITELLM_AVAILABLE = True
-except ImportError:
-    LiteLLMClient = None
-    LITELLM_AVAILABLE = False
+# Public names resolved on first access (PEP 562), mapped to their submodule
+_LAZY_ATTRS: Dict[str, str] = {
+    "Bullet": ".playbook",
+    "Playbook": ".playbook",
+    "DeltaOperation": ".delta",
+    "DeltaBatch": ".delta",
+    "LLMClient": ".llm",
+    "DummyLLMClient": ".llm",
+    "BatchingLLMClient": ".llm",
+    "TransformersLLMClient": ".llm",
+    "LLMCache": ".cache",
+    "Generator": ".roles",
+    "Reflector": ".roles",
+    "Curator": ".roles",
+    "GeneratorOutput": ".roles",
+    "ReflectorOutput": ".roles",
+    "CuratorOutput": ".roles",
+    "OfflineAdapter": ".adaptation",
+    "OnlineAdapter": ".adaptation",
+    "Sample": ".adaptation",
+    "TaskEnvironment": ".adaptation",
+    "EnvironmentResult": ".adaptation",
+    "AdapterStepResult": ".adaptation",
+    "FaultSpec": ".logic",
+    "LogicDiagnosisEnvironment": ".logic",
+    "TesterResponse": ".logic",
+    "TesterResponseColumns": ".logic",
+    "ActionDecision": ".logic",
+    "LogicDiagnosisGenerator": ".logic",
+    "LOGIC_DECISION_PROMPT": ".logic",
+    "LOGIC_ACTION_PROMPTS": ".logic",
+    "LOGIC_FUSED_PROMPT": ".logic",
+}
+
+# Production LLM clients are optional; probe for LiteLLM without importing it
+LITELLM_AVAILABLE = importlib.util.find_spec("litellm") is not None
+
+
+def __getattr__(name: str) -> Any:
+    if name == "LiteLLMClient":
+        # Import LiteLLMClient (and LiteLLM itself) on first access only
+        value = None
+        if LITELLM_AVAILABLE:
+            value = importlib.import_module(".llm_providers", __name__).LiteLLMClient
+    elif name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "Bullet",
@@ -45,7 +107,9 @@ __all__ = [
     "DeltaBatch",
     "LLMClient",
     "DummyLLMClient",
+    "BatchingLLMClient",
     "TransformersLLMClient",
+    "LLMCache",
     "LiteLLMClient",
     "Generator",
     "Reflector",
@@ -56,10 +120,12 @@ __all__ = [
     "FaultSpec",
     "LogicDiagnosisEnvironment",
     "TesterResponse",
+    "TesterResponseColumns",
     "ActionDecision",
     "LogicDiagnosisGenerator",
     "LOGIC_DECISION_PROMPT",
     "LOGIC_ACTION_PROMPTS",
+    "LOGIC_FUSED_PROMPT",
     "OfflineAdapter",
     "OnlineAdapter",
     "Sample",
@@ -0,0 +1,51 @@
+"""Run coroutines from synchronous code, even inside a running event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Event loop thread used when synchronous calls are routed through async code
+_BACKGROUND_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_BACKGROUND_LOOP_LOCK = threading.Lock()
+
+
+def background_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting it on first use."""
+    global _BACKGROUND_LOOP
+    if _BACKGROUND_LOOP is None:
+        with _BACKGROUND_LOOP_LOCK:
+            if _BACKGROUND_LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="ace-background-loop", daemon=True
+                ).start()
+                _BACKGROUND_LOOP = loop
+    return _BACKGROUND_LOOP
+
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """Run ``coro`` on the background event loop and wait for its result.
+
+    Unlike ``asyncio.run`` this works when the caller already runs an event
+    loop (Jupyter, async web servers), and loop-bound resources such as
+    async connection pools survive between calls.
+    """
+    loop = background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync cannot block the background loop it runs on")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional, Sequence
+from itertools import islice
+from typing import (
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+)
 
+from .compat import DATACLASS_SLOTS
+from .json_utils import dumps
 from .playbook import Playbook
 from .roles import (
     Curator,
@@ -18,7 +31,7 @@ from .roles import (
 )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Sample:
     """Single task instance presented to ACE."""
 
@@ -26,9 +39,22 @@ class Sample:
     context: str = ""
     ground_truth: Optional[str] = None
     metadata: Dict[str, object] = field(default_factory=dict)
+    _metadata_json: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def metadata_json(self) -> str:
+        """Return ``metadata`` serialized as JSON, computed once per sample.
 
+        The cached text is reused across epochs, so mutate ``metadata``
+        before the sample is first processed.
+        """
+        if self._metadata_json is None:
+            self._metadata_json = dumps(self.metadata)
+        return self._metadata_json
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class EnvironmentResult:
     """Feedback returned by the task environment after executing the generator output."""
 
@@ -84,14 +110,14 @@ class TaskEnvironment(ABC):
         """
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AdapterStepResult:
     sample: Sample
     generator_output: GeneratorOutput
     environment_result: EnvironmentResult
     reflection: ReflectorOutput
     curator_output: CuratorOutput
-    playbook_snapshot: str
+    playbook_snapshot: Optional[str] = None
 
 
 class AdapterBase:
@@ -106,6 +132,8 @@ class AdapterBase:
         curator: Curator,
         max_refinement_rounds: int = 1,
         reflection_window: int = 3,
+        snapshot_playbook: bool = False,
+        fuse_reflect_curate: bool = False,
     ) -> None:
         self.playbook = playbook or Playbook()
         self.generator = generator
@@ -113,19 +141,23 @@ class AdapterBase:
         self.curator = curator
         self.max_refinement_rounds = max_refinement_rounds
         self.reflection_window = reflection_window
-        self._recent_reflections: List[str] = []
+        self.snapshot_playbook = snapshot_playbook
+        self.fuse_reflect_curate = fuse_reflect_curate
+        self._recent_reflections: Deque[str] = deque(maxlen=reflection_window)
+        self._reflection_context_cached = ""
 
     # ------------------------------------------------------------------ #
     def _reflection_context(self) -> str:
-        return "\n---\n".join(self._recent_reflections)
+        return self._reflection_context_cached
 
     def _update_recent_reflections(self, reflection: ReflectorOutput) -> None:
-        serialized = json.dumps(reflection.raw, ensure_ascii=False)
-        self._recent_reflections.append(serialized)
-        if len(self._recent_reflections) > self.reflection_window:
-            self._recent_reflections = self._recent_reflections[
-                -self.reflection_window :
-            ]
+        serialized = dumps(reflection.raw, sort_keys=True)
+        recent = self._recent_reflections
+        if recent and recent[-1] == serialized:
+            # Repeating the previous reflection only adds prompt tokens.
+            return
+        recent.append(serialized)
+        self._reflection_context_cached = "\n---\n".join(self._recent_reflections)
 
     def _apply_bullet_tags(self, reflection: ReflectorOutput) -> None:
         for tag in reflection.bullet_tags:
@@ -134,16 +166,24 @@ class AdapterBase:
             except ValueError:
                 continue
 
+    def _playbook_snapshot(self) -> Optional[str]:
+        if not self.snapshot_playbook:
+            return None
+        return self.playbook.as_prompt()
+
     def _question_context(
         self, sample: Sample, environment_result: EnvironmentResult
     ) -> str:
-        parts = [
-            f"question: {sample.question}",
-            f"context: {sample.context}",
-            f"metadata: {json.dumps(sample.metadata)}",
-            f"feedback: {environment_result.feedback}",
-            f"ground_truth: {environment_result.ground_truth}",
-        ]
+        # Empty fields are left out entirely; they only add prompt tokens.
+        parts = [f"question: {sample.question}"]
+        if sample.context:
+            parts.append(f"context: {sample.context}")
+        if sample.metadata:
+            parts.append(f"metadata: {sample.metadata_json()}")
+        if environment_result.feedback:
+            parts.append(f"feedback: {environment_result.feedback}")
+        if environment_result.ground_truth is not None:
+            parts.append(f"ground_truth: {environment_result.ground_truth}")
         return "\n".join(parts)
 
     def _progress_string(
@@ -168,32 +208,220 @@ class AdapterBase:
             reflection=self._reflection_context(),
         )
         env_result = environment.evaluate(sample, generator_output)
-        reflection = self.reflector.reflect(
-            question=sample.question,
-            generator_output=generator_output,
-            playbook=self.playbook,
-            ground_truth=env_result.ground_truth,
-            feedback=env_result.feedback,
-            max_refinement_rounds=self.max_refinement_rounds,
-        )
-        self._apply_bullet_tags(reflection)
-        self._update_recent_reflections(reflection)
-        curator_output = self.curator.curate(
-            reflection=reflection,
-            playbook=self.playbook,
-            question_context=self._question_context(sample, env_result),
+        return self._reflect_and_curate_step(
+            sample,
+            generator_output,
+            env_result,
             progress=self._progress_string(
                 epoch, total_epochs, step_index, total_steps
             ),
         )
-        self.playbook.apply_delta(curator_output.delta)
+
+    def _reflect_and_curate_step(
+        self,
+        sample: Sample,
+        generator_output: GeneratorOutput,
+        env_result: EnvironmentResult,
+        *,
+        progress: str,
+        reflection: Optional[ReflectorOutput] = None,
+    ) -> AdapterStepResult:
+        """Reflect on one evaluated sample, curate, and apply the delta.
+
+        A ``reflection`` computed upfront (e.g. by a batched Reflector call) is
+        used as-is. Otherwise ``fuse_reflect_curate`` is tried first, falling
+        back to separate reflect and curate calls when it fails.
+        """
+        playbook = self.playbook
+        question_context = self._question_context(sample, env_result)
+        fused = None
+        if reflection is None and self.fuse_reflect_curate:
+            try:
+                fused = self.reflector.reflect_and_curate(
+                    question=sample.question,
+                    generator_output=generator_output,
+                    playbook=playbook,
+                    ground_truth=env_result.ground_truth,
+                    feedback=env_result.feedback,
+                    question_context=question_context,
+                    progress=progress,
+                )
+            except ValueError:
+                fused = None
+        if fused is not None:
+            reflection, curator_output = fused
+            self._apply_bullet_tags(reflection)
+            self._update_recent_reflections(reflection)
+        else:
+            if reflection is None:
+                reflection = self.reflector.reflect(
+                    question=sample.question,
+                    generator_output=generator_output,
+                    playbook=playbook,
+                    ground_truth=env_result.ground_truth,
+                    feedback=env_result.feedback,
+                    max_refinement_rounds=self.max_refinement_rounds,
+                )
+            self._apply_bullet_tags(reflection)
+            self._update_recent_reflections(reflection)
+            curator_output = self.curator.curate(
+                reflection=reflection,
+                playbook=playbook,
+                question_context=question_context,
+                progress=progress,
+            )
+        playbook.apply_delta(curator_output.delta)
         return AdapterStepResult(
             sample=sample,
             generator_output=generator_output,
             environment_result=env_result,
             reflection=reflection,
             curator_output=curator_output,
-            playbook_snapshot=self.playbook.as_prompt(),
+            playbook_snapshot=self._playbook_snapshot(),
+        )
+
+    def _process_batch(
+        self,
+        samples: Sequence[Sample],
+        environment: TaskEnvironment,
+        *,
+        epoch: int,
+        total_epochs: int,
+        start_index: int,
+        total_steps: int,
+    ) -> List[AdapterStepResult]:
+        """Process a chunk of samples with batched Generator and Reflector calls.
+
+        Only the Curator stage runs per sample, because it mutates the playbook.
+        With ``fuse_reflect_curate`` the Reflector is not batched either: each
+        sample gets its own fused reflect-and-curate call.
+        """
+        reflection_context = self._reflection_context()
+        generator_outputs = self.generator.generate_batch(
+            [
+                {
+                    "question": sample.question,
+                    "context": sample.context,
+                    "playbook": self.playbook,
+                    "reflection": reflection_context,
+                }
+                for sample in samples
+            ]
+        )
+        env_results = [
+            environment.evaluate(sample, generator_output)
+            for sample, generator_output in zip(samples, generator_outputs)
+        ]
+        reflections: Sequence[Optional[ReflectorOutput]]
+        if self.fuse_reflect_curate:
+            reflections = [None] * len(samples)
+        else:
+            reflections = self.reflector.reflect_batch(
+                [
+                    {
+                        "question": sample.question,
+                        "generator_output": generator_output,
+                        "playbook": self.playbook,
+                        "ground_truth": env_result.ground_truth,
+                        "feedback": env_result.feedback,
+                    }
+                    for sample, generator_output, env_result in zip(
+                        samples, generator_outputs, env_results
+                    )
+                ],
+                max_refinement_rounds=self.max_refinement_rounds,
+            )
+        return [
+            self._reflect_and_curate_step(
+                sample,
+                generator_output,
+                env_result,
+                progress=self._progress_string(
+                    epoch, total_epochs, start_index + offset, total_steps
+                ),
+                reflection=reflection,
+            )
+            for offset, (sample, generator_output, env_result, reflection) in enumerate(
+                zip(samples, generator_outputs, env_results, reflections)
+            )
+        ]
+
+    async def _aprocess_sample(
+        self,
+        sample: Sample,
+        environment: TaskEnvironment,
+        *,
+        epoch: int,
+        total_epochs: int,
+        step_index: int,
+        total_steps: int,
+        semaphore: asyncio.Semaphore,
+        lock: asyncio.Lock,
+    ) -> AdapterStepResult:
+        """Async counterpart of :meth:`_process_sample`.
+
+        Only the LLM round-trips run concurrently; every playbook mutation is
+        taken under ``lock`` so concurrent samples see consistent state.
+        """
+        async with semaphore:
+            generator_output = await self.generator.agenerate(
+                question=sample.question,
+                context=sample.context,
+                playbook=self.playbook,
+                reflection=self._reflection_context(),
+            )
+            env_result = environment.evaluate(sample, generator_output)
+            question_context = self._question_context(sample, env_result)
+            progress = self._progress_string(
+                epoch, total_epochs, step_index, total_steps
+            )
+            fused = None
+            if self.fuse_reflect_curate:
+                try:
+                    fused = await self.reflector.areflect_and_curate(
+                        question=sample.question,
+                        generator_output=generator_output,
+                        playbook=self.playbook,
+                        ground_truth=env_result.ground_truth,
+                        feedback=env_result.feedback,
+                        question_context=question_context,
+                        progress=progress,
+                    )
+                except ValueError:
+                    fused = None
+            if fused is not None:
+                reflection, curator_output = fused
+                async with lock:
+                    self._apply_bullet_tags(reflection)
+                    self._update_recent_reflections(reflection)
+            else:
+                reflection = await self.reflector.areflect(
+                    question=sample.question,
+                    generator_output=generator_output,
+                    playbook=self.playbook,
+                    ground_truth=env_result.ground_truth,
+                    feedback=env_result.feedback,
+                    max_refinement_rounds=self.max_refinement_rounds,
+                )
+                async with lock:
+                    self._apply_bullet_tags(reflection)
+                    self._update_recent_reflections(reflection)
+                curator_output = await self.curator.acurate(
+                    reflection=reflection,
+                    playbook=self.playbook,
+                    question_context=question_context,
+                    progress=progress,
+                )
+            async with lock:
+                self.playbook.apply_delta(curator_output.delta)
+                playbook_snapshot = self._playbook_snapshot()
+        return AdapterStepResult(
+            sample=sample,
+            generator_output=generator_output,
+            environment_result=env_result,
+            reflection=reflection,
+            curator_output=curator_output,
+            playbook_snapshot=playbook_snapshot,
         )
 
 
@@ -213,6 +441,11 @@ class OfflineAdapter(AdapterBase):
         curator: Curator instance for updating playbook
         max_refinement_rounds: Max reflection refinement attempts (default: 1)
         reflection_window: Number of recent reflections to maintain (default: 3)
+        snapshot_playbook: Store the rendered playbook on every step result as
+            ``playbook_snapshot`` (default: False, leaving it ``None``)
+        fuse_reflect_curate: Reflect and curate with one combined LLM call,
+            falling back to separate calls if the response cannot be parsed
+            (default: False)
 
     Example:
         >>> from ace import OfflineAdapter, Generator, Reflector, Curator
@@ -255,6 +488,7 @@ class OfflineAdapter(AdapterBase):
         samples: Sequence[Sample],
         environment: TaskEnvironment,
         epochs: int = 1,
+        batch_size: int = 1,
     ) -> List[AdapterStepResult]:
         """
         Run offline adaptation over training samples.
@@ -263,6 +497,10 @@ class OfflineAdapter(AdapterBase):
             samples: Training samples to process
             environment: Environment for evaluating generator outputs
             epochs: Number of times to iterate over samples (default: 1)
+            batch_size: Samples per batched Generator/Reflector call. Values
+                above 1 submit each chunk through ``llm.batch_complete``; the
+                Curator still runs sample by sample, and so does the fused
+                call when ``fuse_reflect_curate`` is set (default: 1)
 
         Returns:
             List of AdapterStepResult for each processed sample
@@ -272,18 +510,81 @@ class OfflineAdapter(AdapterBase):
             Access the evolved playbook via adapter.playbook after running.
         """
         results: List[AdapterStepResult] = []
+        append = results.append
+        process = self._process_sample
         total_steps = len(samples)
         for epoch_idx in range(1, epochs + 1):
+            if batch_size > 1:
+                for start in range(0, total_steps, batch_size):
+                    results.extend(
+                        self._process_batch(
+                            samples[start : start + batch_size],
+                            environment,
+                            epoch=epoch_idx,
+                            total_epochs=epochs,
+                            start_index=start + 1,
+                            total_steps=total_steps,
+                        )
+                    )
+                continue
             for step_idx, sample in enumerate(samples, start=1):
-                result = self._process_sample(
-                    sample,
-                    environment,
-                    epoch=epoch_idx,
-                    total_epochs=epochs,
-                    step_index=step_idx,
-                    total_steps=total_steps,
+                append(
+                    process(
+                        sample,
+                        environment,
+                        epoch=epoch_idx,
+                        total_epochs=epochs,
+                        step_index=step_idx,
+                        total_steps=total_steps,
+                    )
                 )
-                results.append(result)
+        return results
+
+    async def arun(
+        self,
+        samples: Sequence[Sample],
+        environment: TaskEnvironment,
+        epochs: int = 1,
+        *,
+        max_concurrency: int = 8,
+    ) -> List[AdapterStepResult]:
+        """
+        Async variant of :meth:`run` that processes samples concurrently.
+
+        Samples within an epoch are fanned out with ``asyncio.gather``; at most
+        ``max_concurrency`` of them are in flight at once, which keeps the
+        request rate within provider limits. Epochs still run one after another.
+
+        Args:
+            samples: Training samples to process
+            environment: Environment for evaluating generator outputs
+            epochs: Number of times to iterate over samples (default: 1)
+            max_concurrency: Maximum samples processed concurrently (default: 8)
+
+        Returns:
+            List of AdapterStepResult in sample order for each epoch
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        lock = asyncio.Lock()
+        results: List[AdapterStepResult] = []
+        total_steps = len(samples)
+        for epoch_idx in range(1, epochs + 1):
+            epoch_results = await asyncio.gather(
+                *(
+                    self._aprocess_sample(
+                        sample,
+                        environment,
+                        epoch=epoch_idx,
+                        total_epochs=epochs,
+                        step_index=step_idx,
+                        total_steps=total_steps,
+                        semaphore=semaphore,
+                        lock=lock,
+                    )
+                    for step_idx, sample in enumerate(samples, start=1)
+                )
+            )
+            results.extend(epoch_results)
         return results
 
 
@@ -303,6 +604,11 @@ class OnlineAdapter(AdapterBase):
         curator: Curator instance for updating playbook
         max_refinement_rounds: Max reflection refinement attempts (default: 1)
         reflection_window: Number of recent reflections to maintain (default: 3)
+        snapshot_playbook: Store the rendered playbook on every step result as
+            ``playbook_snapshot`` (default: False, leaving it ``None``)
+        fuse_reflect_curate: Reflect and curate with one combined LLM call,
+            falling back to separate calls if the response cannot be parsed
+            (default: False)
 
     Example:
         >>> from ace import OnlineAdapter, Generator, Reflector, Curator
@@ -341,7 +647,7 @@ class OnlineAdapter(AdapterBase):
         self,
         samples: Iterable[Sample],
         environment: TaskEnvironment,
-    ) -> List[AdapterStepResult]:
+    ) -> Iterator[AdapterStepResult]:
         """
         Run online adaptation over a stream of samples.
 
@@ -349,18 +655,19 @@ class OnlineAdapter(AdapterBase):
             samples: Iterable of samples (can be infinite stream)
             environment: Environment for evaluating generator outputs
 
-        Returns:
-            List of AdapterStepResult for each processed sample
+        Yields:
+            AdapterStepResult for each processed sample, as soon as it is ready
 
         Note:
             - Processes samples sequentially, updating after each one
             - The playbook evolves continuously during processing
-            - Can handle infinite streams for continuous deployment
+            - Results are yielded rather than accumulated, so memory stays
+              constant on infinite streams; nothing runs until you iterate
+            - Use run_collect() when you want a list
         """
-        results: List[AdapterStepResult] = []
-        step_idx = 0
+        process = self._process_sample
         for step_idx, sample in enumerate(samples, start=1):
-            result = self._process_sample(
+            yield process(
                 sample,
                 environment,
                 epoch=1,
@@ -368,5 +675,82 @@ class OnlineAdapter(AdapterBase):
                 step_index=step_idx,
                 total_steps=step_idx,
             )
-            results.append(result)
-        return results
+
+    def run_collect(
+        self,
+        samples: Iterable[Sample],
+        environment: TaskEnvironment,
+    ) -> List[AdapterStepResult]:
+        """Run online adaptation and return all results as a list.
+
+        Only use this with finite sample streams.
+        """
+        return list(self.run(samples, environment))
+
+    async def arun(
+        self,
+        samples: Iterable[Sample],
+        environment: TaskEnvironment,
+        *,
+        max_concurrency: int = 8,
+    ) -> AsyncIterator[AdapterStepResult]:
+        """
+        Async variant of :meth:`run` that processes samples concurrently.
+
+        The stream is consumed in windows of ``max_concurrency`` samples; each
+        window is processed with ``asyncio.gather`` and its results are
+        yielded before the next one is pulled, so infinite iterables run in
+        constant memory.
+
+        Args:
+            samples: Iterable of samples (can be infinite stream)
+            environment: Environment for evaluating generator outputs
+            max_concurrency: Maximum samples processed concurrently (default: 8)
+
+        Yields:
+            AdapterStepResult in arrival order, one window at a time
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        lock = asyncio.Lock()
+        iterator = iter(samples)
+        step_idx = 0
+        while True:
+            window = list(islice(iterator, max_concurrency))
+            if not window:
+                return
+            window_results = await asyncio.gather(
+                *(
+                    self._aprocess_sample(
+                        sample,
+                        environment,
+                        epoch=1,
+                        total_epochs=1,
+                        step_index=step_idx + offset,
+                        total_steps=step_idx + offset,
+                        semaphore=semaphore,
+                        lock=lock,
+                    )
+                    for offset, sample in enumerate(window, start=1)
+                )
+            )
+            step_idx += len(window)
+            for result in window_results:
+                yield result
+
+    async def arun_collect(
+        self,
+        samples: Iterable[Sample],
+        environment: TaskEnvironment,
+        *,
+        max_concurrency: int = 8,
+    ) -> List[AdapterStepResult]:
+        """Run :meth:`arun` and return all results as a list.
+
+        Only use this with finite sample streams.
+        """
+        return [
+            result
+            async for result in self.arun(
+                samples, environment, max_concurrency=max_concurrency
+            )
+        ]
@@ -0,0 +1,233 @@
+"""In-memory response cache for deterministic LLM completions."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import pickle
+import shelve
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple, Union
+
+from .llm import LLMResponse
+
+# Call parameters that do not change what the model generates
+_NON_SEMANTIC_PARAMS = frozenset({"api_key", "timeout", "num_retries", "drop_params"})
+
+# A cached response, or its compressed form when the cache compresses
+_Stored = Union[LLMResponse, bytes]
+
+
+class LLMCache:
+    """
+    LRU cache with a per-entry TTL for completed LLM responses.
+
+    Entries are keyed by a SHA-256 digest of the call parameters, so only
+    requests that would produce the same output share an entry. A plain lock
+    guards the store; every operation is a few dict updates, which keeps it
+    safe for both threads and coroutines without awaiting.
+
+    With ``path`` set, responses are also written to a ``shelve`` database so
+    they survive restarts; memory misses fall through to it.
+
+    With ``compress`` set, in-memory entries are held as zlib-compressed
+    pickles of the text and a plain copy of ``raw``. Each hit then pays for a
+    decompression, but long replies take a fraction of the memory, so more
+    entries fit in the same budget.
+
+    :meth:`get_or_call` and :meth:`aget_or_call` also coalesce concurrent
+    misses: while one caller computes a key, others asking for the same key
+    wait for its result instead of issuing a duplicate request.
+
+    Args:
+        max_entries: Maximum number of in-memory responses (default: 10,000)
+        ttl: Seconds before an entry expires (default: 3600)
+        path: Optional file path for the persistent tier
+        compress: Compress in-memory entries (default: False)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: float = 3600,
+        path: Optional[str] = None,
+        compress: bool = False,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.compress = compress
+        self._entries: "OrderedDict[str, Tuple[float, _Stored]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._shelf: Optional[shelve.Shelf] = None
+        self._pending: Dict[str, "Future[LLMResponse]"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(params: Mapping[str, Any]) -> str:
+        """Return the cache key for a set of LiteLLM call parameters."""
+        payload = {k: v for k, v in params.items() if k not in _NON_SEMANTIC_PARAMS}
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """Return a copy of the cached response, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                entry = self._load(key)
+                if entry is None:
+                    self.misses += 1
+                    return None
+                self._remember(key, entry)
+            self._entries.move_to_end(key)
+            self.hits += 1
+        stored = entry[1]
+        if isinstance(stored, bytes):
+            text, raw = pickle.loads(zlib.decompress(stored))
+            return LLMResponse(text=text, raw=raw)
+        return _copy(stored)
+
+    def put(self, key: str, response: LLMResponse) -> None:
+        """Store ``response``, evicting the least recently used entry if full."""
+        raw = None
+        if response.raw is not None and (self.compress or self.path is not None):
+            raw = dict(response.raw)
+        stored = _pack(response.text, raw) if self.compress else response
+        with self._lock:
+            self._remember(key, (time.monotonic() + self.ttl, stored))
+            if self.path is not None:
+                # Wall-clock expiry: monotonic time does not carry across runs
+                self._open_shelf()[key] = (time.time() + self.ttl, response.text, raw)
+
+    def get_or_call(self, key: str, call: Callable[[], LLMResponse]) -> LLMResponse:
+        """Return the cached response for ``key``, running ``call`` on a miss.
+
+        Concurrent misses on the same key share one ``call``; its exception,
+        if any, is raised in every waiting caller.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        pending, leader = self._claim(key)
+        if not leader:
+            return _copy(pending.result())
+        try:
+            response = call()
+        except BaseException as exc:
+            self._release(key, pending, exc)
+            raise
+        self._release(key, pending, response)
+        return response
+
+    async def aget_or_call(
+        self, key: str, call: Callable[[], Awaitable[LLMResponse]]
+    ) -> LLMResponse:
+        """Async :meth:`get_or_call`; waiting does not block the event loop."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        pending, leader = self._claim(key)
+        if not leader:
+            return _copy(await asyncio.wrap_future(pending))
+        try:
+            response = await call()
+        except BaseException as exc:
+            self._release(key, pending, exc)
+            raise
+        self._release(key, pending, response)
+        return response
+
+    def _claim(self, key: str) -> Tuple["Future[LLMResponse]", bool]:
+        """Return the in-flight future for ``key`` and whether we now own it."""
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending, False
+            pending = self._pending[key] = Future()
+            return pending, True
+
+    def _release(
+        self,
+        key: str,
+        pending: "Future[LLMResponse]",
+        outcome: Union[LLMResponse, BaseException],
+    ) -> None:
+        """Store the outcome, then wake the callers waiting on ``key``."""
+        if isinstance(outcome, LLMResponse):
+            self.put(key, outcome)
+        with self._lock:
+            self._pending.pop(key, None)
+        if isinstance(outcome, LLMResponse):
+            pending.set_result(outcome)
+        else:
+            pending.set_exception(outcome)
+
+    def _remember(self, key: str, entry: Tuple[float, _Stored]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _open_shelf(self) -> shelve.Shelf:
+        if self._shelf is None:
+            if self.path is None:
+                raise RuntimeError("LLMCache has no path for a persistent tier")
+            self._shelf = shelve.open(self.path)
+        return self._shelf
+
+    def _load(self, key: str) -> Optional[Tuple[float, _Stored]]:
+        """Read an unexpired entry from the persistent tier, if configured."""
+        if self.path is None:
+            return None
+        shelf = self._open_shelf()
+        stored = shelf.get(key)
+        if stored is None:
+            return None
+        expires_at, text, raw = stored
+        remaining = expires_at - time.time()
+        if remaining <= 0:
+            del shelf[key]
+            return None
+        stored = _pack(text, raw) if self.compress else LLMResponse(text=text, raw=raw)
+        return time.monotonic() + remaining, stored
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counts."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        """Drop every entry, including persisted ones, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            if self.path is not None:
+                self._open_shelf().clear()
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """Flush and close the persistent tier, if open."""
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf.close()
+                self._shelf = None
+
+
+def _pack(text: str, raw: Optional[Dict[str, Any]]) -> bytes:
+    return zlib.compress(pickle.dumps((text, raw), pickle.HIGHEST_PROTOCOL))
+
+
+def _copy(response: LLMResponse) -> LLMResponse:
+    """Copy ``response`` so callers cannot mutate the cached entry."""
+    raw = response.raw
+    if isinstance(raw, dict):
+        raw = dict(raw)  # read-only mappings can be shared as-is
+    return LLMResponse(text=response.text, raw=raw)
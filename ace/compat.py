@@ -0,0 +1,9 @@
+"""Compatibility helpers for the supported Python versions."""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict
+
+# ``dataclass(slots=True)`` exists from Python 3.10; older versions keep __dict__.
+DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -0,0 +1,135 @@
+"""JSON helpers that use orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    ORJSON_AVAILABLE = False
+
+# Tokens outside string literals that LLMs get wrong: trailing commas and
+# Python's True/False/None; strings are matched first so they stay intact
+_REPAIR_RE = re.compile(r'("(?:\\.|[^"\\])*")|,(\s*[}\]])|\b(True|False|None)\b')
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+def dumps(value: Any, *, sort_keys: bool = False) -> str:
+    """Serialize ``value`` to compact JSON text, keeping non-ASCII characters.
+
+    With ``sort_keys=True`` the output is canonical, so equal mappings always
+    serialize to the same string regardless of key order.
+    """
+    if orjson is not None:
+        try:
+            option = orjson.OPT_SORT_KEYS if sort_keys else 0
+            return orjson.dumps(value, option=option).decode("utf-8")
+        except TypeError:
+            # e.g. non-string keys; let the stdlib serialize or reject them
+            pass
+    return json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys
+    )
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """Parse JSON text; raises ``ValueError`` on malformed input."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def repair_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Best-effort parse of a malformed JSON object, typically an LLM reply.
+
+    Takes the first ``{...}`` block in ``text`` (closing any string or
+    brackets left open by truncation), drops trailing commas and converts
+    Python ``True``/``False``/``None`` literals. Returns ``None`` if the
+    result still does not parse to an object.
+    """
+    candidate = _first_object(text)
+    if candidate is None:
+        return None
+    candidate = _REPAIR_RE.sub(_repair_token, candidate)
+    try:
+        data = loads(candidate)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _repair_token(match: "re.Match[str]") -> str:
+    string, closer, literal = match.groups()
+    if string is not None:
+        return string
+    if closer is not None:
+        return closer
+    return _PY_LITERALS[literal]
+
+
+def read_json_object(chunks: Iterable[str]) -> str:
+    """Consume streamed ``chunks`` until the first top-level object closes.
+
+    Returns the text read so far, which ends at the closing brace when the
+    object completed; any later chunks are left unread so the caller can
+    close the stream instead of paying for trailing output.
+    """
+    parts: List[str] = []
+    depth = 0
+    in_string = escaped = False
+    for chunk in chunks:
+        for index, char in enumerate(chunk):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = depth > 0
+            elif char == "{" or (char == "[" and depth):
+                depth += 1
+            elif char in "}]" and depth:
+                depth -= 1
+                if not depth:
+                    parts.append(chunk[: index + 1])
+                    return "".join(parts)
+        parts.append(chunk)
+    return "".join(parts)
+
+
+def _first_object(text: str) -> Optional[str]:
+    """Return the first balanced ``{...}`` block, closing it if truncated."""
+    start = text.find("{")
+    if start == -1:
+        return None
+    closers: List[str] = []
+    in_string = escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            closers.append("}")
+        elif char == "[":
+            closers.append("]")
+        elif char in "}]":
+            if not closers or closers.pop() != char:
+                return None
+            if not closers:
+                return text[start : index + 1]
+    return text[start:] + ('"' if in_string else "") + "".join(reversed(closers))
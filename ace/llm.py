@@ -3,18 +3,24 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import asyncio
 import json
+import threading
 from collections import deque
+from concurrent.futures import Future
 from dataclasses import dataclass
-from typing import Any, Deque, Dict, Optional, Union
+from typing import Any, Deque, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
+from ._sync import run_sync
+from .compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class LLMResponse:
     """Container for LLM outputs."""
 
     text: str
-    raw: Optional[Dict[str, Any]] = None
+    raw: Optional[Mapping[str, Any]] = None
 
 
 class LLMClient(ABC):
@@ -27,6 +33,41 @@ class LLMClient(ABC):
     def complete(self, prompt: str, **kwargs: Any) -> LLMResponse:
         """Return the model text for a given prompt."""
 
+    async def acomplete(self, prompt: str, **kwargs: Any) -> LLMResponse:
+        """Async variant of :meth:`complete`.
+
+        Clients with a native async API should override this; the default
+        runs the blocking call in a worker thread so the event loop stays free.
+        """
+        return await asyncio.to_thread(self.complete, prompt, **kwargs)
+
+    def batch_complete(
+        self, prompts: Sequence[str], **kwargs: Any
+    ) -> List[LLMResponse]:
+        """Complete several independent prompts, preserving their order.
+
+        The default runs :meth:`abatch_complete` on the shared background event
+        loop, so it also works when called from inside a running loop; clients
+        backed by a provider batch endpoint should override this.
+        """
+        return run_sync(self.abatch_complete(prompts, **kwargs))
+
+    async def abatch_complete(
+        self, prompts: Sequence[str], max_concurrency: int = 20, **kwargs: Any
+    ) -> List[LLMResponse]:
+        """Complete several prompts concurrently, preserving their order.
+
+        Every prompt is submitted up front with ``asyncio.gather``; a semaphore
+        keeps at most ``max_concurrency`` :meth:`acomplete` calls in flight.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _one(prompt: str) -> LLMResponse:
+            async with semaphore:
+                return await self.acomplete(prompt, **kwargs)
+
+        return list(await asyncio.gather(*(_one(prompt) for prompt in prompts)))
+
 
 class DummyLLMClient(LLMClient):
     """Deterministic LLM stub for testing and dry runs."""
@@ -44,6 +85,95 @@ class DummyLLMClient(LLMClient):
             raise RuntimeError("DummyLLMClient ran out of queued responses.")
         return LLMResponse(text=self._responses.popleft())
 
+    async def acomplete(self, prompt: str, **kwargs: Any) -> LLMResponse:
+        # Answer inline so queued responses are consumed in call order.
+        return self.complete(prompt, **kwargs)
+
+
+class BatchingLLMClient(LLMClient):
+    """
+    Wrapper that coalesces concurrent completions into provider batch calls.
+
+    Calls made from different threads or coroutines within a short window
+    are grouped (only calls with identical kwargs share a batch) and sent as
+    one :meth:`LLMClient.batch_complete` call on the wrapped client. A batch
+    is flushed once it holds ``max_batch_size`` prompts or ``batch_timeout_ms``
+    after its first prompt arrived, whichever comes first.
+
+    Args:
+        client: Client whose ``batch_complete`` serves the grouped prompts
+        max_batch_size: Prompts per provider call (default: 8)
+        batch_timeout_ms: Longest a prompt waits for companions (default: 50)
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        *,
+        max_batch_size: int = 8,
+        batch_timeout_ms: float = 50,
+    ) -> None:
+        super().__init__(model=client.model)
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout_ms / 1000
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Tuple[Dict[str, Any], List[Tuple[str, Future]]]] = {}
+
+    def complete(self, prompt: str, **kwargs: Any) -> LLMResponse:
+        return self._submit(prompt, kwargs).result()
+
+    async def acomplete(self, prompt: str, **kwargs: Any) -> LLMResponse:
+        return await asyncio.wrap_future(self._submit(prompt, kwargs))
+
+    def _submit(self, prompt: str, kwargs: Dict[str, Any]) -> Future:
+        future: Future = Future()
+        key = json.dumps(kwargs, sort_keys=True, default=repr)
+        with self._lock:
+            entry = self._pending.setdefault(key, (kwargs, []))
+            batch = entry[1]
+            batch.append((prompt, future))
+            first = len(batch) == 1
+            full = len(batch) >= self.max_batch_size
+            if full:
+                del self._pending[key]
+        if full:
+            # Never run the provider call on the caller's (possibly event loop)
+            # thread
+            threading.Thread(target=self._run, args=entry, daemon=True).start()
+        elif first:
+            timer = threading.Timer(self.batch_timeout, self._flush, (key, batch))
+            timer.daemon = True
+            timer.start()
+        return future
+
+    def _flush(self, key: str, batch: List[Tuple[str, Future]]) -> None:
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None or entry[1] is not batch:
+                return  # already sent as a full batch
+            del self._pending[key]
+        self._run(*entry)
+
+    def _run(self, kwargs: Dict[str, Any], batch: List[Tuple[str, Future]]) -> None:
+        try:
+            responses = self.client.batch_complete(
+                [prompt for prompt, _ in batch], **kwargs
+            )
+        except BaseException as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for (_, future), response in zip(batch, responses):
+            future.set_result(response)
+        if len(responses) < len(batch):
+            missing = RuntimeError(
+                f"batch_complete returned {len(responses)} responses "
+                f"for {len(batch)} prompts"
+            )
+            for _, future in batch[len(responses) :]:
+                future.set_exception(missing)
+
 
 class TransformersLLMClient(LLMClient):
     """LLM client powered by `transformers` pipelines for chat-style models."""
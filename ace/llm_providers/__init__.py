@@ -1,13 +1,31 @@
 """Production LLM client implementations for ACE."""
 
-from .litellm_client import LiteLLMClient, LiteLLMConfig
+import importlib
+from typing import Any
+
+from ..cache import LLMCache
+from .litellm_client import (
+    BudgetExceeded,
+    CircuitOpenError,
+    LiteLLMClient,
+    LiteLLMConfig,
+)
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: LangChain is optional and heavy, so import it on first access.
+    # The class imports even without LangChain; its constructor says what to install
+    if name == "LangChainLiteLLMClient":
+        client = getattr(importlib.import_module(".langchain_client", __name__), name)
+        globals()[name] = client
+        return client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-try:
-    from .langchain_client import LangChainLiteLLMClient
-except ImportError:
-    LangChainLiteLLMClient = None  # Optional dependency
 
 __all__ = [
+    "BudgetExceeded",
+    "CircuitOpenError",
+    "LLMCache",
     "LiteLLMClient",
     "LiteLLMConfig",
     "LangChainLiteLLMClient",
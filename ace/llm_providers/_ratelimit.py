@@ -0,0 +1,67 @@
+"""Client-side rate limiting for LLM provider calls."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket that spaces out calls instead of letting them hit 429s.
+
+    The bucket holds up to one minute of budget and refills continuously.
+    Callers reserve what they need up front; when the bucket runs dry the
+    balance goes negative and each caller waits until its share has refilled,
+    so waiters are served in arrival order without a queue.
+
+    The refill rate adapts AIMD-style: :meth:`decrease` halves it after a
+    provider rate-limit error and :meth:`increase` recovers it linearly.
+
+    Args:
+        per_minute: Sustained budget per minute (requests or tokens)
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.capacity = float(per_minute)
+        self.max_rate = per_minute / 60.0
+        self.rate = self.max_rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float) -> float:
+        """Take ``amount`` from the bucket; return seconds until it is covered."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= min(amount, self.capacity)
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait without blocking the event loop until ``amount`` is available."""
+        delay = self._reserve(amount)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def acquire_blocking(self, amount: float = 1) -> None:
+        """Like :meth:`acquire`, for synchronous callers."""
+        delay = self._reserve(amount)
+        if delay:
+            time.sleep(delay)
+
+    def decrease(self) -> None:
+        """Halve the refill rate, down to 1/16 of the configured limit."""
+        with self._lock:
+            self.rate = max(self.max_rate / 16, self.rate / 2)
+
+    def increase(self) -> None:
+        """Recover 5% of the configured limit, up to the limit itself."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
@@ -18,6 +18,9 @@ from ..llm import LLMClient, LLMResponse
 
 logger = logging.getLogger(__name__)
 
+# ACE-internal kwargs that must not be forwarded to LangChain
+_ACE_SPECIFIC_PARAMS = frozenset({"refinement_round", "max_refinement_rounds"})
+
 
 class LangChainLiteLLMClient(LLMClient):
     """
@@ -95,8 +98,33 @@ class LangChainLiteLLMClient(LLMClient):
 
     def _filter_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         """Filter out ACE-specific parameters that shouldn't go to LangChain."""
-        ace_specific_params = {"refinement_round", "max_refinement_rounds"}
-        return {k: v for k, v in kwargs.items() if k not in ace_specific_params}
+        if kwargs.keys().isdisjoint(_ACE_SPECIFIC_PARAMS):
+            return kwargs
+        return {k: v for k, v in kwargs.items() if k not in _ACE_SPECIFIC_PARAMS}
+
+    def _build_response_metadata(self, response: Any) -> Dict[str, Any]:
+        """Extract model, finish reason, usage, and router info from a response."""
+        response_metadata = response.response_metadata
+        metadata: Dict[str, Any] = {
+            "model": response_metadata.get("model", self.model),
+            "finish_reason": response_metadata.get("finish_reason"),
+        }
+
+        # Add usage information if available
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            metadata["usage"] = {
+                "prompt_tokens": usage.get("input_tokens"),
+                "completion_tokens": usage.get("output_tokens"),
+                "total_tokens": usage.get("total_tokens"),
+            }
+
+        # Add router information if using router
+        if self.is_router:
+            metadata["router"] = True
+            metadata["model_used"] = response_metadata.get("model_name", self.model)
+
+        return metadata
 
     def complete(self, prompt: str, **kwargs) -> LLMResponse:
         """
@@ -114,28 +142,9 @@ class LangChainLiteLLMClient(LLMClient):
         try:
             response = self.llm.invoke(prompt, **filtered_kwargs)
 
-            # Extract metadata from response
-            metadata = {
-                "model": response.response_metadata.get("model", self.model),
-                "finish_reason": response.response_metadata.get("finish_reason"),
-            }
-
-            # Add usage information if available
-            if hasattr(response, "usage_metadata") and response.usage_metadata:
-                metadata["usage"] = {
-                    "prompt_tokens": response.usage_metadata.get("input_tokens"),
-                    "completion_tokens": response.usage_metadata.get("output_tokens"),
-                    "total_tokens": response.usage_metadata.get("total_tokens"),
-                }
-
-            # Add router information if using router
-            if self.is_router:
-                metadata["router"] = True
-                metadata["model_used"] = response.response_metadata.get(
-                    "model_name", self.model
-                )
-
-            return LLMResponse(text=response.content, raw=metadata)
+            return LLMResponse(
+                text=response.content, raw=self._build_response_metadata(response)
+            )
 
         except Exception as e:
             logger.error(f"Error in LangChain completion: {e}")
@@ -157,28 +166,9 @@ class LangChainLiteLLMClient(LLMClient):
         try:
             response = await self.llm.ainvoke(prompt, **filtered_kwargs)
 
-            # Extract metadata from response
-            metadata = {
-                "model": response.response_metadata.get("model", self.model),
-                "finish_reason": response.response_metadata.get("finish_reason"),
-            }
-
-            # Add usage information if available
-            if hasattr(response, "usage_metadata") and response.usage_metadata:
-                metadata["usage"] = {
-                    "prompt_tokens": response.usage_metadata.get("input_tokens"),
-                    "completion_tokens": response.usage_metadata.get("output_tokens"),
-                    "total_tokens": response.usage_metadata.get("total_tokens"),
-                }
-
-            # Add router information if using router
-            if self.is_router:
-                metadata["router"] = True
-                metadata["model_used"] = response.response_metadata.get(
-                    "model_name", self.model
-                )
-
-            return LLMResponse(text=response.content, raw=metadata)
+            return LLMResponse(
+                text=response.content, raw=self._build_response_metadata(response)
+            )
 
         except Exception as e:
             logger.error(f"Error in async LangChain completion: {e}")
@@ -199,8 +189,9 @@ class LangChainLiteLLMClient(LLMClient):
 
         try:
             for chunk in self.llm.stream(prompt, **filtered_kwargs):
-                if hasattr(chunk, "content") and chunk.content:
-                    yield chunk.content
+                content = getattr(chunk, "content", None)
+                if content:
+                    yield content
         except Exception as e:
             logger.error(f"Error in LangChain streaming: {e}")
             raise
@@ -220,8 +211,9 @@ class LangChainLiteLLMClient(LLMClient):
 
         try:
             async for chunk in self.llm.astream(prompt, **filtered_kwargs):
-                if hasattr(chunk, "content") and chunk.content:
-                    yield chunk.content
+                content = getattr(chunk, "content", None)
+                if content:
+                    yield content
         except Exception as e:
             logger.error(f"Error in async LangChain streaming: {e}")
             raise
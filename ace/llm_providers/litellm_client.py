@@ -4,26 +4,427 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 from dataclasses import dataclass
 import asyncio
+import atexit
+import functools
+import hashlib
+import importlib.util
 import logging
-
+import random
+import re
+import threading
+import time
+import weakref
+from collections.abc import Mapping
+
+from .._sync import run_sync
+from ..compat import DATACLASS_SLOTS
 from ..llm import LLMClient, LLMResponse
+from ..cache import LLMCache
+from ._ratelimit import TokenBucket
 
-logger = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    import httpx
 
-try:
-    import litellm
-    from litellm import completion, acompletion, Router
+logger = logging.getLogger(__name__)
 
-    LITELLM_AVAILABLE = True
-except ImportError:
-    LITELLM_AVAILABLE = False
+# LiteLLM takes hundreds of milliseconds to import, so it is only loaded when
+# a client actually needs it (see _litellm and the module __getattr__ below).
+LITELLM_AVAILABLE = importlib.util.find_spec("litellm") is not None
+if not LITELLM_AVAILABLE:
     logger.warning("LiteLLM not installed. Install with: pip install litellm")
 
+_LAZY_LITELLM_ATTRS = frozenset({"completion", "acompletion", "Router"})
+
+
+def _litellm() -> Any:
+    """Import LiteLLM on first use and cache the module."""
+    module = globals().get("litellm")
+    if module is None:
+        import litellm as module
+
+        globals()["litellm"] = module
+    return module
+
+
+def __getattr__(name: str) -> Any:
+    # ``litellm``, ``completion``, ``acompletion`` and ``Router`` resolve on
+    # first access; once bound they are ordinary module attributes and can be
+    # patched as before.
+    if name == "litellm":
+        return _litellm()
+    if name in _LAZY_LITELLM_ATTRS:
+        value = getattr(_litellm(), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _entry_point(name: str) -> Any:
+    """Return a LiteLLM entry point, honouring module-level overrides."""
+    value = globals().get(name)
+    return value if value is not None else __getattr__(name)
+
+
+# httpx only speaks HTTP/2 when the optional h2 package is present
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Endpoints contacted by LiteLLMConfig.prewarm, keyed by inferred provider
+_PROVIDER_BASE_URLS = {
+    "openai": "https://api.openai.com",
+    "anthropic": "https://api.anthropic.com",
+    "google": "https://generativelanguage.googleapis.com",
+    "cohere": "https://api.cohere.ai",
+}
+_PREWARM_TIMEOUT = 2.0
+_ATEXIT_CLOSE_TIMEOUT = 2.0
+_POOL_LOCK = threading.Lock()
+
+# Routers shared by clients with identical routing configuration
+_ROUTER_CACHE: Dict[Tuple[Any, ...], Any] = {}
+_ROUTER_LOCK = threading.Lock()
+
+_PROVIDER_RE = re.compile(
+    r"(?P<openai>gpt|openai)"
+    r"|(?P<anthropic>claude|anthropic)"
+    r"|(?P<google>gemini|palm)"
+    r"|(?P<cohere>command|cohere)"
+    r"|(?P<meta>llama|mistral)",
+    re.IGNORECASE,
+)
+_PROVIDER_API_KEY_ENV = {
+    "openai": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+    "cohere": "COHERE_API_KEY",
+    "google": "GOOGLE_API_KEY",
+}
+
+
+# kwargs consumed by ACE roles that must never reach the provider
+_ACE_PARAMS = frozenset(
+    {"refinement_round", "max_refinement_rounds", "stream_thinking"}
+)
+# kwargs that override configured defaults rather than pass through
+_HANDLED_PARAMS = frozenset(
+    {"temperature", "top_p", "top_k", "max_tokens", "timeout", "num_retries"}
+)
+_EXCLUDED_KWARGS = _ACE_PARAMS | _HANDLED_PARAMS
+# kwargs that can change the outcome of Claude sampling resolution
+_SAMPLING_PARAMS = frozenset({"temperature", "top_p", "top_k"})
+
+# Common models returned by list_models(); LiteLLM supports 100+ more,
+# see https://docs.litellm.ai/docs/providers
+_SUPPORTED_MODELS: Tuple[str, ...] = (
+    # OpenAI
+    "gpt-4",
+    "gpt-4-turbo-preview",
+    "gpt-4o",
+    "gpt-4o-mini",
+    "gpt-3.5-turbo",
+    "gpt-3.5-turbo-16k",
+    # Anthropic
+    "claude-3-opus-20240229",
+    "claude-3-sonnet-20240229",
+    "claude-3-haiku-20240307",
+    "claude-2.1",
+    "claude-2",
+    # Google
+    "gemini-pro",
+    "gemini-pro-vision",
+    "palm-2",
+    # Cohere
+    "command",
+    "command-light",
+    "command-nightly",
+    # Meta
+    "llama-2-70b",
+    "llama-2-13b",
+    "llama-2-7b",
+    # Mistral
+    "mistral-7b",
+    "mistral-medium",
+    "mixtral-8x7b",
+)
+_MODEL_SET = frozenset(_SUPPORTED_MODELS)
+
+# Claude sampling priorities, validated once per client
+_PRIO_TEMP, _PRIO_TOP_P, _PRIO_TOP_K = 0, 1, 2
+_SAMPLING_PRIORITIES = {
+    "temperature": _PRIO_TEMP,
+    "top_p": _PRIO_TOP_P,
+    "top_k": _PRIO_TOP_K,
+}
+_PRIORITY_PARAM = {
+    _PRIO_TEMP: "temperature",
+    _PRIO_TOP_P: "top_p",
+    _PRIO_TOP_K: "top_k",
+}
+_PRIORITY_DROPS = {
+    _PRIO_TEMP: ("top_p", "top_k"),
+    _PRIO_TOP_P: ("temperature", "top_k"),
+    _PRIO_TOP_K: ("temperature", "top_p"),
+}
+
+
+def _sampling_priority_code(sampling_priority: str) -> int:
+    try:
+        return _SAMPLING_PRIORITIES[sampling_priority]
+    except KeyError:
+        raise ValueError(
+            f"Invalid sampling_priority: {sampling_priority}. "
+            "Must be one of: temperature, top_p, top_k"
+        ) from None
+
+
+def _resolve_sampling_inplace(
+    params: Dict[str, Any], model: str, priority: int
+) -> None:
+    """Drop conflicting Claude sampling parameters from ``params`` in place."""
+    temperature = params.get("temperature")
+    top_p = params.get("top_p")
+    top_k = params.get("top_k")
+    if temperature is None:
+        params.pop("temperature", None)
+    if top_p is None:
+        params.pop("top_p", None)
+    if top_k is None:
+        params.pop("top_k", None)
+
+    # The configured priority wins when its parameter is set (a temperature
+    # of 0 does not count); otherwise fall back to temperature > top_p > top_k.
+    if priority == _PRIO_TEMP:
+        preferred = temperature is not None and temperature > 0
+    elif priority == _PRIO_TOP_P:
+        preferred = top_p is not None
+    else:
+        preferred = top_k is not None
+
+    if preferred:
+        winner = priority
+        dropped = _PRIORITY_DROPS[winner]
+        if any(params.get(key) is not None for key in dropped):
+            key = _PRIORITY_PARAM[winner]
+            logger.info(
+                f"Claude model {model}: Using {key}={params[key]}, "
+                "ignoring other sampling params"
+            )
+    elif temperature is not None and temperature > 0:
+        winner = _PRIO_TEMP
+    elif top_p is not None:
+        winner = _PRIO_TOP_P
+    elif temperature is not None:
+        winner = _PRIO_TEMP
+    else:
+        return  # only top_k (or nothing) is set; keep it
+
+    for key in _PRIORITY_DROPS[winner]:
+        params.pop(key, None)
+
+
+# Suspended async generators that close each loop's pool at loop shutdown
+_POOL_KEEPERS: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, AsyncIterator[None]
+] = weakref.WeakKeyDictionary()
+
+
+async def _close_on_shutdown(pool: httpx.AsyncClient) -> AsyncIterator[None]:
+    """Wait at ``yield`` until the loop finalizes async generators, then close.
+
+    ``asyncio.run`` (and ``loop.shutdown_asyncgens``) closes suspended async
+    generators on their own loop, which is the only place ``pool`` can be
+    closed cleanly.
+    """
+    try:
+        yield
+    finally:
+        _release_async_pool(pool)
+        await pool.aclose()
+
+
+def _release_async_pool(pool: httpx.AsyncClient) -> None:
+    """Forget ``pool`` and stop handing it to LiteLLM."""
+    with _POOL_LOCK:
+        pools = LiteLLMClient._ASYNC_HTTP_CLIENTS
+        for loop, candidate in list(pools.items()):
+            if candidate is pool:
+                del pools[loop]
+    litellm = globals().get("litellm")
+    if litellm is not None and litellm.aclient_session is pool:
+        litellm.aclient_session = None
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised instead of calling the provider once ``max_budget`` is spent."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the provider while the circuit breaker is open."""
+
+
+def _transient_errors() -> Tuple[Type[BaseException], ...]:
+    """Errors worth retrying: timeouts, rate limits and provider outages."""
+    litellm = _litellm()
+    return (
+        asyncio.TimeoutError,
+        litellm.Timeout,
+        litellm.RateLimitError,
+        litellm.APIConnectionError,
+        litellm.ServiceUnavailableError,
+        litellm.InternalServerError,
+    )
+
+
+class _CircuitBreaker:
+    """Rejects calls locally after repeated transient failures.
+
+    Once ``threshold`` consecutive calls have failed, calls are refused for a
+    cooldown that doubles with every further failure, up to ``max_cooldown``.
+    A successful call closes the breaker again.
+    """
+
+    __slots__ = ("threshold", "cooldown", "max_cooldown", "failures", "open_until")
+
+    def __init__(
+        self, threshold: int, cooldown: float, max_cooldown: float = 60.0
+    ) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.open_until = 0.0
+
+    def check(self) -> None:
+        remaining = self.open_until - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(
+                f"LiteLLM circuit breaker open for another {remaining:.1f}s "
+                f"after {self.failures} consecutive failures"
+            )
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            delay = self.cooldown * 2 ** (self.failures - self.threshold)
+            self.open_until = time.monotonic() + min(self.max_cooldown, delay)
+
+
+def _estimate_tokens(call_params: Dict[str, Any]) -> int:
+    """Rough token cost of a call: ~4 characters per prompt token plus output."""
+    chars = 0
+    for message in call_params.get("messages") or ():
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif content:
+            chars += sum(len(part.get("text") or "") for part in content)
+    return chars // 4 + (call_params.get("max_tokens") or 0)
+
+
+async def _aretry(
+    coro_factory: Callable[[], Awaitable[Any]],
+    *,
+    max_tries: int,
+    base: float = 0.5,
+    cap: float = 8.0,
+    jitter: float = 0.2,
+    attempt_timeout: Optional[float] = None,
+) -> Any:
+    """Await ``coro_factory()`` with exponential backoff on transient errors.
+
+    Backoff uses ``asyncio.sleep`` so other in-flight requests keep running
+    while one of them waits out a rate limit. With ``attempt_timeout`` set,
+    an attempt still running after that many seconds is cancelled and retried.
+    """
+    retryable = _transient_errors()
+    for attempt in range(max(1, max_tries)):
+        try:
+            if attempt_timeout is None:
+                return await coro_factory()
+            return await asyncio.wait_for(coro_factory(), attempt_timeout)
+        except retryable as e:
+            if attempt + 1 >= max_tries:
+                raise
+            delay = min(cap, base * 2**attempt) + random.random() * jitter
+            logger.debug(f"Retrying LiteLLM call in {delay:.2f}s after: {e}")
+            await asyncio.sleep(delay)
+
+
+@functools.lru_cache(maxsize=256)
+def _provider_of(model: str) -> str:
+    """Infer the provider from a model name with a single regex search."""
+    match = _PROVIDER_RE.search(model)
+    if match is None:
+        return "unknown"
+    return match.lastgroup or "unknown"
+
+
+_METADATA_KEYS = ("model", "usage", "cost", "provider")
+
+
+class _LazyMetadata(Mapping):
+    """Read-only response metadata, computed on first access.
+
+    Most callers only read ``LLMResponse.text``, so the pydantic usage dump
+    and cost lookup are deferred until a key is actually requested.
+    """
+
+    __slots__ = ("_response", "_values")
+
+    def __init__(self, response: Any) -> None:
+        self._response = response
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        response = self._response
+        if key == "model":
+            value = response.model
+        elif key == "usage":
+            usage = response.usage
+            value = usage.model_dump() if usage else None
+        elif key == "cost":
+            hidden_params = getattr(response, "_hidden_params", None)
+            value = hidden_params.get("response_cost") if hidden_params else None
+        elif key == "provider":
+            value = _provider_of(response.model)
+        else:
+            raise KeyError(key)
+        self._values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_METADATA_KEYS)
+
+    def __len__(self) -> int:
+        return len(_METADATA_KEYS)
 
-@dataclass
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+@dataclass(**DATACLASS_SLOTS)
 class LiteLLMConfig:
     """Configuration for LiteLLM client."""
 
@@ -38,19 +439,66 @@ class LiteLLMConfig:
     max_retries: int = 3
     fallbacks: Optional[List[str]] = None
     metadata: Optional[Dict[str, Any]] = None
+    # Pre-built litellm.Router to use instead of building one from fallbacks;
+    # lets several clients share a router and its connection state
+    shared_router: Optional[Any] = None
 
     # Provider-specific settings
     azure_deployment: Optional[str] = None
     azure_api_key: Optional[str] = None
     azure_api_base: Optional[str] = None
 
-    # Cost tracking
+    # Cost tracking; once max_budget (USD) is spent, calls raise BudgetExceeded
     track_cost: bool = True
     max_budget: Optional[float] = None
 
+    # Circuit breaker: after this many consecutive transient failures, refuse
+    # calls with CircuitOpenError for breaker_cooldown seconds, doubling per
+    # further failure (up to 60s). None disables the breaker
+    breaker_threshold: Optional[int] = None
+    breaker_cooldown: float = 1.0
+
+    # Client-side rate limits: calls wait for budget instead of drawing 429s.
+    # Tokens are estimated as prompt characters / 4 plus max_tokens, and both
+    # limits back off after a rate-limit error and recover on success
+    rate_limit_rpm: Optional[int] = None
+    rate_limit_tpm: Optional[int] = None
+
     # Debugging
     verbose: bool = False
 
+    # Shared HTTP connection pool, reused across calls and client instances
+    connection_pooling: bool = True
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 90.0
+    # Open connections to the provider in the background at construction
+    prewarm: bool = False
+
+    # Async only: also send the request to fallbacks[0] if the primary has not
+    # answered after this many milliseconds and use whichever succeeds first.
+    # Lowers tail latency at up to twice the cost; ignored when max_budget is set
+    hedge_after_ms: Optional[int] = None
+
+    # Async only: cancel and retry an attempt that has not finished after this
+    # many seconds, cutting off stragglers well before the request timeout
+    attempt_timeout: Optional[float] = None
+
+    # Run complete() through acomplete() on a shared background event loop,
+    # so sync callers use the async connection pool
+    sync_via_async: bool = False
+
+    # Response cache for deterministic (temperature=0) requests
+    cache_enabled: bool = True
+    cache_ttl: int = 3600
+    cache_max_entries: int = 10_000
+    # Persist cached responses to this shelve file across runs
+    cache_path: Optional[str] = None
+    # Hold in-memory cache entries zlib-compressed; saves memory on long replies
+    cache_compress: bool = False
+    # LLMCache instance to share between clients; overrides the settings above
+    shared_cache: Optional[LLMCache] = None
+
     # Claude-specific parameter handling
     # Anthropic API limitation: temperature and top_p cannot both be specified
     sampling_priority: str = "temperature"  # "temperature" | "top_p" | "top_k"
@@ -97,6 +545,13 @@ class LiteLLMClient(LLMClient):
         ... )
     """
 
+    # Connection pools shared by every instance; created on first use. Async
+    # connections cannot outlive their event loop, so there is one per loop
+    _HTTP_CLIENT: Optional[httpx.Client] = None
+    _ASYNC_HTTP_CLIENTS: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop, httpx.AsyncClient
+    ] = weakref.WeakKeyDictionary()
+
     def __init__(
         self,
         model: Optional[str] = None,
@@ -149,40 +604,248 @@ class LiteLLMClient(LLMClient):
             )
 
         super().__init__(model=model)
+        self._priority = _sampling_priority_code(self.config.sampling_priority)
 
         # Set up API keys from environment if not provided
         self._setup_api_keys()
+        self._is_anthropic = _provider_of(self.config.model) == "anthropic"
+        self._base_call_params = self._build_base_call_params()
+        # Claude conflicts in the configured defaults are resolved once here;
+        # calls only re-resolve when they override a sampling parameter
+        self._resolved_base_params = self._base_call_params
+        if self._is_anthropic:
+            self._resolved_base_params = self._base_call_params.copy()
+            _resolve_sampling_inplace(
+                self._resolved_base_params, self.config.model, self._priority
+            )
 
         # Configure LiteLLM settings
         if self.config.verbose:
-            litellm.set_verbose = True
+            _litellm().set_verbose = True
+
+        # Router for fallbacks; built on first use so that constructing a
+        # client does not import LiteLLM
+        self._router: Optional[Any] = self.config.shared_router
+        self._router_pending = self._router is None and bool(self.config.fallbacks)
+
+        self._cache: Optional[LLMCache] = self.config.shared_cache
+        if self._cache is None and self.config.cache_enabled:
+            self._cache = LLMCache(
+                max_entries=self.config.cache_max_entries,
+                ttl=self.config.cache_ttl,
+                path=self.config.cache_path,
+                compress=self.config.cache_compress,
+            )
 
-        # Set up router if fallbacks are configured
-        self.router = None
-        if self.config.fallbacks:
-            self._setup_router()
+        self._spent = 0.0
+        self._spent_lock = threading.Lock()
+        self._breaker: Optional[_CircuitBreaker] = None
+        if self.config.breaker_threshold is not None:
+            self._breaker = _CircuitBreaker(
+                self.config.breaker_threshold, self.config.breaker_cooldown
+            )
+
+        self._buckets: List[Tuple[TokenBucket, bool]] = []
+        if self.config.rate_limit_rpm:
+            self._buckets.append((TokenBucket(self.config.rate_limit_rpm), False))
+        if self.config.rate_limit_tpm:
+            self._buckets.append((TokenBucket(self.config.rate_limit_tpm), True))
+
+        self._prewarm_task: Optional[asyncio.Task] = None
+        if self.config.prewarm and self.config.connection_pooling:
+            self._start_prewarm()
 
     def _setup_api_keys(self) -> None:
         """Set up API keys from config or environment variables."""
         if not self.config.api_key:
             # Try to get API key from environment based on model provider
-            if (
-                "gpt" in self.config.model.lower()
-                or "openai" in self.config.model.lower()
-            ):
-                self.config.api_key = os.getenv("OPENAI_API_KEY")
-            elif (
-                "claude" in self.config.model.lower()
-                or "anthropic" in self.config.model.lower()
-            ):
-                self.config.api_key = os.getenv("ANTHROPIC_API_KEY")
-            elif "cohere" in self.config.model.lower():
-                self.config.api_key = os.getenv("COHERE_API_KEY")
-            elif "gemini" in self.config.model.lower():
-                self.config.api_key = os.getenv("GOOGLE_API_KEY")
+            env_var = _PROVIDER_API_KEY_ENV.get(_provider_of(self.config.model))
+            if env_var:
+                self.config.api_key = os.getenv(env_var)
+
+    def _http_pool_kwargs(self) -> Dict[str, Any]:
+        import httpx
+
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+                keepalive_expiry=self.config.keepalive_expiry,
+            ),
+            "timeout": self.config.timeout,
+            "http2": HTTP2_AVAILABLE,
+        }
+
+    def _ensure_http_pool(self) -> None:
+        """Hand LiteLLM the shared keep-alive pool for synchronous calls."""
+        if not self.config.connection_pooling:
+            return
+        import httpx
+
+        litellm = _litellm()
+        pool = LiteLLMClient._HTTP_CLIENT
+        if litellm.client_session not in (None, pool):
+            return  # the application installed its own session
+        if pool is None:
+            with _POOL_LOCK:
+                pool = LiteLLMClient._HTTP_CLIENT
+                if pool is None:
+                    pool = httpx.Client(**self._http_pool_kwargs())
+                    LiteLLMClient._HTTP_CLIENT = pool
+        litellm.client_session = pool
+
+    async def _ensure_async_http_pool(self) -> Optional[httpx.AsyncClient]:
+        """Return the running loop's keep-alive pool, creating it on first use.
+
+        LiteLLM reads a single process-wide ``aclient_session``, but an
+        ``httpx.AsyncClient`` only works on the loop that created it. The
+        pool is therefore handed to LiteLLM only while one loop uses pooling;
+        once a second loop appears LiteLLM falls back to its own sessions.
+        Each pool is closed on its own loop when that loop shuts down.
+        """
+        if not self.config.connection_pooling:
+            return None
+        import httpx
+
+        litellm = _litellm()
+        loop = asyncio.get_running_loop()
+        pools = LiteLLMClient._ASYNC_HTTP_CLIENTS
+        with _POOL_LOCK:
+            current = litellm.aclient_session
+            if current is not None and current not in pools.values():
+                return None  # the application installed its own session
+            pool = pools.get(loop)
+            created = pool is None
+            if pool is None:
+                pool = httpx.AsyncClient(**self._http_pool_kwargs())
+                pools[loop] = pool
+            shared = pool if len(pools) == 1 else None
+            if current is not shared:
+                litellm.aclient_session = shared
+        if created:
+            keeper = _close_on_shutdown(pool)
+            await keeper.__anext__()
+            _POOL_KEEPERS[loop] = keeper
+        return pool
+
+    def _prewarm_url(self) -> Optional[str]:
+        if self.config.api_base:
+            return self.config.api_base
+        return _PROVIDER_BASE_URLS.get(self._get_provider_from_model(self.config.model))
+
+    def _start_prewarm(self) -> None:
+        """Warm the shared pool without blocking the constructor."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            threading.Thread(
+                target=self._prewarm, name="ace-litellm-prewarm", daemon=True
+            ).start()
+        else:
+            self._prewarm_task = loop.create_task(self._aprewarm())
+
+    def _prewarm(self) -> None:
+        """Open a keep-alive connection to the provider with a HEAD request."""
+        url = self._prewarm_url()
+        if url is None:
+            return
+        self._ensure_http_pool()
+        pool = LiteLLMClient._HTTP_CLIENT
+        if pool is None or _litellm().client_session is not pool:
+            return
+        try:
+            pool.head(url, timeout=_PREWARM_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Connection prewarm to {url} failed: {e}")
+
+    async def _aprewarm(self) -> None:
+        """Open up to ``max_keepalive_connections`` connections concurrently."""
+        url = self._prewarm_url()
+        if url is None:
+            return
+        pool = await self._ensure_async_http_pool()
+        if pool is None or _litellm().aclient_session is not pool:
+            return
+        results = await asyncio.gather(
+            *(
+                pool.head(url, timeout=_PREWARM_TIMEOUT)
+                for _ in range(self.config.max_keepalive_connections)
+            ),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            logger.debug(f"Connection prewarm to {url} failed: {errors[0]}")
+
+    def close(self) -> None:
+        """Close the shared synchronous connection pool and flush the cache.
+
+        The pool is shared by all instances and is recreated on the next call.
+        """
+        if self._cache is not None:
+            self._cache.close()
+        pool = LiteLLMClient._HTTP_CLIENT
+        if pool is None:
+            return
+        LiteLLMClient._HTTP_CLIENT = None
+        litellm = _litellm()
+        if litellm.client_session is pool:
+            litellm.client_session = None
+        pool.close()
+
+    async def aclose(self) -> None:
+        """Close the running loop's async pool and the shared synchronous pool."""
+        with _POOL_LOCK:
+            pool = LiteLLMClient._ASYNC_HTTP_CLIENTS.pop(
+                asyncio.get_running_loop(), None
+            )
+        if pool is not None:
+            _release_async_pool(pool)
+            await pool.aclose()
+        self.close()
+
+    @property
+    def router(self) -> Optional[Any]:
+        """LiteLLM Router handling fallbacks, or None without fallbacks."""
+        if self._router_pending:
+            self._setup_router()
+        return self._router
+
+    @router.setter
+    def router(self, router: Optional[Any]) -> None:
+        self._router = router
+        self._router_pending = False
+
+    def _router_cache_key(self) -> Tuple[Any, ...]:
+        api_key_digest = hashlib.sha256(
+            (self.config.api_key or "").encode("utf-8")
+        ).hexdigest()[:16]
+        return (
+            self.config.model,
+            tuple(self.config.fallbacks or ()),
+            api_key_digest,
+            self.config.api_base,
+            self.config.temperature,
+            self.config.max_tokens,
+            self.config.timeout,
+            self.config.max_retries,
+        )
 
     def _setup_router(self) -> None:
-        """Set up router for load balancing and fallbacks."""
+        """Set up router for load balancing and fallbacks.
+
+        Routers are shared between clients with the same routing
+        configuration, so each distinct setup is only built once.
+        """
+        key = self._router_cache_key()
+        with _ROUTER_LOCK:
+            router = _ROUTER_CACHE.get(key)
+            if router is None:
+                router = self._build_router()
+                _ROUTER_CACHE[key] = router
+        self.router = router
+
+    def _build_router(self) -> Any:
         model_list = []
 
         # Add primary model
@@ -212,7 +875,7 @@ class LiteLLMClient(LLMClient):
                 }
             )
 
-        self.router = Router(
+        return _entry_point("Router")(
             model_list=model_list,
             fallbacks=(
                 [{self.config.model: self.config.fallbacks}]
@@ -248,67 +911,72 @@ class LiteLLMClient(LLMClient):
             ValueError: If sampling_priority is invalid
         """
         # Only apply to Claude models
-        if "claude" not in model.lower():
+        if _provider_of(model) != "anthropic":
             return params
 
-        if sampling_priority not in ["temperature", "top_p", "top_k"]:
-            raise ValueError(f"Invalid sampling_priority: {sampling_priority}. Must be one of: temperature, top_p, top_k")
-
         resolved = params.copy()
+        _resolve_sampling_inplace(
+            resolved, model, _sampling_priority_code(sampling_priority)
+        )
+        return resolved
 
-        # Check which sampling params are present and not None
-        has_temperature = 'temperature' in resolved and resolved['temperature'] is not None
-        has_top_p = 'top_p' in resolved and resolved['top_p'] is not None
-        has_top_k = 'top_k' in resolved and resolved['top_k'] is not None
-
-        # Remove None parameters early
-        if 'temperature' in resolved and resolved['temperature'] is None:
-            resolved.pop('temperature')
-        if 'top_p' in resolved and resolved['top_p'] is None:
-            resolved.pop('top_p')
-        if 'top_k' in resolved and resolved['top_k'] is None:
-            resolved.pop('top_k')
-
-        # Apply priority-based resolution
-        if sampling_priority == "temperature" and has_temperature and resolved['temperature'] > 0:
-            # Non-zero temperature takes precedence - remove others
-            resolved.pop('top_p', None)
-            resolved.pop('top_k', None)
-            if has_top_p or has_top_k:
-                logger.info(f"Claude model {model}: Using temperature={resolved['temperature']}, ignoring other sampling params")
-
-        elif sampling_priority == "top_p" and has_top_p:
-            # top_p takes precedence - remove others
-            resolved.pop('temperature', None)
-            resolved.pop('top_k', None)
-            if has_temperature or has_top_k:
-                logger.info(f"Claude model {model}: Using top_p={resolved['top_p']}, ignoring other sampling params")
-
-        elif sampling_priority == "top_k" and has_top_k:
-            # top_k takes precedence - remove others
-            resolved.pop('temperature', None)
-            resolved.pop('top_p', None)
-            if has_temperature or has_top_p:
-                logger.info(f"Claude model {model}: Using top_k={resolved['top_k']}, ignoring other sampling params")
+    def _build_base_call_params(self) -> Dict[str, Any]:
+        """Call parameters that only depend on the config, built once."""
+        base: Dict[str, Any] = {
+            "model": self.config.model,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "timeout": self.config.timeout,
+            "num_retries": self.config.max_retries,
+            "drop_params": True,  # Automatically drop unsupported parameters
+        }
+        if self.config.top_p is not None:
+            base["top_p"] = self.config.top_p
+        if self.config.api_key:
+            base["api_key"] = self.config.api_key
+        if self.config.api_base:
+            base["api_base"] = self.config.api_base
+        return base
 
-        else:
-            # Fallback: use default priority (temperature > top_p > top_k)
-            # Special case: if temperature is 0, allow top_p to take precedence
-            if has_temperature and resolved['temperature'] > 0:
-                # Non-zero temperature takes precedence over everything
-                resolved.pop('top_p', None)
-                resolved.pop('top_k', None)
-            elif has_top_p:
-                # top_p takes precedence over temperature=0 and top_k
-                resolved.pop('temperature', None)
-                resolved.pop('top_k', None)
-            elif has_temperature:
-                # Only temperature (including 0), remove others
-                resolved.pop('top_p', None)
-                resolved.pop('top_k', None)
-            # If only top_k is set, keep it
+    def _make_call_params(
+        self,
+        prompt_or_messages: Union[str, Sequence[Dict[str, Any]]],
+        kwargs: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Assemble the LiteLLM call parameters for a single prompt.
 
-        return resolved
+        Accepts a prompt string or prebuilt chat messages; a ``messages``
+        kwarg takes precedence over both. The messages are built once and
+        shared by every retry and fallback attempt of the call.
+        """
+        resolve = self._is_anthropic and not _SAMPLING_PARAMS.isdisjoint(kwargs)
+        call_params = (
+            self._base_call_params if resolve else self._resolved_base_params
+        ).copy()
+        messages = kwargs.get("messages")
+        if messages is None:
+            if isinstance(prompt_or_messages, str):
+                # Prepare messages in chat format (most models now use this)
+                messages = [{"role": "user", "content": prompt_or_messages}]
+            else:
+                messages = prompt_or_messages
+        call_params["messages"] = messages
+
+        if kwargs:
+            # Runtime overrides of the configured sampling/request settings
+            for key in _HANDLED_PARAMS.intersection(kwargs):
+                if key != "top_k" or kwargs[key] is not None:
+                    call_params[key] = kwargs[key]
+            # Remaining kwargs, excluding ACE-specific and already-set ones
+            for key in kwargs.keys() - _EXCLUDED_KWARGS - call_params.keys():
+                call_params[key] = kwargs[key]
+
+        # Apply single-point parameter resolution for Claude models
+        if resolve:
+            _resolve_sampling_inplace(call_params, self.config.model, self._priority)
+
+        return call_params
 
     def complete(self, prompt: str, **kwargs: Any) -> LLMResponse:
         """
@@ -321,75 +989,37 @@ class LiteLLMClient(LLMClient):
         Returns:
             LLMResponse containing the generated text and metadata
         """
-        # Prepare messages in chat format (most models now use this)
-        messages = [{"role": "user", "content": prompt}]
-
-        # Merge config with runtime kwargs
-        merged_params = {
-            "model": self.config.model,
-            "messages": messages,
-            "temperature": kwargs.get("temperature", self.config.temperature),
-            "max_tokens": kwargs.get("max_tokens", self.config.max_tokens),
-            "timeout": kwargs.get("timeout", self.config.timeout),
-            "num_retries": kwargs.get("num_retries", self.config.max_retries),
-            "drop_params": True,  # Automatically drop unsupported parameters
-        }
-
-        # Add optional sampling parameters if provided
-        if kwargs.get("top_p") is not None or self.config.top_p is not None:
-            merged_params["top_p"] = kwargs.get("top_p", self.config.top_p)
-        if kwargs.get("top_k") is not None:
-            merged_params["top_k"] = kwargs.get("top_k")
-
-        # Apply single-point parameter resolution for Claude models
-        call_params = self._resolve_sampling_params(
-            merged_params,
-            self.config.model,
-            self.config.sampling_priority
-        )
+        if self.config.sync_via_async:
+            return self._run_sync(
+                self.acomplete(prompt, **kwargs), timeout=self._sync_timeout()
+            )
 
-        # Add API credentials
-        if self.config.api_key:
-            call_params["api_key"] = self.config.api_key
-        if self.config.api_base:
-            call_params["api_base"] = self.config.api_base
-
-        # Add remaining kwargs (excluding ACE-specific and already-handled parameters)
-        ace_specific_params = {"refinement_round", "max_refinement_rounds", "stream_thinking"}
-        handled_params = {"temperature", "top_p", "top_k", "max_tokens", "timeout", "num_retries"}
-        call_params.update(
-            {
-                k: v
-                for k, v in kwargs.items()
-                if k not in call_params and k not in ace_specific_params and k not in handled_params
-            }
-        )
+        call_params = self._make_call_params(prompt, kwargs)
+        cache = self._cache
+        cache_key = self._cache_key(call_params, kwargs)
+        if cache is not None and cache_key is not None:
+            # Concurrent misses on one key share a single provider request
+            return cache.get_or_call(cache_key, lambda: self._call(call_params))
+        return self._call(call_params)
+
+    def _call(self, call_params: Dict[str, Any]) -> LLMResponse:
+        """Send one uncached completion request."""
+        self._guard()
+        for bucket, per_token in self._buckets:
+            bucket.acquire_blocking(_estimate_tokens(call_params) if per_token else 1)
+        self._ensure_http_pool()
 
         try:
             # Use router if available, otherwise direct completion
             if self.router:
                 response = self.router.completion(**call_params)
             else:
-                response = completion(**call_params)
-
-            # Extract text from response
-            text = response.choices[0].message.content
-
-            # Build metadata
-            metadata = {
-                "model": response.model,
-                "usage": response.usage.model_dump() if response.usage else None,
-                "cost": (
-                    response._hidden_params.get("response_cost", None)
-                    if hasattr(response, "_hidden_params")
-                    else None
-                ),
-                "provider": self._get_provider_from_model(response.model),
-            }
+                response = _entry_point("completion")(**call_params)
 
-            return LLMResponse(text=text, raw=metadata)
+            return self._to_response(response)
 
         except Exception as e:
+            self._record_failure(e)
             logger.error(f"Error in LiteLLM completion: {e}")
             raise
 
@@ -404,79 +1034,333 @@ class LiteLLMClient(LLMClient):
         Returns:
             LLMResponse containing the generated text and metadata
         """
-        # Prepare messages in chat format
-        messages = [{"role": "user", "content": prompt}]
+        call_params = self._make_call_params(prompt, kwargs)
+        cache = self._cache
+        cache_key = self._cache_key(call_params, kwargs)
+        if cache is not None and cache_key is not None:
+            return await cache.aget_or_call(cache_key, lambda: self._acall(call_params))
+        return await self._acall(call_params)
+
+    async def _acall(self, call_params: Dict[str, Any]) -> LLMResponse:
+        """Async :meth:`_call`."""
+        self._guard()
+        await self._athrottle(call_params)
+        await self._ensure_async_http_pool()
+        max_tries = self._take_retries(call_params) + 1
 
-        # Merge config with runtime kwargs
-        merged_params = {
-            "model": self.config.model,
-            "messages": messages,
-            "temperature": kwargs.get("temperature", self.config.temperature),
-            "max_tokens": kwargs.get("max_tokens", self.config.max_tokens),
-            "timeout": kwargs.get("timeout", self.config.timeout),
-            "num_retries": kwargs.get("num_retries", self.config.max_retries),
-            "drop_params": True,  # Automatically drop unsupported parameters
-        }
+        try:
+            if self._hedging_enabled():
+                response = await self._ahedged_completion(call_params, max_tries)
+            else:
+                # Use router if available, otherwise direct completion
+                acall = (
+                    self.router.acompletion
+                    if self.router
+                    else _entry_point("acompletion")
+                )
+                response = await _aretry(
+                    lambda: acall(**call_params),
+                    max_tries=max_tries,
+                    attempt_timeout=self.config.attempt_timeout,
+                )
+
+            return self._to_response(response)
 
-        # Add optional sampling parameters if provided
-        if kwargs.get("top_p") is not None or self.config.top_p is not None:
-            merged_params["top_p"] = kwargs.get("top_p", self.config.top_p)
-        if kwargs.get("top_k") is not None:
-            merged_params["top_k"] = kwargs.get("top_k")
+        except Exception as e:
+            self._record_failure(e)
+            logger.error(f"Error in LiteLLM async completion: {e}")
+            raise
 
-        # Apply single-point parameter resolution for Claude models
-        call_params = self._resolve_sampling_params(
-            merged_params,
-            self.config.model,
-            self.config.sampling_priority
-        )
+    def batch_complete(
+        self, prompts: Sequence[str], **kwargs: Any
+    ) -> List[LLMResponse]:
+        """
+        Generate completions for several prompts with one batched call.
 
-        # Add API credentials
-        if self.config.api_key:
-            call_params["api_key"] = self.config.api_key
-        if self.config.api_base:
-            call_params["api_base"] = self.config.api_base
+        Uses ``litellm.batch_completion``, which still sends one provider
+        request per prompt (from a thread pool). Cached prompts are answered
+        locally; the rest pass the budget/circuit-breaker guard and the rate
+        limiter, and failures are recorded like single calls. Routed clients
+        run :meth:`abatch_complete` on the shared background event loop.
 
-        # Add remaining kwargs (excluding ACE-specific and already-handled parameters)
-        ace_specific_params = {"refinement_round", "max_refinement_rounds", "stream_thinking"}
-        handled_params = {"temperature", "top_p", "top_k", "max_tokens", "timeout", "num_retries"}
-        call_params.update(
-            {
-                k: v
-                for k, v in kwargs.items()
-                if k not in call_params and k not in ace_specific_params and k not in handled_params
-            }
+        Args:
+            prompts: Input prompt texts
+            **kwargs: Additional parameters to pass to the model
+
+        Returns:
+            List of LLMResponse objects in the same order as ``prompts``
+        """
+        if not prompts:
+            return []
+        if self.router:
+            return self._run_sync(self.abatch_complete(prompts, **kwargs))
+
+        base_params = self._make_call_params(prompts[0], kwargs)
+        params = [
+            {**base_params, "messages": [{"role": "user", "content": prompt}]}
+            for prompt in prompts
+        ]
+        cache = self._cache
+        keys = [self._cache_key(call_params, kwargs) for call_params in params]
+        results: List[Optional[LLMResponse]] = [None] * len(prompts)
+        pending: List[int] = []
+        for index, key in enumerate(keys):
+            cached = cache.get(key) if cache is not None and key is not None else None
+            if cached is None:
+                pending.append(index)
+            else:
+                results[index] = cached
+        if pending:
+            self._guard()
+            for index in pending:
+                for bucket, per_token in self._buckets:
+                    bucket.acquire_blocking(
+                        _estimate_tokens(params[index]) if per_token else 1
+                    )
+            call_params = dict(base_params)
+            call_params["messages"] = [params[index]["messages"] for index in pending]
+            # batch_completion has no retry layer of its own
+            call_params.pop("num_retries", None)
+            self._ensure_http_pool()
+
+            try:
+                responses = _litellm().batch_completion(**call_params)
+            except Exception as e:
+                self._record_failure(e)
+                logger.error(f"Error in LiteLLM batch completion: {e}")
+                raise
+
+            for index, response in zip(pending, responses):
+                if isinstance(response, Exception):
+                    self._record_failure(response)
+                    logger.error(f"Error in LiteLLM batch completion: {response}")
+                    raise response
+                result = self._to_response(response)
+                key = keys[index]
+                if cache is not None and key is not None:
+                    cache.put(key, result)
+                results[index] = result
+        completed = [result for result in results if result is not None]
+        if len(completed) < len(prompts):
+            raise RuntimeError(
+                "litellm.batch_completion returned fewer responses than prompts"
+            )
+        return completed
+
+    async def abatch_complete(
+        self, prompts: Sequence[str], max_concurrency: int = 20, **kwargs: Any
+    ) -> List[LLMResponse]:
+        """
+        Complete several prompts concurrently.
+
+        Call parameters are built once and reused for every prompt; at most
+        ``max_concurrency`` requests are in flight at a time. Cached prompts
+        are answered locally and failures are recorded like single calls.
+
+        Args:
+            prompts: Input prompt texts
+            max_concurrency: Upper bound on simultaneous requests (default: 20)
+            **kwargs: Additional parameters to pass to the model
+
+        Returns:
+            List of LLMResponse objects in the same order as ``prompts``
+        """
+        if not prompts:
+            return []
+
+        self._guard()
+        base_params = self._make_call_params(prompts[0], kwargs)
+        await self._ensure_async_http_pool()
+        max_tries = self._take_retries(base_params) + 1
+        acall = self.router.acompletion if self.router else _entry_point("acompletion")
+        semaphore = asyncio.Semaphore(max_concurrency)
+        cache = self._cache
+
+        async def _one(prompt: str) -> LLMResponse:
+            params = {**base_params, "messages": [{"role": "user", "content": prompt}]}
+            key = self._cache_key(params, kwargs)
+            if cache is not None and key is not None:
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+            async with semaphore:
+                await self._athrottle(params)
+                response = await _aretry(
+                    lambda: acall(**params),
+                    max_tries=max_tries,
+                    attempt_timeout=self.config.attempt_timeout,
+                )
+            result = self._to_response(response)
+            if cache is not None and key is not None:
+                cache.put(key, result)
+            return result
+
+        responses = await asyncio.gather(
+            *(_one(prompt) for prompt in prompts), return_exceptions=True
         )
 
+        results: List[LLMResponse] = []
+        for response in responses:
+            if isinstance(response, BaseException):
+                self._record_failure(response)
+                logger.error(f"Error in LiteLLM async batch completion: {response}")
+                raise response
+            results.append(response)
+        return results
+
+    def _cache_key(
+        self, call_params: Dict[str, Any], kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """Return the cache key for a deterministic request, else None."""
+        if self._cache is None:
+            return None
+        # Gate on the requested temperature: Claude resolution may drop it
+        if kwargs.get("temperature", self.config.temperature) != 0:
+            return None
+        # Refinement rounds re-ask on purpose; a cached reply would end them
+        if kwargs.get("refinement_round", 0) > 0:
+            return None
+        return self._cache.key_for(call_params)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Return response cache hit and miss counts."""
+        if self._cache is None:
+            return {"hits": 0, "misses": 0}
+        return self._cache.stats()
+
+    def _hedging_enabled(self) -> bool:
+        # Hedging can double spend, so it is never used under a budget cap
+        return (
+            self.config.hedge_after_ms is not None
+            and bool(self.config.fallbacks)
+            and self.config.max_budget is None
+        )
+
+    async def _ahedged_completion(
+        self, call_params: Dict[str, Any], max_tries: int
+    ) -> Any:
+        """Race the primary model against the first fallback.
+
+        The fallback request starts ``hedge_after_ms`` after the primary one.
+        The first successful response wins and the other request is
+        cancelled; an error is only raised once both have failed.
+        """
+        fallbacks = self.config.fallbacks or []
+        hedge_after_ms = self.config.hedge_after_ms
+        if not fallbacks or hedge_after_ms is None:
+            raise RuntimeError("hedging needs hedge_after_ms and a fallback model")
+        acall = _entry_point("acompletion")
+        fallback = fallbacks[0]
+        # Mirror the router: fallbacks get no primary-provider credentials
+        hedge_params = {
+            k: v for k, v in call_params.items() if k not in ("api_key", "api_base")
+        }
+        hedge_params["model"] = fallback
+        if _provider_of(fallback) == "anthropic":
+            _resolve_sampling_inplace(hedge_params, fallback, self._priority)
+
+        async def _hedge() -> Any:
+            await asyncio.sleep(hedge_after_ms / 1000)
+            return await _aretry(
+                lambda: acall(**hedge_params),
+                max_tries=max_tries,
+                attempt_timeout=self.config.attempt_timeout,
+            )
+
+        pending = {
+            asyncio.ensure_future(
+                _aretry(
+                    lambda: acall(**call_params),
+                    max_tries=max_tries,
+                    attempt_timeout=self.config.attempt_timeout,
+                )
+            ),
+            asyncio.ensure_future(_hedge()),
+        }
+        error: Optional[BaseException] = None
         try:
-            # Use router if available, otherwise direct completion
-            if self.router:
-                response = await self.router.acompletion(**call_params)
-            else:
-                response = await acompletion(**call_params)
-
-            # Extract text from response
-            text = response.choices[0].message.content
-
-            # Build metadata
-            metadata = {
-                "model": response.model,
-                "usage": response.usage.model_dump() if response.usage else None,
-                "cost": (
-                    response._hidden_params.get("response_cost", None)
-                    if hasattr(response, "_hidden_params")
-                    else None
-                ),
-                "provider": self._get_provider_from_model(response.model),
-            }
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            if error is None:
+                raise RuntimeError("hedged completion finished without a result")
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
 
-            return LLMResponse(text=text, raw=metadata)
+    @staticmethod
+    def _take_retries(call_params: Dict[str, Any]) -> int:
+        """Move retry handling from LiteLLM to :func:`_aretry`.
 
-        except Exception as e:
-            logger.error(f"Error in LiteLLM async completion: {e}")
-            raise
+        Returns the configured retry count and disables LiteLLM's own retry
+        layer for the call, so backoff never blocks the event loop.
+        """
+        retries = call_params.get("num_retries") or 0
+        call_params["num_retries"] = 0
+        return retries
 
-    def complete_with_stream(self, prompt: str, **kwargs: Any):
+    @staticmethod
+    def _run_sync(coro: Any, timeout: Optional[float] = None) -> Any:
+        """Run ``coro`` on the background event loop and wait for its result.
+
+        Safe to call from inside another running event loop, and keeps the
+        loop-bound async connection pool alive between calls.
+        """
+        return run_sync(coro, timeout)
+
+    def _sync_timeout(self) -> float:
+        # Every attempt may take the full timeout; leave a little headroom
+        return self.config.timeout * (self.config.max_retries + 1) + 5
+
+    @property
+    def total_cost(self) -> float:
+        """USD spent on completions by this client, as reported by LiteLLM."""
+        return self._spent
+
+    def _guard(self) -> None:
+        """Refuse a provider call locally when over budget or the breaker is open."""
+        budget = self.config.max_budget
+        if budget is not None and self._spent >= budget:
+            raise BudgetExceeded(
+                f"LiteLLM spend ${self._spent:.4f} reached max_budget ${budget:.2f}"
+            )
+        if self._breaker is not None:
+            self._breaker.check()
+
+    async def _athrottle(self, call_params: Dict[str, Any]) -> None:
+        for bucket, per_token in self._buckets:
+            await bucket.acquire(_estimate_tokens(call_params) if per_token else 1)
+
+    def _record_failure(self, error: BaseException) -> None:
+        if self._buckets and isinstance(error, _litellm().RateLimitError):
+            for bucket, _ in self._buckets:
+                bucket.decrease()
+        if self._breaker is not None and isinstance(error, _transient_errors()):
+            self._breaker.record_failure()
+
+    def _to_response(self, response: Any) -> LLMResponse:
+        """Convert a LiteLLM completion response into an LLMResponse."""
+        if self._breaker is not None:
+            self._breaker.record_success()
+        for bucket, _ in self._buckets:
+            bucket.increase()
+        if self.config.track_cost or self.config.max_budget is not None:
+            hidden_params = getattr(response, "_hidden_params", None)
+            cost = hidden_params.get("response_cost") if hidden_params else None
+            if cost:
+                with self._spent_lock:
+                    self._spent += cost
+        return LLMResponse(
+            text=response.choices[0].message.content, raw=_LazyMetadata(response)
+        )
+
+    def complete_with_stream(self, prompt: str, **kwargs: Any) -> Iterator[str]:
         """
         Generate completion with streaming support.
 
@@ -487,46 +1371,80 @@ class LiteLLMClient(LLMClient):
         Yields:
             Chunks of generated text
         """
-        messages = [{"role": "user", "content": prompt}]
+        call_params = self._make_call_params(prompt, kwargs)
+        call_params["stream"] = True
 
-        call_params = {
-            "model": self.config.model,
-            "messages": messages,
-            "temperature": kwargs.get("temperature", self.config.temperature),
-            "max_tokens": kwargs.get("max_tokens", self.config.max_tokens),
-            "stream": True,
-        }
-
-        if self.config.api_key:
-            call_params["api_key"] = self.config.api_key
+        self._guard()
+        self._ensure_http_pool()
 
+        response = None
         try:
-            response = completion(**call_params)
+            response = _entry_point("completion")(**call_params)
 
             for chunk in response:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+                try:
+                    content = chunk.choices[0].delta.content
+                except (AttributeError, IndexError):
+                    continue
+                if content:
+                    yield content
 
         except Exception as e:
             logger.error(f"Error in LiteLLM streaming: {e}")
             raise
+        finally:
+            # Closing this generator early also hangs up the HTTP stream
+            close = getattr(response, "close", None)
+            if callable(close):
+                close()
+
+    async def acomplete_with_stream(
+        self, prompt: str, **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """
+        Async version of complete_with_stream.
 
-    def _get_provider_from_model(self, model: str) -> str:
-        """Infer provider from model name."""
-        model_lower = model.lower()
-
-        if "gpt" in model_lower or "openai" in model_lower:
-            return "openai"
-        elif "claude" in model_lower or "anthropic" in model_lower:
-            return "anthropic"
-        elif "gemini" in model_lower or "palm" in model_lower:
-            return "google"
-        elif "command" in model_lower or "cohere" in model_lower:
-            return "cohere"
-        elif "llama" in model_lower or "mistral" in model_lower:
-            return "meta"
-        else:
-            return "unknown"
+        Args:
+            prompt: Input prompt text
+            **kwargs: Additional parameters to pass to the model
+
+        Yields:
+            Chunks of generated text
+        """
+        call_params = self._make_call_params(prompt, kwargs)
+        call_params["stream"] = True
+
+        self._guard()
+        await self._ensure_async_http_pool()
+
+        response = None
+        try:
+            if self.router:
+                response = await self.router.acompletion(**call_params)
+            else:
+                response = await _entry_point("acompletion")(**call_params)
+
+            async for chunk in response:
+                try:
+                    content = chunk.choices[0].delta.content
+                except (AttributeError, IndexError):
+                    continue
+                if content:
+                    yield content
+
+        except Exception as e:
+            logger.error(f"Error in LiteLLM async streaming: {e}")
+            raise
+        finally:
+            # Closing this generator early also hangs up the HTTP stream
+            aclose = getattr(response, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    @staticmethod
+    def _get_provider_from_model(model: str) -> str:
+        """Infer provider from model name (memoized by ``_provider_of``)."""
+        return _provider_of(model)
 
     @classmethod
     def list_models(cls) -> List[str]:
@@ -534,38 +1452,36 @@ class LiteLLMClient(LLMClient):
         if not LITELLM_AVAILABLE:
             return []
 
-        # This returns a list of common models
-        # In practice, LiteLLM supports 100+ models
-        return [
-            # OpenAI
-            "gpt-4",
-            "gpt-4-turbo-preview",
-            "gpt-4o",
-            "gpt-4o-mini",
-            "gpt-3.5-turbo",
-            "gpt-3.5-turbo-16k",
-            # Anthropic
-            "claude-3-opus-20240229",
-            "claude-3-sonnet-20240229",
-            "claude-3-haiku-20240307",
-            "claude-2.1",
-            "claude-2",
-            # Google
-            "gemini-pro",
-            "gemini-pro-vision",
-            "palm-2",
-            # Cohere
-            "command",
-            "command-light",
-            "command-nightly",
-            # Meta
-            "llama-2-70b",
-            "llama-2-13b",
-            "llama-2-7b",
-            # Mistral
-            "mistral-7b",
-            "mistral-medium",
-            "mixtral-8x7b",
-            # Note: Many more models are supported
-            # See: https://docs.litellm.ai/docs/providers
-        ]
+        return list(_SUPPORTED_MODELS)
+
+    @classmethod
+    def list_models_frozen(cls) -> Tuple[str, ...]:
+        """Like :meth:`list_models`, but returns the shared immutable tuple."""
+        return _SUPPORTED_MODELS if LITELLM_AVAILABLE else ()
+
+    @staticmethod
+    def is_supported(model: str) -> bool:
+        """Return True if ``model`` is one of the models in :meth:`list_models`."""
+        return model in _MODEL_SET
+
+
+@atexit.register
+def _close_shared_http_pool() -> None:
+    # Release keep-alive sockets held by the shared pools at shutdown
+    pool = LiteLLMClient._HTTP_CLIENT
+    if pool is not None:
+        LiteLLMClient._HTTP_CLIENT = None
+        pool.close()
+    for loop, async_pool in list(LiteLLMClient._ASYNC_HTTP_CLIENTS.items()):
+        # Async pools can only be closed on their own loop; pools of loops
+        # that already shut down were closed with them
+        try:
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(async_pool.aclose(), loop).result(
+                    _ATEXIT_CLOSE_TIMEOUT
+                )
+            elif not loop.is_closed():
+                loop.run_until_complete(async_pool.aclose())
+        except Exception as e:
+            logger.debug(f"Closing async connection pool at exit failed: {e}")
+        _release_async_pool(async_pool)
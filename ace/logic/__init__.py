@@ -1,18 +1,25 @@
 """Logic diagnosis extensions for ACE."""
 
-from .environment import FaultSpec, LogicDiagnosisEnvironment, TesterResponse
+from .environment import (
+    FaultSpec,
+    LogicDiagnosisEnvironment,
+    TesterResponse,
+    TesterResponseColumns,
+)
 from .generator import (
     ActionDecision,
     LogicDiagnosisGenerator,
 )
-from .prompts import LOGIC_DECISION_PROMPT, LOGIC_ACTION_PROMPTS
+from .prompts import LOGIC_ACTION_PROMPTS, LOGIC_DECISION_PROMPT, LOGIC_FUSED_PROMPT
 
 __all__ = [
     "FaultSpec",
     "LogicDiagnosisEnvironment",
     "TesterResponse",
+    "TesterResponseColumns",
     "ActionDecision",
     "LogicDiagnosisGenerator",
     "LOGIC_DECISION_PROMPT",
     "LOGIC_ACTION_PROMPTS",
+    "LOGIC_FUSED_PROMPT",
 ]
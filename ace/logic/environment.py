@@ -2,16 +2,19 @@
 
 from __future__ import annotations
 
-import json
+import functools
+import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Mapping, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from ..adaptation import EnvironmentResult, Sample, TaskEnvironment
+from ..compat import DATACLASS_SLOTS
+from ..json_utils import loads
 from ..roles import GeneratorOutput
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TesterResponse:
     """Single tester response entry following the JSON schema."""
 
@@ -20,8 +23,65 @@ class TesterResponse:
     faulty_outputs: List[Mapping[str, int]]
     differences: List[str]
 
+    def compute_differences(self) -> List[str]:
+        """Output signals that differ in any pattern, derived from the outputs."""
+        return TesterResponseColumns.from_responses((self,)).differing_outputs()
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class TesterResponseColumns:
+    """
+    Column-oriented view of tester responses.
+
+    Patterns from every response are flattened into rows, and each row is
+    packed into an int bitmask over the matching signal tuple (bit ``i`` set
+    means ``signals[i]`` is 1). Comparing good and faulty outputs is then one
+    XOR per pattern instead of a dict lookup per signal.
+    """
+
+    input_signals: Tuple[str, ...]
+    output_signals: Tuple[str, ...]
+    inputs: Tuple[int, ...]
+    good: Tuple[int, ...]
+    faulty: Tuple[int, ...]
+
+    @classmethod
+    def from_responses(
+        cls, responses: Iterable[TesterResponse]
+    ) -> "TesterResponseColumns":
+        """Pack the patterns of ``responses`` into bitmask columns."""
+        input_index: Dict[str, int] = {}
+        output_index: Dict[str, int] = {}
+        inputs: List[int] = []
+        good: List[int] = []
+        faulty: List[int] = []
+        for response in responses:
+            inputs.extend(_pack(row, input_index) for row in response.input_patterns)
+            good.extend(_pack(row, output_index) for row in response.good_outputs)
+            faulty.extend(_pack(row, output_index) for row in response.faulty_outputs)
+        if len(good) != len(faulty):
+            raise ValueError("good_outputs and faulty_outputs differ in length.")
+        return cls(
+            input_signals=tuple(input_index),
+            output_signals=tuple(output_index),
+            inputs=tuple(inputs),
+            good=tuple(good),
+            faulty=tuple(faulty),
+        )
+
+    def pattern_differences(self, index: int) -> List[str]:
+        """Output signals whose good and faulty values differ in one pattern."""
+        return _unpack(self.good[index] ^ self.faulty[index], self.output_signals)
+
+    def differing_outputs(self) -> List[str]:
+        """Output signals that differ in at least one pattern."""
+        mask = 0
+        for good, faulty in zip(self.good, self.faulty):
+            mask |= good ^ faulty
+        return _unpack(mask, self.output_signals)
+
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class FaultSpec:
     """Ground-truth fault information."""
 
@@ -39,14 +99,22 @@ class LogicDiagnosisEnvironment(TaskEnvironment):
         tolerance: Optional[float] = None,
     ) -> None:
         self._ground_truth = dict(ground_truth)
+        # Expected values never change, so normalize them once up front
+        self._expected = {
+            str(fault_id): (
+                spec,
+                _normalize(spec.location),
+                _normalize(spec.behavior),
+            )
+            for fault_id, spec in self._ground_truth.items()
+        }
         self._tolerance = tolerance
 
     @staticmethod
     def load_tester_responses(path: str | Path) -> Iterable[TesterResponse]:
         """Load tester responses from a JSON array following the required schema."""
 
-        with Path(path).open("r", encoding="utf-8") as fh:
-            payload = json.load(fh)
+        payload = loads(Path(path).read_bytes())
 
         if not isinstance(payload, list):
             raise ValueError("Tester responses JSON must be an array of pattern objects.")
@@ -75,10 +143,13 @@ class LogicDiagnosisEnvironment(TaskEnvironment):
         generator_output: GeneratorOutput,
     ) -> EnvironmentResult:
         prediction = _parse_prediction(generator_output.final_answer)
-        fault_id = str(sample.metadata.get("fault_id", sample.metadata.get("id", "")))
-        expected = self._ground_truth.get(fault_id)
+        metadata = sample.metadata
+        fault_id = str(
+            metadata["fault_id"] if "fault_id" in metadata else metadata.get("id", "")
+        )
+        entry = self._expected.get(fault_id)
 
-        if expected is None:
+        if entry is None:
             feedback = "No ground truth found for fault_id; unable to score prediction."
             metrics = {"matched_location": 0.0, "matched_behavior": 0.0}
             return EnvironmentResult(
@@ -87,8 +158,9 @@ class LogicDiagnosisEnvironment(TaskEnvironment):
                 metrics=metrics,
             )
 
-        location_match = _matches(prediction.location, expected.location)
-        behavior_match = _matches(prediction.behavior, expected.behavior)
+        expected, expected_location, expected_behavior = entry
+        location_match = prediction.location_key == expected_location
+        behavior_match = prediction.behavior_key == expected_behavior
         score = 1.0 if location_match and behavior_match else 0.0
         feedback_parts = [
             f"predicted location={prediction.location or 'unknown'}",
@@ -109,31 +181,44 @@ class LogicDiagnosisEnvironment(TaskEnvironment):
         )
 
 
-def _matches(candidate: Optional[str], expected: str) -> bool:
-    if candidate is None:
-        return False
-    return candidate.strip().lower() == expected.strip().lower()
+def _normalize(value: Optional[str]) -> Optional[str]:
+    """Case- and whitespace-insensitive comparison key for a fault field."""
+    return None if value is None else value.strip().lower()
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class _Prediction:
     location: Optional[str] = None
     behavior: Optional[str] = None
+    # Normalized forms, computed once per parsed answer for scoring
+    location_key: Optional[str] = None
+    behavior_key: Optional[str] = None
+
+    @classmethod
+    def of(cls, location: Optional[str], behavior: Optional[str]) -> "_Prediction":
+        return cls(location, behavior, _normalize(location), _normalize(behavior))
 
 
+# First whitespace-delimited token mentioning a stuck-at behavior
+_STUCK_AT_RE = re.compile(r"\S*stuck-at\S*", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
 def _parse_prediction(final_answer: str) -> _Prediction:
-    """Interpret the generator's final answer as a structured prediction."""
+    """Interpret the generator's final answer as a structured prediction.
+
+    Memoized: reflection passes often re-score the same answer.
+    """
 
     final_answer = final_answer.strip()
     if not final_answer:
         return _Prediction()
 
+    behavior: Optional[str]
     # Prefer JSON payloads if available
-    if final_answer.startswith("{") and final_answer.endswith("}"):
+    if final_answer[0] == "{" and final_answer[-1] == "}":
         try:
-            import json
-
-            data = json.loads(final_answer)
+            data = loads(final_answer)
             location = str(data.get("location") or data.get("suspect") or "")
             behavior = str(
                 data.get("behavior")
@@ -141,19 +226,29 @@ def _parse_prediction(final_answer: str) -> _Prediction:
                 or data.get("stuck_at")
                 or ""
             )
-            return _Prediction(location=location or None, behavior=behavior or None)
-        except (json.JSONDecodeError, TypeError, ValueError):
+            return _Prediction.of(location or None, behavior or None)
+        except (TypeError, ValueError):
             pass
 
     # Fallback: look for "stuck-at" like text
-    tokens = final_answer.split()
-    location = tokens[0] if tokens else None
-    behavior = None
-    for token in tokens:
-        if "stuck-at" in token.lower():
-            behavior = token.strip(",.;")
-            break
-    return _Prediction(location=location, behavior=behavior)
+    location = final_answer.split(None, 1)[0]
+    match = _STUCK_AT_RE.search(final_answer)
+    behavior = match.group().strip(",.;") if match else None
+    return _Prediction.of(location, behavior)
+
+
+def _pack(row: Mapping[str, int], index: Dict[str, int]) -> int:
+    """Pack a signal assignment into a bitmask, assigning new signals a bit."""
+    mask = 0
+    for signal, value in row.items():
+        bit = index.setdefault(signal, len(index))
+        if value:
+            mask |= 1 << bit
+    return mask
+
+
+def _unpack(mask: int, signals: Sequence[str]) -> List[str]:
+    return [signal for bit, signal in enumerate(signals) if mask >> bit & 1]
 
 
 def _coerce_pattern_list(
@@ -167,6 +262,11 @@ def _coerce_pattern_list(
         raise ValueError(
             f"'{field_name}' must be a list of mappings for tester response {index}"
         )
+    try:
+        # Fast path: JSON object keys are already strings
+        return [{k: int(v) for k, v in entry.items()} for entry in value]
+    except (AttributeError, TypeError):
+        pass  # rescan below to report the offending entry
     normalised: List[Mapping[str, int]] = []
     for entry_pos, entry in enumerate(value):
         if not isinstance(entry, Mapping):
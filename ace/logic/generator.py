@@ -2,20 +2,103 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 from dataclasses import dataclass
-from typing import Any, Dict, Mapping, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 from typing import Literal
 
-from ..llm import LLMClient
+from .._sync import run_sync
+from ..compat import DATACLASS_SLOTS
+from ..json_utils import dumps, read_json_object
+from ..llm import LLMClient, LLMResponse
+from ..cache import LLMCache
 from ..playbook import Playbook
 from ..roles import GeneratorOutput
 from ..roles import _format_optional  # reuse helper
 from ..roles import _safe_json_loads
-from .prompts import LOGIC_ACTION_PROMPTS, LOGIC_DECISION_PROMPT
+from ..templating import CompiledTemplate
+from .prompts import (
+    LOGIC_ACTION_GUIDANCE,
+    LOGIC_ACTION_PROMPTS,
+    LOGIC_ACTION_PROMPTS_COMPACT,
+    LOGIC_DECISION_PROMPT,
+    LOGIC_DECISION_PROMPT_COMPACT,
+    LOGIC_DECISION_REPAIR_PROMPT,
+    LOGIC_FUSED_PROMPT,
+    LOGIC_REPAIR_PROMPT,
+)
 
 
-@dataclass
+def _action_payload_error(data: Dict[str, Any]) -> Optional[str]:
+    """Describe why an action reply does not match its schema, if it doesn't."""
+    if "final_answer" not in data:
+        return "missing required key `final_answer`"
+    if not isinstance(data.get("reasoning", ""), str):
+        return "`reasoning` must be a string"
+    bullet_ids = data.get("bullet_ids", [])
+    if not isinstance(bullet_ids, list):
+        return "`bullet_ids` must be an array"
+    for position, item in enumerate(bullet_ids):
+        if not isinstance(item, (str, int)):
+            return f"`bullet_ids[{position}]` must be a string or integer"
+    return None
+
+
+class _SchemaError(ValueError):
+    """A reply parsed as JSON but does not match the schema."""
+
+    def __init__(self, problem: str) -> None:
+        super().__init__(f"LLM reply does not match the schema: {problem}")
+        self.problem = problem
+
+
+def _retry_prompt(base_prompt: str, error: Exception) -> str:
+    prompt = (
+        base_prompt
+        + "\n\nReturn only valid JSON with reasoning, bullet_ids, final_answer."
+    )
+    if isinstance(error, _SchemaError):
+        prompt += f" Your previous reply had {error.problem}."
+    return prompt
+
+
+def _repair_reason(error: Optional[Exception]) -> str:
+    if isinstance(error, _SchemaError):
+        return f"it had {error.problem}."
+    return "it is not valid JSON."
+
+
+def _with_decision(
+    output: GeneratorOutput, decision: ActionDecision
+) -> GeneratorOutput:
+    return GeneratorOutput(
+        reasoning=output.reasoning,
+        final_answer=output.final_answer,
+        bullet_ids=output.bullet_ids,
+        raw={**output.raw, "decision": decision.raw},
+    )
+
+
+def _split_cacheable(template: str) -> Tuple[CompiledTemplate, CompiledTemplate]:
+    """Split a template right after its ``{playbook}`` field.
+
+    Everything up to the playbook only changes when the playbook does, so it
+    forms a prefix that providers can cache across samples.
+    """
+    head, field, tail = template.partition("{playbook}")
+    if not field:
+        return CompiledTemplate(""), CompiledTemplate(template)
+    return CompiledTemplate(head + field), CompiledTemplate(tail)
+
+
+# Fields that stay fixed for a given playbook and generator configuration
+_STABLE_FIELDS = frozenset(
+    {"playbook", "available_actions", "graph_guidance", "action_instructions"}
+)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ActionDecision:
     """Outcome of the decision maker stage."""
 
@@ -34,39 +117,112 @@ class LogicDiagnosisGenerator:
         self,
         llm: LLMClient,
         *,
-        decision_prompt: str = LOGIC_DECISION_PROMPT,
+        decision_prompt: Optional[str] = None,
         action_prompts: Optional[Mapping[str, str]] = None,
         max_retries: int = 3,
         graph_mode: Literal["disabled", "dataframe", "networkx"] = "dataframe",
+        response_format: Optional[Mapping[str, Any]] = None,
+        prompt_caching: bool = False,
+        response_cache: Optional[LLMCache] = None,
+        fused: bool = False,
+        fused_prompt: str = LOGIC_FUSED_PROMPT,
+        stream_json: bool = False,
+        verbose_prompts: bool = True,
+        decision_llm: Optional[LLMClient] = None,
+        action_llms: Optional[Mapping[str, LLMClient]] = None,
+        repair_llm: Optional[LLMClient] = None,
+        playbook_top_k: Optional[int] = None,
     ) -> None:
         self.llm = llm
+        # Optional routing: pick the action with a cheaper decision_llm and
+        # run simple actions (e.g. submission, matching) on smaller models.
+        # Anything not routed, including fused calls, goes to llm
+        self.decision_llm = decision_llm or llm
+        self.action_llms = dict(action_llms or {})
+        # When set, unusable decision and action replies are sent back to
+        # this (ideally small) model to be fixed instead of re-sending or
+        # failing the whole prompt
+        self.repair_llm = repair_llm
+        self._repair_template = CompiledTemplate(LOGIC_REPAIR_PROMPT)
+        self._decision_repair_template = CompiledTemplate(LOGIC_DECISION_REPAIR_PROMPT)
+        # Embed only the k bullets most relevant to each question; the
+        # playbook then varies per sample, so its prefix is not reused
+        self.playbook_top_k = playbook_top_k
+        # verbose_prompts=False swaps in the terse defaults for A/B runs;
+        # explicitly passed prompts are always used as given
+        self.verbose_prompts = verbose_prompts
+        if decision_prompt is None:
+            decision_prompt = (
+                LOGIC_DECISION_PROMPT
+                if verbose_prompts
+                else LOGIC_DECISION_PROMPT_COMPACT
+            )
+        if not action_prompts:
+            action_prompts = (
+                LOGIC_ACTION_PROMPTS
+                if verbose_prompts
+                else LOGIC_ACTION_PROMPTS_COMPACT
+            )
         self.decision_prompt = decision_prompt
-        self.action_prompts = dict(action_prompts or LOGIC_ACTION_PROMPTS)
+        prompts = dict(action_prompts)
         self.max_retries = max_retries
         self.graph_mode = graph_mode
+        # e.g. {"type": "json_object"} to have OpenAI-compatible clients
+        # enforce JSON output server-side and avoid re-prompting on bad JSON
+        self._llm_kwargs: Dict[str, Any] = {}
+        if response_format is not None:
+            self._llm_kwargs["response_format"] = dict(response_format)
+        # Send prompts as chat messages whose playbook prefix carries an
+        # Anthropic cache_control marker; requires a client that accepts
+        # messages=, such as LiteLLMClient
+        self.prompt_caching = prompt_caching
+        # Replays identical prompts without calling the LLM; the playbook is
+        # part of the prompt, so playbook edits naturally miss. Only share a
+        # cache with deterministic clients. Pass LLMCache(path=...) to persist
+        self.response_cache = response_cache
+        # Ask for the decision and the action result in one call, falling
+        # back to the two-step flow when the reply cannot be used
+        self.fused = fused
+        self.fused_prompt = fused_prompt
+        # Stream replies and hang up once the JSON object closes, skipping any
+        # trailing commentary; needs a client with complete_with_stream
+        self.stream_json = stream_json
         if self.graph_mode not in {"disabled", "dataframe", "networkx"}:
             raise ValueError(
                 "graph_mode must be one of 'disabled', 'dataframe', or 'networkx'"
             )
 
         if self.graph_mode == "disabled":
-            self.action_prompts.pop("graph", None)
+            prompts.pop("graph", None)
+        # Read-only: the templates below are compiled from these prompts once
+        self.action_prompts: Mapping[str, str] = MappingProxyType(prompts)
 
         self.available_actions = [
-            action
-            for action in self.BASE_ACTION_ORDER
-            if action in self.action_prompts
+            action for action in self.BASE_ACTION_ORDER if action in prompts
         ]
-        extra_actions = [
-            action
-            for action in self.action_prompts
-            if action not in self.available_actions
-        ]
-        self.available_actions.extend(extra_actions)
+        base_actions = frozenset(self.BASE_ACTION_ORDER)
+        self.available_actions.extend(
+            action for action in prompts if action not in base_actions
+        )
         if not self.available_actions:
             raise ValueError("LogicDiagnosisGenerator requires at least one action prompt.")
 
         self.graph_guidance = self._build_graph_guidance()
+        self._available_actions_str = ", ".join(self.available_actions)
+        # Parse every template once instead of on each str.format call
+        self._decision_templates = _split_cacheable(self.decision_prompt)
+        self._action_templates = {
+            action: _split_cacheable(template)
+            for action, template in self.action_prompts.items()
+        }
+        self._fused_templates = _split_cacheable(self.fused_prompt)
+        # Rendered prefixes by template key, tagged with the playbook fingerprint
+        self._prefix_cache: Dict[str, Tuple[str, str]] = {}
+        self.action_instructions = "\n".join(
+            f"- If you select `{action}`: "
+            + LOGIC_ACTION_GUIDANCE.get(action, "accomplish the stated objective.")
+            for action in self.available_actions
+        )
 
     def generate(
         self,
@@ -78,13 +234,24 @@ class LogicDiagnosisGenerator:
         tester_responses: Optional[str] = None,
         **kwargs: Any,
     ) -> GeneratorOutput:
+        if self.fused:
+            output = self._generate_fused(
+                question=question,
+                context=context,
+                playbook=playbook,
+                reflection=reflection,
+                tester_responses=tester_responses,
+                **kwargs,
+            )
+            if output is not None:
+                return output
         decision = self._decide_action(
             question=question,
             context=context,
             playbook=playbook,
             reflection=reflection,
         )
-        action_prompt = self._render_action_prompt(
+        action_prompt, cacheable = self._render_action_prompt(
             decision=decision,
             question=question,
             context=context,
@@ -92,17 +259,205 @@ class LogicDiagnosisGenerator:
             reflection=reflection,
             tester_responses=tester_responses,
         )
-        action_output = self._invoke_action(action_prompt, **kwargs)
-        payload = dict(action_output.raw)
-        payload["decision"] = decision.raw
-        return GeneratorOutput(
-            reasoning=action_output.reasoning,
-            final_answer=action_output.final_answer,
-            bullet_ids=action_output.bullet_ids,
-            raw=payload,
+        action_output = self._invoke_action(
+            action_prompt,
+            cacheable,
+            client=self.action_llms.get(decision.action, self.llm),
+            **kwargs,
+        )
+        return _with_decision(action_output, decision)
+
+    async def agenerate(
+        self,
+        *,
+        question: str,
+        context: Optional[str],
+        playbook: Playbook,
+        reflection: Optional[str] = None,
+        tester_responses: Optional[str] = None,
+        **kwargs: Any,
+    ) -> GeneratorOutput:
+        """Async variant of :meth:`generate`.
+
+        When the inputs make one action a likely pick (see
+        :meth:`_guess_action`), that action runs concurrently with the
+        decision call and its result is kept if the guess was right, hiding
+        one round-trip. The speculative prompt cannot include the decision's
+        reasoning and objective.
+        """
+        if self.fused:
+            prompt, cacheable = self._render_fused(
+                question=question,
+                context=context,
+                playbook=playbook,
+                reflection=reflection,
+                tester_responses=tester_responses,
+            )
+            response = await self._acomplete(
+                self.llm, prompt, cacheable, **{**self._llm_kwargs, **kwargs}
+            )
+            output = self._parse_fused(response.text)
+            if output is not None:
+                return output
+        prompt, cacheable = self._render_decision_prompt(
+            question=question,
+            context=context,
+            playbook=playbook,
+            reflection=reflection,
+        )
+        decision_task = asyncio.ensure_future(
+            self._acomplete(self.decision_llm, prompt, cacheable, **self._llm_kwargs)
+        )
+        guess = self._guess_action(playbook, reflection, tester_responses)
+        speculative: Optional[asyncio.Future] = None
+        if guess is not None:
+            speculative = asyncio.ensure_future(
+                self._ainvoke_action(
+                    *self._render_action_prompt(
+                        decision=ActionDecision(
+                            action=guess, objective="", reasoning="", raw={}
+                        ),
+                        question=question,
+                        context=context,
+                        playbook=playbook,
+                        reflection=reflection,
+                        tester_responses=tester_responses,
+                    ),
+                    client=self.action_llms.get(guess, self.llm),
+                    **kwargs,
+                )
+            )
+        try:
+            decision = await self._adecision_from_reply((await decision_task).text)
+            if speculative is not None and decision.action == guess:
+                return _with_decision(await speculative, decision)
+        finally:
+            if speculative is not None:
+                if not speculative.done():
+                    speculative.cancel()
+                elif not speculative.cancelled():
+                    speculative.exception()  # a wrong guess may fail unobserved
+        action_output = await self._ainvoke_action(
+            *self._render_action_prompt(
+                decision=decision,
+                question=question,
+                context=context,
+                playbook=playbook,
+                reflection=reflection,
+                tester_responses=tester_responses,
+            ),
+            client=self.action_llms.get(decision.action, self.llm),
+            **kwargs,
         )
+        return _with_decision(action_output, decision)
+
+    def generate_batch(
+        self, requests: Sequence[Mapping[str, Any]], max_concurrency: int = 20
+    ) -> List[GeneratorOutput]:
+        """Run :meth:`generate` for several requests, preserving their order.
+
+        Each request holds the keyword arguments of one :meth:`generate`
+        call. The calls run concurrently through :meth:`agenerate_batch` on
+        the shared background event loop, so this also works when called from
+        inside a running loop.
+        """
+        return run_sync(self.agenerate_batch(requests, max_concurrency))
+
+    async def agenerate_batch(
+        self, requests: Sequence[Mapping[str, Any]], max_concurrency: int = 20
+    ) -> List[GeneratorOutput]:
+        """Run :meth:`agenerate` for several requests concurrently.
+
+        Decision calls for all requests go out together, and each action call
+        follows as soon as its decision arrives; a semaphore keeps at most
+        ``max_concurrency`` generations in flight.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _one(request: Mapping[str, Any]) -> GeneratorOutput:
+            async with semaphore:
+                return await self.agenerate(**request)
+
+        return list(await asyncio.gather(*(_one(request) for request in requests)))
 
     # ------------------------------------------------------------------ #
+    def _guess_action(
+        self,
+        playbook: Playbook,
+        reflection: Optional[str],
+        tester_responses: Optional[str],
+    ) -> Optional[str]:
+        """Cheaply predict the decision when the inputs make it obvious."""
+        if "ready to submit" in playbook.as_prompt().lower():
+            guess = "submission"
+        elif tester_responses and reflection and "mismatch" in reflection.lower():
+            guess = "matching"
+        else:
+            return None
+        return guess if guess in self.action_prompts else None
+
+    def _generate_fused(
+        self,
+        *,
+        question: str,
+        context: Optional[str],
+        playbook: Playbook,
+        reflection: Optional[str],
+        tester_responses: Optional[str],
+        **kwargs: Any,
+    ) -> Optional[GeneratorOutput]:
+        """Decide and act in one call; returns None if the reply is unusable."""
+        prompt, cacheable = self._render_fused(
+            question=question,
+            context=context,
+            playbook=playbook,
+            reflection=reflection,
+            tester_responses=tester_responses,
+        )
+        response = self._complete(
+            self.llm, prompt, cacheable, **{**self._llm_kwargs, **kwargs}
+        )
+        return self._parse_fused(response.text)
+
+    def _render_fused(
+        self,
+        *,
+        question: str,
+        context: Optional[str],
+        playbook: Playbook,
+        reflection: Optional[str],
+        tester_responses: Optional[str],
+    ) -> Tuple[str, int]:
+        return self._render(
+            "__fused__",
+            self._fused_templates,
+            playbook,
+            {
+                "playbook": self._playbook_text(playbook, question, context),
+                "reflection": _format_optional(reflection),
+                "question": question,
+                "context": _format_optional(context),
+                "tester_responses": _format_optional(tester_responses),
+                "available_actions": self._available_actions_str,
+                "action_instructions": self.action_instructions,
+                "graph_guidance": self.graph_guidance,
+            },
+        )
+
+    def _parse_fused(self, text: str) -> Optional[GeneratorOutput]:
+        try:
+            data = _safe_json_loads(text)
+            decision_data = data.get("decision")
+            result_data = data.get("action_result")
+            if not isinstance(decision_data, dict) or not isinstance(result_data, dict):
+                raise ValueError("Fused reply lacks decision/action_result objects.")
+            if _action_payload_error(result_data) is not None:
+                raise ValueError("Fused action_result does not match the schema.")
+            decision = self._decision_from_data(decision_data)
+        except ValueError:
+            return None
+        return _with_decision(self._output_from_data(result_data), decision)
+
     def _decide_action(
         self,
         *,
@@ -111,20 +466,82 @@ class LogicDiagnosisGenerator:
         playbook: Playbook,
         reflection: Optional[str],
     ) -> ActionDecision:
-        prompt = self.decision_prompt.format(
-            playbook=playbook.as_prompt() or "(empty playbook)",
-            reflection=_format_optional(reflection),
+        prompt, cacheable = self._render_decision_prompt(
             question=question,
-            context=_format_optional(context),
-            available_actions=", ".join(self.available_actions),
-            graph_guidance=self.graph_guidance,
+            context=context,
+            playbook=playbook,
+            reflection=reflection,
         )
-        response = self.llm.complete(prompt)
-        data = _safe_json_loads(response.text)
+        text = self._complete(
+            self.decision_llm, prompt, cacheable, **self._llm_kwargs
+        ).text
+        for _ in range(self.max_retries - 1):
+            try:
+                return self._decision_from_data(_safe_json_loads(text))
+            except ValueError as err:
+                if self.repair_llm is None:
+                    raise
+                text = self._complete(
+                    self.repair_llm,
+                    self._decision_repair_prompt(text, err),
+                    0,
+                    **self._llm_kwargs,
+                ).text
+        return self._decision_from_data(_safe_json_loads(text))
+
+    def _render_decision_prompt(
+        self,
+        *,
+        question: str,
+        context: Optional[str],
+        playbook: Playbook,
+        reflection: Optional[str],
+    ) -> Tuple[str, int]:
+        return self._render(
+            "__decision__",
+            self._decision_templates,
+            playbook,
+            {
+                "playbook": self._playbook_text(playbook, question, context),
+                "reflection": _format_optional(reflection),
+                "question": question,
+                "context": _format_optional(context),
+                "available_actions": self._available_actions_str,
+                "graph_guidance": self.graph_guidance,
+            },
+        )
+
+    async def _adecision_from_reply(self, text: str) -> ActionDecision:
+        """Parse a decision reply, repairing it like :meth:`_decide_action`."""
+        for _ in range(self.max_retries - 1):
+            try:
+                return self._decision_from_data(_safe_json_loads(text))
+            except ValueError as err:
+                if self.repair_llm is None:
+                    raise
+                response = await self._acomplete(
+                    self.repair_llm,
+                    self._decision_repair_prompt(text, err),
+                    0,
+                    **self._llm_kwargs,
+                )
+                text = response.text
+        return self._decision_from_data(_safe_json_loads(text))
+
+    def _decision_repair_prompt(self, reply: str, error: Exception) -> str:
+        return self._decision_repair_template.format(
+            available_actions=self._available_actions_str,
+            error=_repair_reason(error),
+            reply=reply,
+        )
+
+    def _decision_from_data(self, data: Dict[str, Any]) -> ActionDecision:
         action = str(data.get("action", "")).strip().lower()
         if action not in self.action_prompts:
             valid = ", ".join(sorted(self.action_prompts))
-            raise ValueError(f"Unsupported action '{action}'. Valid options: {valid}")
+            raise _SchemaError(
+                f"unsupported action '{action}'; valid options are {valid}"
+            )
         objective = str(data.get("objective", "")).strip()
         reasoning = str(data.get("reasoning", "")).strip()
         return ActionDecision(
@@ -143,50 +560,215 @@ class LogicDiagnosisGenerator:
         playbook: Playbook,
         reflection: Optional[str],
         tester_responses: Optional[str],
+    ) -> Tuple[str, int]:
+        return self._render(
+            decision.action,
+            self._action_templates[decision.action],
+            playbook,
+            {
+                "playbook": self._playbook_text(playbook, question, context),
+                "reflection": _format_optional(reflection),
+                "question": question,
+                "context": _format_optional(context),
+                "decision_reasoning": decision.reasoning or "(no reasoning provided)",
+                "objective": decision.objective or "(unspecified)",
+                "tester_responses": _format_optional(tester_responses),
+                "graph_guidance": self.graph_guidance,
+            },
+        )
+
+    def _render(
+        self,
+        key: str,
+        templates: Tuple[CompiledTemplate, CompiledTemplate],
+        playbook: Playbook,
+        values: Dict[str, Any],
+    ) -> Tuple[str, int]:
+        """Render a split template; returns the prompt and its prefix length.
+
+        Prefixes built only from stable fields are reused for as long as the
+        playbook fingerprint is unchanged.
+        """
+        prefix_template, suffix_template = templates
+        if self.playbook_top_k is None and prefix_template.fields <= _STABLE_FIELDS:
+            fingerprint = playbook.fingerprint()
+            cached = self._prefix_cache.get(key)
+            if cached is None or cached[0] != fingerprint:
+                cached = (fingerprint, prefix_template.format(**values))
+                self._prefix_cache[key] = cached
+            prefix = cached[1]
+        else:
+            prefix = prefix_template.format(**values)
+        return prefix + suffix_template.format(**values), len(prefix)
+
+    def _playbook_text(
+        self, playbook: Playbook, question: str, context: Optional[str]
     ) -> str:
-        template = self.action_prompts[decision.action]
-        return template.format(
-            playbook=playbook.as_prompt() or "(empty playbook)",
-            reflection=_format_optional(reflection),
-            question=question,
-            context=_format_optional(context),
-            decision_reasoning=decision.reasoning or "(no reasoning provided)",
-            objective=decision.objective or "(unspecified)",
-            tester_responses=_format_optional(tester_responses),
-            graph_guidance=self.graph_guidance,
+        if self.playbook_top_k is None:
+            text = playbook.as_prompt()
+        else:
+            query = f"{question}\n{context}" if context else question
+            text = playbook.relevant_prompt(query, self.playbook_top_k)
+        return text or "(empty playbook)"
+
+    def _complete(
+        self, client: LLMClient, prompt: str, cacheable: int, **kwargs: Any
+    ) -> LLMResponse:
+        """Call ``client``, marking the first ``cacheable`` characters cacheable."""
+        cache = self.response_cache
+        cache_key = self._cache_key(client, prompt, kwargs)
+        self._add_cache_markers(prompt, cacheable, kwargs)
+        if cache is None or cache_key is None:
+            return self._call(client, prompt, kwargs)
+        # Concurrent workers asking the same question share one call
+        return cache.get_or_call(cache_key, lambda: self._call(client, prompt, kwargs))
+
+    async def _acomplete(
+        self, client: LLMClient, prompt: str, cacheable: int, **kwargs: Any
+    ) -> LLMResponse:
+        """Async :meth:`_complete`; replies are not streamed on this path."""
+        cache = self.response_cache
+        cache_key = self._cache_key(client, prompt, kwargs)
+        self._add_cache_markers(prompt, cacheable, kwargs)
+        if cache is None or cache_key is None:
+            return await client.acomplete(prompt, **kwargs)
+        return await cache.aget_or_call(
+            cache_key, lambda: client.acomplete(prompt, **kwargs)
         )
 
-    def _invoke_action(self, prompt: str, **kwargs: Any) -> GeneratorOutput:
+    def _call(
+        self, client: LLMClient, prompt: str, kwargs: Dict[str, Any]
+    ) -> LLMResponse:
+        if (
+            self.stream_json
+            and not kwargs.get("stream")
+            and hasattr(client, "complete_with_stream")
+        ):
+            chunks = client.complete_with_stream(prompt, **kwargs)
+            try:
+                return LLMResponse(text=read_json_object(chunks))
+            finally:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+        return client.complete(prompt, **kwargs)
+
+    def _cache_key(
+        self, client: LLMClient, prompt: str, kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        if self.response_cache is None or kwargs.get("stream"):
+            return None
+        return LLMCache.key_for({"model": client.model, "prompt": prompt, **kwargs})
+
+    def _add_cache_markers(
+        self, prompt: str, cacheable: int, kwargs: Dict[str, Any]
+    ) -> None:
+        if self.prompt_caching and cacheable:
+            kwargs["messages"] = [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": prompt[:cacheable],
+                            "cache_control": {"type": "ephemeral"},
+                        },
+                        {"type": "text", "text": prompt[cacheable:]},
+                    ],
+                }
+            ]
+
+    def _invoke_action(
+        self,
+        prompt: str,
+        cacheable: int = 0,
+        client: Optional[LLMClient] = None,
+        **kwargs: Any,
+    ) -> GeneratorOutput:
+        client = client or self.llm
         last_error: Optional[Exception] = None
         base_prompt = prompt
-        for attempt in range(self.max_retries):
-            response = self.llm.complete(prompt, **kwargs)
+        kwargs = {**self._llm_kwargs, **kwargs}
+        response: Optional[LLMResponse] = None
+        for _ in range(self.max_retries):
+            if response is None or self.repair_llm is None:
+                response = self._complete(client, prompt, cacheable, **kwargs)
+            else:
+                response = self._complete(
+                    self.repair_llm,
+                    self._repair_prompt(response.text, last_error),
+                    0,
+                    **self._llm_kwargs,
+                )
             try:
-                data = _safe_json_loads(response.text)
+                return self._parse_action_reply(response.text)
             except ValueError as err:
                 last_error = err
-                if attempt + 1 >= self.max_retries:
-                    break
-                prompt = base_prompt + "\n\nReturn only valid JSON with reasoning, bullet_ids, final_answer."
-                continue
-            reasoning = str(data.get("reasoning", ""))
-            final_answer_field = data.get("final_answer", "")
-            if isinstance(final_answer_field, (dict, list)):
-                final_answer = json.dumps(final_answer_field, ensure_ascii=False)
+                prompt = _retry_prompt(base_prompt, err)
+        raise RuntimeError(
+            "LogicDiagnosisGenerator failed to obtain valid JSON."
+        ) from last_error
+
+    async def _ainvoke_action(
+        self,
+        prompt: str,
+        cacheable: int = 0,
+        client: Optional[LLMClient] = None,
+        **kwargs: Any,
+    ) -> GeneratorOutput:
+        client = client or self.llm
+        last_error: Optional[Exception] = None
+        base_prompt = prompt
+        kwargs = {**self._llm_kwargs, **kwargs}
+        response: Optional[LLMResponse] = None
+        for _ in range(self.max_retries):
+            if response is None or self.repair_llm is None:
+                response = await self._acomplete(client, prompt, cacheable, **kwargs)
             else:
-                final_answer = str(final_answer_field)
-            bullet_ids = [
-                str(item)
-                for item in data.get("bullet_ids", [])
-                if isinstance(item, (str, int))
-            ]
-            return GeneratorOutput(
-                reasoning=reasoning,
-                final_answer=final_answer,
-                bullet_ids=bullet_ids,
-                raw=data,
-            )
-        raise RuntimeError("LogicDiagnosisGenerator failed to obtain valid JSON.") from last_error
+                response = await self._acomplete(
+                    self.repair_llm,
+                    self._repair_prompt(response.text, last_error),
+                    0,
+                    **self._llm_kwargs,
+                )
+            try:
+                return self._parse_action_reply(response.text)
+            except ValueError as err:
+                last_error = err
+                prompt = _retry_prompt(base_prompt, err)
+        raise RuntimeError(
+            "LogicDiagnosisGenerator failed to obtain valid JSON."
+        ) from last_error
+
+    def _repair_prompt(self, reply: str, error: Optional[Exception]) -> str:
+        return self._repair_template.format(error=_repair_reason(error), reply=reply)
+
+    def _parse_action_reply(self, text: str) -> GeneratorOutput:
+        data = _safe_json_loads(text)
+        problem = _action_payload_error(data)
+        if problem is not None:
+            raise _SchemaError(problem)
+        return self._output_from_data(data)
+
+    @staticmethod
+    def _output_from_data(data: Dict[str, Any]) -> GeneratorOutput:
+        reasoning = str(data.get("reasoning", ""))
+        final_answer_field = data.get("final_answer", "")
+        if isinstance(final_answer_field, (dict, list)):
+            final_answer = dumps(final_answer_field)
+        else:
+            final_answer = str(final_answer_field)
+        bullet_ids = [
+            str(item)
+            for item in data.get("bullet_ids", [])
+            if isinstance(item, (str, int))
+        ]
+        return GeneratorOutput(
+            reasoning=reasoning,
+            final_answer=final_answer,
+            bullet_ids=bullet_ids,
+            raw=data,
+        )
 
     def _build_graph_guidance(self) -> str:
         if self.graph_mode == "disabled":
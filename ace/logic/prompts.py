@@ -1,5 +1,7 @@
 """Prompt templates for the logic diagnosis workflow."""
 
+from types import MappingProxyType
+
 LOGIC_DECISION_PROMPT = """
 You are the logic diagnosis decision maker orchestrating specialised tools to
 identify a single stuck-at fault. Exactly one fault is present in each task, so
@@ -31,7 +33,14 @@ The `action` must be one of the available actions.
 Describe the `objective` that the chosen specialist must accomplish.
 """.strip()
 
-LOGIC_ACTION_PROMPTS = {
+# Output contract shared by every action prompt
+_ACTION_FOOTER = """
+
+Return JSON with `reasoning`, `bullet_ids`, and `final_answer` describing the
+suspected stuck-at fault. The `final_answer` must be valid JSON with fields
+`location` and `behavior`."""
+
+_LOGIC_ACTION_PROMPTS = {
     "graph": """
 You are the graph specialist using the netlist graph and backconer.
 {graph_guidance}
@@ -47,11 +56,7 @@ Task: {question}
 Context: {context}
 Recent reflections:
 {reflection}
-
-Return JSON with `reasoning`, `bullet_ids`, and `final_answer` describing the
-suspected stuck-at fault. The `final_answer` must be valid JSON with fields
-`location` and `behavior`.
-""".strip(),
+""".strip() + _ACTION_FOOTER,
     "simulation": """
 You are the simulation specialist coordinating ganga and hope.
 Exactly one fault is active in this task. Use the tester responses and new
@@ -68,11 +73,7 @@ Recent reflections:
 {reflection}
 Tester responses:
 {tester_responses}
-
-Return JSON with `reasoning`, `bullet_ids`, and `final_answer` describing the
-suspected stuck-at fault. The `final_answer` must be valid JSON with fields
-`location` and `behavior`.
-""".strip(),
+""".strip() + _ACTION_FOOTER,
     "generation": """
 You are the test generation specialist using atalanta.
 Exactly one fault is active in this task. Design new distinguishing patterns
@@ -89,11 +90,7 @@ Recent reflections:
 {reflection}
 Tester responses:
 {tester_responses}
-
-Return JSON with `reasoning`, `bullet_ids`, and `final_answer` describing the
-suspected stuck-at fault. The `final_answer` must be valid JSON with fields
-`location` and `behavior`.
-""".strip(),
+""".strip() + _ACTION_FOOTER,
     "matching": """
 You are the mismatch analyst using matcher to compare observed and expected
 outputs. Exactly one fault is present, so explain how the JSON tester responses
@@ -110,11 +107,7 @@ Recent reflections:
 {reflection}
 Tester responses:
 {tester_responses}
-
-Return JSON with `reasoning`, `bullet_ids`, and `final_answer` describing the
-suspected stuck-at fault. The `final_answer` must be valid JSON with fields
-`location` and `behavior`.
-""".strip(),
+""".strip() + _ACTION_FOOTER,
     "submission": """
 You are the closer responsible for packaging the leading hypothesis and calling
 submit_tests. Exactly one fault is active; ensure the final answer reflects the
@@ -131,9 +124,134 @@ Recent reflections:
 {reflection}
 Tester responses:
 {tester_responses}
+""".strip() + _ACTION_FOOTER,
+}
+# Default mappings are read-only: every generator shares them
+LOGIC_ACTION_PROMPTS = MappingProxyType(_LOGIC_ACTION_PROMPTS)
 
-Return JSON with `reasoning`, `bullet_ids`, and `final_answer` describing the
-suspected stuck-at fault. The `final_answer` must be valid JSON with fields
-`location` and `behavior`.
-""".strip(),
+# Per-action rules inlined into the fused prompt, one line per specialist
+_LOGIC_ACTION_GUIDANCE = {
+    "graph": "inspect the structural cones of the netlist graph relevant to the"
+    " single stuck-at fault.",
+    "simulation": "use the tester responses and new ganga/hope simulations to"
+    " validate or invalidate candidate locations.",
+    "generation": "design new distinguishing atalanta patterns, in the tester"
+    " response JSON schema, that help isolate the stuck-at fault.",
+    "matching": "compare observed and expected outputs with matcher and explain"
+    " how the tester responses support a single hypothesis.",
+    "submission": "package the leading hypothesis for submit_tests so the final"
+    " answer reflects the strongest evidence gathered so far.",
 }
+LOGIC_ACTION_GUIDANCE = MappingProxyType(_LOGIC_ACTION_GUIDANCE)
+
+LOGIC_FUSED_PROMPT = """
+You are the logic diagnosis decision maker orchestrating specialised tools to
+identify a single stuck-at fault. Exactly one fault is present in each task.
+Choose an action and then carry it out yourself in the same reply.
+
+Available actions: {available_actions}.
+{graph_guidance}
+{action_instructions}
+
+Tester responses arrive as a JSON array of test pattern objects with the
+following keys:
+- `input_patterns`: array of primary-input assignments {{PI_name: 0|1}}
+- `good_outputs`: array of primary-output assignments under fault-free
+  simulation
+- `faulty_outputs`: array of primary-output assignments under the suspected
+  fault
+- `differences`: array of primary-output names whose values differ
+
+Playbook of current strategies:
+{playbook}
+
+Recent reflections:
+{reflection}
+
+Task: {question}
+Context: {context}
+Tester responses:
+{tester_responses}
+
+Return a single JSON object with two keys:
+- `decision`: an object with `reasoning`, `action` (one of the available
+  actions), and `objective`.
+- `action_result`: an object with `reasoning`, `bullet_ids`, and
+  `final_answer` describing the suspected stuck-at fault. The `final_answer`
+  must be valid JSON with fields `location` and `behavior`.
+""".strip()
+
+# Terse variants of the prompts above (roughly half the tokens), selected with
+# LogicDiagnosisGenerator(verbose_prompts=False)
+_COMPACT_TESTER_SCHEMA = (
+    "Tester responses: JSON array of patterns with input_patterns"
+    " [{{PI:0|1}}], good_outputs, faulty_outputs, differences (differing POs)."
+)
+
+_COMPACT_ACTION_TAIL = """
+Playbook:
+{playbook}
+Decision: {decision_reasoning}
+Objective: {objective}
+Task: {question}
+Context: {context}
+Reflections: {reflection}
+Tester responses: {tester_responses}
+Return JSON {{"reasoning","bullet_ids","final_answer":{{"location","behavior"}}}}.
+""".rstrip()
+
+LOGIC_DECISION_PROMPT_COMPACT = (
+    """
+ROLE: logic diagnosis planner. One stuck-at fault per task; isolate it.
+Actions: {available_actions}.
+{graph_guidance}
+"""
+    + _COMPACT_TESTER_SCHEMA
+    + """
+Playbook:
+{playbook}
+Reflections: {reflection}
+Task: {question}
+Context: {context}
+Return JSON {{"reasoning","action" (one of the actions),"objective"}}.
+"""
+).strip()
+
+_LOGIC_ACTION_PROMPTS_COMPACT = {
+    "graph": "ROLE: graph(netlist cones). {graph_guidance}\n"
+    "TASK: inspect cones relevant to the single stuck-at fault."
+    + _COMPACT_ACTION_TAIL.replace("\nTester responses: {tester_responses}", ""),
+    "simulation": "ROLE: sim(ganga,hope). One fault active.\n"
+    "TASK: validate/invalidate candidate locations." + _COMPACT_ACTION_TAIL,
+    "generation": "ROLE: testgen(atalanta). One fault active.\n"
+    "TASK: design distinguishing patterns (tester response schema)."
+    + _COMPACT_ACTION_TAIL,
+    "matching": "ROLE: mismatch analyst(matcher). One fault present.\n"
+    "TASK: show how tester responses support one hypothesis." + _COMPACT_ACTION_TAIL,
+    "submission": "ROLE: closer(submit_tests). One fault active.\n"
+    "TASK: package the best-supported hypothesis." + _COMPACT_ACTION_TAIL,
+}
+LOGIC_ACTION_PROMPTS_COMPACT = MappingProxyType(_LOGIC_ACTION_PROMPTS_COMPACT)
+
+LOGIC_REPAIR_PROMPT = """
+The reply below was meant to be a JSON object with keys `reasoning` (string),
+`bullet_ids` (array of strings), and `final_answer` (JSON with fields
+`location` and `behavior`), but it could not be used: {error}
+
+Reply:
+{reply}
+
+Return only the corrected JSON object, keeping the original content.
+""".strip()
+
+
+LOGIC_DECISION_REPAIR_PROMPT = """
+The reply below was meant to be a JSON object with keys `reasoning` (string),
+`action` (one of: {available_actions}), and `objective` (string), but it could
+not be used: {error}
+
+Reply:
+{reply}
+
+Return only the corrected JSON object, keeping the original content.
+""".strip()
@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
+import math
+import re
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 from .delta import DeltaBatch, DeltaOperation
 
+_TERM_RE = re.compile(r"\w+")
+
+
+def _terms(text: str) -> FrozenSet[str]:
+    return frozenset(_TERM_RE.findall(text.lower()))
+
 
 @dataclass
 class Bullet:
@@ -48,6 +58,17 @@ class Playbook:
         self._bullets: Dict[str, Bullet] = {}
         self._sections: Dict[str, List[str]] = {}
         self._next_id = 0
+        # Bumped on every mutation so as_prompt() can reuse its last rendering
+        self._version = 0
+        self._prompt_cache: Optional[Tuple[int, str]] = None
+        self._fingerprint_cache: Optional[Tuple[int, str]] = None
+        # Per-bullet term sets for relevant_prompt(), tagged with the content
+        self._term_cache: Dict[str, Tuple[str, FrozenSet[str]]] = {}
+
+    @property
+    def version(self) -> int:
+        """Revision counter incremented by every playbook mutation."""
+        return self._version
 
     # ------------------------------------------------------------------ #
     # CRUD utils
@@ -65,6 +86,7 @@ class Playbook:
         bullet.apply_metadata(metadata)
         self._bullets[bullet_id] = bullet
         self._sections.setdefault(section, []).append(bullet_id)
+        self._version += 1
         return bullet
 
     def update_bullet(
@@ -82,6 +104,7 @@ class Playbook:
         if metadata:
             bullet.apply_metadata(metadata)
         bullet.updated_at = datetime.now(timezone.utc).isoformat()
+        self._version += 1
         return bullet
 
     def tag_bullet(
@@ -91,12 +114,15 @@ class Playbook:
         if bullet is None:
             return None
         bullet.tag(tag, increment=increment)
+        self._version += 1
         return bullet
 
     def remove_bullet(self, bullet_id: str) -> None:
         bullet = self._bullets.pop(bullet_id, None)
         if bullet is None:
             return
+        self._term_cache.pop(bullet_id, None)
+        self._version += 1
         section_list = self._sections.get(bullet.section)
         if section_list:
             self._sections[bullet.section] = [
@@ -226,9 +252,56 @@ class Playbook:
     # Presentation helpers
     # ------------------------------------------------------------------ #
     def as_prompt(self) -> str:
-        """Return a human-readable playbook string for prompting LLMs."""
+        """Return a human-readable playbook string for prompting LLMs.
+
+        The rendering is cached until the playbook is next mutated through
+        its own methods.
+        """
+        if self._prompt_cache is not None and self._prompt_cache[0] == self._version:
+            return self._prompt_cache[1]
+        prompt = self._render()
+        self._prompt_cache = (self._version, prompt)
+        return prompt
+
+    def relevant_prompt(self, query: str, k: int = 20) -> str:
+        """Render only the ``k`` bullets sharing the most terms with ``query``.
+
+        Bullets are scored by the cosine similarity of their word sets with
+        the query's, keeping prompts bounded as the playbook grows. Selected
+        bullets keep their usual section order; ties go to earlier bullets.
+        """
+        if len(self._bullets) <= k:
+            return self.as_prompt()
+        query_terms = _terms(query)
+        order = {bullet_id: index for index, bullet_id in enumerate(self._bullets)}
+        top = heapq.nlargest(
+            k,
+            self._bullets,
+            key=lambda bullet_id: (
+                self._similarity(bullet_id, query_terms),
+                -order[bullet_id],
+            ),
+        )
+        return self._render(frozenset(top))
+
+    def _similarity(self, bullet_id: str, query_terms: FrozenSet[str]) -> float:
+        content = self._bullets[bullet_id].content
+        cached = self._term_cache.get(bullet_id)
+        if cached is None or cached[0] != content:
+            cached = (content, _terms(content))
+            self._term_cache[bullet_id] = cached
+        terms = cached[1]
+        if not terms or not query_terms:
+            return 0.0
+        return len(terms & query_terms) / math.sqrt(len(terms) * len(query_terms))
+
+    def _render(self, include: Optional[AbstractSet[str]] = None) -> str:
         parts: List[str] = []
         for section, bullet_ids in sorted(self._sections.items()):
+            if include is not None:
+                bullet_ids = [bid for bid in bullet_ids if bid in include]
+                if not bullet_ids:
+                    continue
             parts.append(f"## {section}")
             for bullet_id in bullet_ids:
                 bullet = self._bullets[bullet_id]
@@ -236,6 +309,18 @@ class Playbook:
                 parts.append(f"- [{bullet.id}] {bullet.content} {counters}")
         return "\n".join(parts)
 
+    def fingerprint(self) -> str:
+        """Return a digest of :meth:`as_prompt`, equal for equal renderings.
+
+        Like the rendering, the digest is cached until the next mutation.
+        """
+        cached = self._fingerprint_cache
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        digest = hashlib.sha256(self.as_prompt().encode("utf-8")).hexdigest()
+        self._fingerprint_cache = (self._version, digest)
+        return digest
+
     def stats(self) -> Dict[str, object]:
         return {
             "sections": len(self._sections),
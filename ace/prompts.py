@@ -49,6 +49,10 @@ Prompt Variables:
         - {playbook}: Current full playbook
         - {question_context}: Question and feedback context
 
+    Reflect + Curate (fused, optional):
+        - All Reflector variables plus {progress}, {stats}, {playbook}
+          and {question_context}
+
 Tips for Custom Prompts:
     1. Keep JSON output format consistent
     2. Be specific about your domain (math, code, writing, etc.)
@@ -147,3 +151,55 @@ Respond with JSON:
 }}
 If no updates are required, return an empty list for "operations".
 """
+
+
+# Fused Reflector + Curator prompt - one call that reflects and emits the delta
+REFLECT_AND_CURATE_PROMPT = """\
+You are both the reviewer and the curator of the ACE playbook.
+First diagnose the generator's trajectory, then merge your findings into structured playbook updates.
+Only add genuinely new material. Do not regenerate the entire playbook.
+Output must be a single valid JSON object. Do NOT include analysis text or explanations outside the JSON.
+Begin the response with `{{` and end with `}}`.
+
+Question:
+{question}
+Model reasoning:
+{reasoning}
+Model prediction: {prediction}
+Ground truth (if available): {ground_truth}
+Feedback: {feedback}
+Playbook excerpts consulted:
+{playbook_excerpt}
+
+Training progress: {progress}
+Playbook stats: {stats}
+
+Current playbook:
+{playbook}
+
+Question context:
+{question_context}
+
+Return JSON:
+{{
+  "reasoning": "<analysis>",
+  "error_identification": "<what went wrong>",
+  "root_cause_analysis": "<why it happened>",
+  "correct_approach": "<what should be done>",
+  "key_insight": "<reusable takeaway>",
+  "bullet_tags": [
+    {{"id": "<bullet-id>", "tag": "helpful|harmful|neutral"}}
+  ],
+  "curator_reasoning": "<how you decided on the updates>",
+  "operations": [
+    {{
+      "type": "ADD|UPDATE|TAG|REMOVE",
+      "section": "<section name>",
+      "content": "<bullet text>",
+      "bullet_id": "<optional existing id>",
+      "metadata": {{"helpful": 1, "harmful": 0}}
+    }}
+  ]
+}}
+If no updates are required, return an empty list for "operations".
+"""
@@ -14,9 +14,14 @@ These prompts incorporate best practices from production AI systems including:
 Based on patterns from GPT-5, Claude 3.5, and 80+ production prompts.
 """
 
-from datetime import datetime
+import functools
+import time
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
+from .json_utils import loads
+from .templating import compile_template
+
 # ================================
 # GENERATOR PROMPT - VERSION 2.0
 # ================================
@@ -678,49 +683,53 @@ class PromptManager:
         else:
             prompt_key = version
 
-        prompt = self.PROMPTS["generator"].get(prompt_key)
-        if isinstance(prompt, str) and prompt.startswith("ace."):
-            # Handle v1 prompt references
-            from ace import prompts
-
-            prompt = getattr(prompts, prompt.split(".")[-1])
-
         # Track usage
         self._track_usage(f"generator-{prompt_key}")
 
-        # Add current date if v2 prompt
-        if "current_date" in prompt:
-            prompt = prompt.replace(
-                "{current_date}", datetime.now().strftime("%Y-%m-%d")
-            )
-
-        return prompt
+        return _resolve_prompt("generator", prompt_key, _today_str())
 
     def get_reflector_prompt(self, version: Optional[str] = None) -> str:
         """Get reflector prompt for specific version."""
         version = version or self.default_version
-        prompt = self.PROMPTS["reflector"].get(version)
-
-        if isinstance(prompt, str) and prompt.startswith("ace."):
-            from ace import prompts
-
-            prompt = getattr(prompts, prompt.split(".")[-1])
-
         self._track_usage(f"reflector-{version}")
-        return prompt
+        return _resolve_prompt("reflector", version)
 
     def get_curator_prompt(self, version: Optional[str] = None) -> str:
         """Get curator prompt for specific version."""
         version = version or self.default_version
-        prompt = self.PROMPTS["curator"].get(version)
+        self._track_usage(f"curator-{version}")
+        return _resolve_prompt("curator", version)
+
+    def format_generator(
+        self,
+        domain: Optional[str] = None,
+        version: Optional[str] = None,
+        **values: Any,
+    ) -> str:
+        """
+        Get the generator prompt and fill in its fields.
 
-        if isinstance(prompt, str) and prompt.startswith("ace."):
-            from ace import prompts
+        The template is parsed once and shared, so each call only joins the
+        literal text with the given values.
 
-            prompt = getattr(prompts, prompt.split(".")[-1])
+        Args:
+            domain: Domain (math, code, etc.) or None for general
+            version: Version string or None for default
+            **values: Field values (question, context, playbook, reflection)
 
-        self._track_usage(f"curator-{version}")
-        return prompt
+        Returns:
+            Prompt ready to send to the LLM
+        """
+        prompt = self.get_generator_prompt(domain=domain, version=version)
+        return compile_template(prompt).format(**values)
+
+    def format_reflector(self, version: Optional[str] = None, **values: Any) -> str:
+        """Get the reflector prompt with its fields filled in."""
+        return compile_template(self.get_reflector_prompt(version)).format(**values)
+
+    def format_curator(self, version: Optional[str] = None, **values: Any) -> str:
+        """Get the curator prompt with its fields filled in."""
+        return compile_template(self.get_curator_prompt(version)).format(**values)
 
     def _track_usage(self, prompt_id: str) -> None:
         """Track prompt usage for analysis."""
@@ -739,11 +748,95 @@ class PromptManager:
         }
 
 
+def _resolve_v1_references() -> None:
+    """Swap v1 ``"ace.prompts.NAME"`` entries for the prompt text, once."""
+    try:
+        from . import prompts
+    except ImportError:  # legacy prompts unavailable; keep the references
+        return
+    for registry in PromptManager.PROMPTS.values():
+        for key, prompt in registry.items():
+            if isinstance(prompt, str) and prompt.startswith("ace."):
+                registry[key] = getattr(prompts, prompt.rsplit(".", 1)[-1])
+
+
+_resolve_v1_references()
+
+# (role, version) pairs whose template has a {current_date} placeholder
+_HAS_CURRENT_DATE = frozenset(
+    (role, key)
+    for role, prompts in PromptManager.PROMPTS.items()
+    for key, template in prompts.items()
+    if isinstance(template, str) and "{current_date}" in template
+)
+
+# [next local midnight as a timestamp, today's date as YYYY-MM-DD]
+_today_cache: list = [0.0, ""]
+
+
+def _today_str() -> str:
+    """Return today's local date, formatting it only once per day."""
+    if time.time() >= _today_cache[0]:
+        now = datetime.now()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        # Concurrent refreshes write the same values, so no lock is needed
+        _today_cache[:] = [
+            (midnight + timedelta(days=1)).timestamp(),
+            now.strftime("%Y-%m-%d"),
+        ]
+    return _today_cache[1]
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_prompt(
+    role: str, prompt_key: str, date_str: Optional[str] = None
+) -> Optional[str]:
+    """
+    Resolve a registered prompt to its final text, memoized per arguments.
+
+    ``date_str``, when given, fills the ``{current_date}`` placeholder. Edits to
+    ``PromptManager.PROMPTS`` need ``_resolve_prompt.cache_clear()`` and, for
+    date placeholders, an updated ``_HAS_CURRENT_DATE``.
+    """
+    prompt = PromptManager.PROMPTS[role].get(prompt_key)
+
+    # Add current date if v2 prompt
+    if date_str is not None and (role, prompt_key) in _HAS_CURRENT_DATE:
+        prompt = prompt.replace("{current_date}", date_str)
+
+    return prompt
+
+
 # ================================
 # PROMPT VALIDATION UTILITIES
 # ================================
 
 
+# Per role: required top-level fields, and optionally (list field, item key,
+# allowed values, error label) for an enumerated key on each list item
+_OUTPUT_SCHEMAS = {
+    "generator": (("reasoning", "bullet_ids", "final_answer"), None),
+    "reflector": (
+        ("reasoning", "error_identification", "bullet_tags"),
+        (
+            "bullet_tags",
+            "tag",
+            ("helpful", "harmful", "neutral"),
+            "Invalid tag",
+        ),
+    ),
+    "curator": (
+        ("reasoning", "operations"),
+        (
+            "operations",
+            "type",
+            ("ADD", "UPDATE", "TAG", "REMOVE"),
+            "Invalid operation type",
+        ),
+    ),
+}
+
+
 def validate_prompt_output(output: str, role: str) -> tuple[bool, list[str]]:
     """
     Validate that prompt output meets requirements.
@@ -755,48 +848,31 @@ def validate_prompt_output(output: str, role: str) -> tuple[bool, list[str]]:
     Returns:
         (is_valid, error_messages)
     """
-    import json
-
     errors = []
 
     # Check if valid JSON
     try:
-        data = json.loads(output)
-    except json.JSONDecodeError as e:
+        data = loads(output)
+    except ValueError as e:
         errors.append(f"Invalid JSON: {e}")
         return False, errors
 
     # Role-specific validation
-    if role == "generator":
-        required = ["reasoning", "bullet_ids", "final_answer"]
-        for field in required:
-            if field not in data:
-                errors.append(f"Missing required field: {field}")
-
-        if "confidence_scores" in data:
-            for score in data["confidence_scores"].values():
-                if not 0 <= score <= 1:
-                    errors.append(f"Invalid confidence score: {score}")
-
-    elif role == "reflector":
-        required = ["reasoning", "error_identification", "bullet_tags"]
-        for field in required:
-            if field not in data:
-                errors.append(f"Missing required field: {field}")
-
-        for tag in data.get("bullet_tags", []):
-            if tag.get("tag") not in ["helpful", "harmful", "neutral"]:
-                errors.append(f"Invalid tag: {tag.get('tag')}")
-
-    elif role == "curator":
-        required = ["reasoning", "operations"]
-        for field in required:
-            if field not in data:
-                errors.append(f"Missing required field: {field}")
-
-        for op in data.get("operations", []):
-            if op.get("type") not in ["ADD", "UPDATE", "TAG", "REMOVE"]:
-                errors.append(f"Invalid operation type: {op.get('type')}")
+    required, enum_check = _OUTPUT_SCHEMAS.get(role, ((), None))
+    for field in required:
+        if field not in data:
+            errors.append(f"Missing required field: {field}")
+
+    if role == "generator" and "confidence_scores" in data:
+        for score in data["confidence_scores"].values():
+            if not 0 <= score <= 1:
+                errors.append(f"Invalid confidence score: {score}")
+
+    if enum_check is not None:
+        field, key, allowed, label = enum_check
+        for item in data.get(field, []):
+            if item.get(key) not in allowed:
+                errors.append(f"{label}: {item.get(key)}")
 
     return len(errors) == 0, errors
 
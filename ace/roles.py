@@ -5,18 +5,31 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
+from .compat import DATACLASS_SLOTS
 from .delta import DeltaBatch
+from .json_utils import loads, repair_json_object
 from .llm import LLMClient
 from .playbook import Playbook
-from .prompts import CURATOR_PROMPT, GENERATOR_PROMPT, REFLECTOR_PROMPT
+from .prompts import (
+    CURATOR_PROMPT,
+    GENERATOR_PROMPT,
+    REFLECT_AND_CURATE_PROMPT,
+    REFLECTOR_PROMPT,
+)
+from .templating import compile_template
 
 
 def _safe_json_loads(text: str) -> Dict[str, Any]:
     try:
-        data = json.loads(text)
-    except json.JSONDecodeError as exc:
+        data = loads(text)
+    except ValueError as exc:
+        # Models often wrap the object in prose or a code fence, or leave
+        # trailing commas; salvage it locally instead of paying for a retry
+        repaired = repair_json_object(text)
+        if repaired is not None:
+            return repaired
         debug_path = Path("logs/json_failures.log")
         debug_path.parent.mkdir(parents=True, exist_ok=True)
         with debug_path.open("a", encoding="utf-8") as fh:
@@ -33,7 +46,7 @@ def _format_optional(value: Optional[str]) -> str:
     return value or "(none)"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class GeneratorOutput:
     reasoning: str
     final_answer: str
@@ -111,41 +124,117 @@ class Generator:
         Returns:
             GeneratorOutput with reasoning, final_answer, and bullet_ids used
         """
-        base_prompt = self.prompt_template.format(
-            playbook=playbook.as_prompt() or "(empty playbook)",
-            reflection=_format_optional(reflection),
+        base_prompt = self._build_prompt(
             question=question,
-            context=_format_optional(context),
+            context=context,
+            playbook=playbook,
+            reflection=reflection,
         )
         prompt = base_prompt
         last_error: Optional[Exception] = None
         for attempt in range(self.max_retries):
             response = self.llm.complete(prompt, **kwargs)
             try:
-                data = _safe_json_loads(response.text)
-                reasoning = str(data.get("reasoning", ""))
-                final_answer = str(data.get("final_answer", ""))
-                bullet_ids = [
-                    str(item)
-                    for item in data.get("bullet_ids", [])
-                    if isinstance(item, (str, int))
-                ]
-                return GeneratorOutput(
-                    reasoning=reasoning,
-                    final_answer=final_answer,
-                    bullet_ids=bullet_ids,
-                    raw=data,
-                )
+                return self._parse_response(response.text)
             except ValueError as err:
                 last_error = err
                 if attempt + 1 >= self.max_retries:
                     break
-                prompt = (
-                    base_prompt + "\n\n务必仅输出单个有效 JSON 对象，"
-                    "请转义所有引号或改用单引号，避免输出额外文本。"
-                )
+                prompt = self._retry_prompt(base_prompt)
+        raise RuntimeError("Generator failed to produce valid JSON.") from last_error
+
+    async def agenerate(
+        self,
+        *,
+        question: str,
+        context: Optional[str],
+        playbook: Playbook,
+        reflection: Optional[str] = None,
+        **kwargs: Any,
+    ) -> GeneratorOutput:
+        """Async variant of :meth:`generate` backed by ``llm.acomplete``."""
+        base_prompt = self._build_prompt(
+            question=question,
+            context=context,
+            playbook=playbook,
+            reflection=reflection,
+        )
+        prompt = base_prompt
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries):
+            response = await self.llm.acomplete(prompt, **kwargs)
+            try:
+                return self._parse_response(response.text)
+            except ValueError as err:
+                last_error = err
+                if attempt + 1 >= self.max_retries:
+                    break
+                prompt = self._retry_prompt(base_prompt)
         raise RuntimeError("Generator failed to produce valid JSON.") from last_error
 
+    def generate_batch(
+        self, requests: Sequence[Mapping[str, Any]], **kwargs: Any
+    ) -> List[GeneratorOutput]:
+        """
+        Generate answers for several questions with one batched LLM call.
+
+        Args:
+            requests: Keyword arguments for :meth:`generate`, one per question
+            **kwargs: Additional arguments passed to the LLM
+
+        Returns:
+            GeneratorOutput objects in request order. Responses that fail to
+            parse are retried individually through :meth:`generate`.
+        """
+        prompts = [self._build_prompt(**request) for request in requests]
+        responses = self.llm.batch_complete(prompts, **kwargs)
+        outputs: List[GeneratorOutput] = []
+        for request, response in zip(requests, responses):
+            try:
+                outputs.append(self._parse_response(response.text))
+            except ValueError:
+                outputs.append(self.generate(**request, **kwargs))
+        return outputs
+
+    def _build_prompt(
+        self,
+        *,
+        question: str,
+        context: Optional[str],
+        playbook: Playbook,
+        reflection: Optional[str],
+    ) -> str:
+        return compile_template(self.prompt_template).format(
+            playbook=playbook.as_prompt() or "(empty playbook)",
+            reflection=_format_optional(reflection),
+            question=question,
+            context=_format_optional(context),
+        )
+
+    @staticmethod
+    def _retry_prompt(base_prompt: str) -> str:
+        return (
+            base_prompt + "\n\n务必仅输出单个有效 JSON 对象，"
+            "请转义所有引号或改用单引号，避免输出额外文本。"
+        )
+
+    @staticmethod
+    def _parse_response(text: str) -> GeneratorOutput:
+        data = _safe_json_loads(text)
+        reasoning = str(data.get("reasoning", ""))
+        final_answer = str(data.get("final_answer", ""))
+        bullet_ids = [
+            str(item)
+            for item in data.get("bullet_ids", [])
+            if isinstance(item, (str, int))
+        ]
+        return GeneratorOutput(
+            reasoning=reasoning,
+            final_answer=final_answer,
+            bullet_ids=bullet_ids,
+            raw=data,
+        )
+
 
 @dataclass
 class BulletTag:
@@ -199,10 +288,12 @@ class Reflector:
         prompt_template: str = REFLECTOR_PROMPT,
         *,
         max_retries: int = 3,
+        fused_prompt_template: str = REFLECT_AND_CURATE_PROMPT,
     ) -> None:
         self.llm = llm
         self.prompt_template = prompt_template
         self.max_retries = max_retries
+        self.fused_prompt_template = fused_prompt_template
 
     def reflect(
         self,
@@ -215,14 +306,12 @@ class Reflector:
         max_refinement_rounds: int = 1,
         **kwargs: Any,
     ) -> ReflectorOutput:
-        playbook_excerpt = _make_playbook_excerpt(playbook, generator_output.bullet_ids)
-        base_prompt = self.prompt_template.format(
+        base_prompt = self._build_prompt(
             question=question,
-            reasoning=generator_output.reasoning,
-            prediction=generator_output.final_answer,
-            ground_truth=_format_optional(ground_truth),
-            feedback=_format_optional(feedback),
-            playbook_excerpt=playbook_excerpt or "(no bullets referenced)",
+            generator_output=generator_output,
+            playbook=playbook,
+            ground_truth=ground_truth,
+            feedback=feedback,
         )
         result: Optional[ReflectorOutput] = None
         prompt = base_prompt
@@ -234,47 +323,252 @@ class Reflector:
                     prompt, refinement_round=round_idx, **kwargs
                 )
                 try:
-                    data = _safe_json_loads(response.text)
-                    bullet_tags: List[BulletTag] = []
-                    tags_payload = data.get("bullet_tags", [])
-                    if isinstance(tags_payload, Sequence):
-                        for item in tags_payload:
-                            if (
-                                isinstance(item, dict)
-                                and "id" in item
-                                and "tag" in item
-                            ):
-                                bullet_tags.append(
-                                    BulletTag(
-                                        id=str(item["id"]), tag=str(item["tag"]).lower()
-                                    )
-                                )
-                    candidate = ReflectorOutput(
-                        reasoning=str(data.get("reasoning", "")),
-                        error_identification=str(data.get("error_identification", "")),
-                        root_cause_analysis=str(data.get("root_cause_analysis", "")),
-                        correct_approach=str(data.get("correct_approach", "")),
-                        key_insight=str(data.get("key_insight", "")),
-                        bullet_tags=bullet_tags,
-                        raw=data,
-                    )
+                    candidate = self._parse_response(response.text)
                     result = candidate
                     # Early exit if we already have actionable output
-                    if bullet_tags or candidate.key_insight:
+                    if candidate.bullet_tags or candidate.key_insight:
                         return candidate
                     break
                 except ValueError as err:
                     last_error = err
                     if attempt + 1 >= self.max_retries:
                         break
-                    prompt = (
-                        base_prompt + "\n\n请严格输出有效 JSON，对双引号进行转义，"
-                        "不要输出额外解释性文本。"
-                    )
+                    prompt = self._retry_prompt(base_prompt)
         if result is None:
             raise RuntimeError("Reflector failed to produce a result.") from last_error
         return result
 
+    async def areflect(
+        self,
+        *,
+        question: str,
+        generator_output: GeneratorOutput,
+        playbook: Playbook,
+        ground_truth: Optional[str],
+        feedback: Optional[str],
+        max_refinement_rounds: int = 1,
+        **kwargs: Any,
+    ) -> ReflectorOutput:
+        """Async variant of :meth:`reflect` backed by ``llm.acomplete``."""
+        base_prompt = self._build_prompt(
+            question=question,
+            generator_output=generator_output,
+            playbook=playbook,
+            ground_truth=ground_truth,
+            feedback=feedback,
+        )
+        result: Optional[ReflectorOutput] = None
+        prompt = base_prompt
+        last_error: Optional[Exception] = None
+        for round_idx in range(max_refinement_rounds):
+            prompt = base_prompt
+            for attempt in range(self.max_retries):
+                response = await self.llm.acomplete(
+                    prompt, refinement_round=round_idx, **kwargs
+                )
+                try:
+                    candidate = self._parse_response(response.text)
+                    result = candidate
+                    if candidate.bullet_tags or candidate.key_insight:
+                        return candidate
+                    break
+                except ValueError as err:
+                    last_error = err
+                    if attempt + 1 >= self.max_retries:
+                        break
+                    prompt = self._retry_prompt(base_prompt)
+        if result is None:
+            raise RuntimeError("Reflector failed to produce a result.") from last_error
+        return result
+
+    def reflect_batch(
+        self,
+        requests: Sequence[Mapping[str, Any]],
+        *,
+        max_refinement_rounds: int = 1,
+        **kwargs: Any,
+    ) -> List[ReflectorOutput]:
+        """
+        Reflect on several generator outputs with one batched LLM call.
+
+        The first refinement round is submitted as a batch. Responses that fail
+        to parse, or that need further refinement rounds, are re-run
+        individually through :meth:`reflect`.
+        """
+        prompts = [self._build_prompt(**request) for request in requests]
+        responses = self.llm.batch_complete(prompts, refinement_round=0, **kwargs)
+        outputs: List[ReflectorOutput] = []
+        for request, response in zip(requests, responses):
+            try:
+                candidate = self._parse_response(response.text)
+            except ValueError:
+                candidate = None
+            if candidate is not None and (
+                candidate.bullet_tags
+                or candidate.key_insight
+                or max_refinement_rounds <= 1
+            ):
+                outputs.append(candidate)
+                continue
+            outputs.append(
+                self.reflect(
+                    **request, max_refinement_rounds=max_refinement_rounds, **kwargs
+                )
+            )
+        return outputs
+
+    def reflect_and_curate(
+        self,
+        *,
+        question: str,
+        generator_output: GeneratorOutput,
+        playbook: Playbook,
+        ground_truth: Optional[str],
+        feedback: Optional[str],
+        question_context: str,
+        progress: str,
+        **kwargs: Any,
+    ) -> Tuple[ReflectorOutput, CuratorOutput]:
+        """
+        Reflect and produce the Curator's delta in a single LLM call.
+
+        Uses ``fused_prompt_template`` and makes exactly one request; callers
+        are expected to fall back to separate :meth:`reflect` and
+        :meth:`Curator.curate` calls when it fails.
+
+        Raises:
+            ValueError: If the response is not valid JSON or has no
+                ``operations`` list
+        """
+        prompt = self._build_fused_prompt(
+            question=question,
+            generator_output=generator_output,
+            playbook=playbook,
+            ground_truth=ground_truth,
+            feedback=feedback,
+            question_context=question_context,
+            progress=progress,
+        )
+        response = self.llm.complete(prompt, refinement_round=0, **kwargs)
+        return self._parse_fused_response(response.text)
+
+    async def areflect_and_curate(
+        self,
+        *,
+        question: str,
+        generator_output: GeneratorOutput,
+        playbook: Playbook,
+        ground_truth: Optional[str],
+        feedback: Optional[str],
+        question_context: str,
+        progress: str,
+        **kwargs: Any,
+    ) -> Tuple[ReflectorOutput, CuratorOutput]:
+        """Async variant of :meth:`reflect_and_curate` backed by ``llm.acomplete``."""
+        prompt = self._build_fused_prompt(
+            question=question,
+            generator_output=generator_output,
+            playbook=playbook,
+            ground_truth=ground_truth,
+            feedback=feedback,
+            question_context=question_context,
+            progress=progress,
+        )
+        response = await self.llm.acomplete(prompt, refinement_round=0, **kwargs)
+        return self._parse_fused_response(response.text)
+
+    def _build_fused_prompt(
+        self,
+        *,
+        question: str,
+        generator_output: GeneratorOutput,
+        playbook: Playbook,
+        ground_truth: Optional[str],
+        feedback: Optional[str],
+        question_context: str,
+        progress: str,
+    ) -> str:
+        playbook_excerpt = _make_playbook_excerpt(playbook, generator_output.bullet_ids)
+        return compile_template(self.fused_prompt_template).format(
+            question=question,
+            reasoning=generator_output.reasoning,
+            prediction=generator_output.final_answer,
+            ground_truth=_format_optional(ground_truth),
+            feedback=_format_optional(feedback),
+            playbook_excerpt=playbook_excerpt or "(no bullets referenced)",
+            progress=progress,
+            stats=json.dumps(playbook.stats()),
+            playbook=playbook.as_prompt() or "(empty playbook)",
+            question_context=question_context,
+        )
+
+    @classmethod
+    def _parse_fused_response(cls, text: str) -> Tuple[ReflectorOutput, CuratorOutput]:
+        data = _safe_json_loads(text)
+        operations = data.pop("operations", None)
+        if not isinstance(operations, list):
+            raise ValueError("Fused response is missing an 'operations' list.")
+        curator_payload = {
+            "reasoning": data.pop("curator_reasoning", ""),
+            "operations": operations,
+        }
+        try:
+            delta = DeltaBatch.from_json(curator_payload)
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Fused response has malformed operations: {exc}") from exc
+        curator_output = CuratorOutput(delta=delta, raw=curator_payload)
+        return cls._reflection_from_data(data), curator_output
+
+    def _build_prompt(
+        self,
+        *,
+        question: str,
+        generator_output: GeneratorOutput,
+        playbook: Playbook,
+        ground_truth: Optional[str],
+        feedback: Optional[str],
+    ) -> str:
+        playbook_excerpt = _make_playbook_excerpt(playbook, generator_output.bullet_ids)
+        return compile_template(self.prompt_template).format(
+            question=question,
+            reasoning=generator_output.reasoning,
+            prediction=generator_output.final_answer,
+            ground_truth=_format_optional(ground_truth),
+            feedback=_format_optional(feedback),
+            playbook_excerpt=playbook_excerpt or "(no bullets referenced)",
+        )
+
+    @staticmethod
+    def _retry_prompt(base_prompt: str) -> str:
+        return (
+            base_prompt + "\n\n请严格输出有效 JSON，对双引号进行转义，"
+            "不要输出额外解释性文本。"
+        )
+
+    @staticmethod
+    def _parse_response(text: str) -> ReflectorOutput:
+        return Reflector._reflection_from_data(_safe_json_loads(text))
+
+    @staticmethod
+    def _reflection_from_data(data: Dict[str, Any]) -> ReflectorOutput:
+        bullet_tags: List[BulletTag] = []
+        tags_payload = data.get("bullet_tags", [])
+        if isinstance(tags_payload, Sequence):
+            for item in tags_payload:
+                if isinstance(item, dict) and "id" in item and "tag" in item:
+                    bullet_tags.append(
+                        BulletTag(id=str(item["id"]), tag=str(item["tag"]).lower())
+                    )
+        return ReflectorOutput(
+            reasoning=str(data.get("reasoning", "")),
+            error_identification=str(data.get("error_identification", "")),
+            root_cause_analysis=str(data.get("root_cause_analysis", "")),
+            correct_approach=str(data.get("correct_approach", "")),
+            key_insight=str(data.get("key_insight", "")),
+            bullet_tags=bullet_tags,
+            raw=data,
+        )
+
 
 @dataclass
 class CuratorOutput:
@@ -364,32 +658,83 @@ class Curator:
         Raises:
             RuntimeError: If unable to produce valid JSON after max_retries
         """
-        base_prompt = self.prompt_template.format(
-            progress=progress,
-            stats=json.dumps(playbook.stats()),
-            reflection=json.dumps(reflection.raw, ensure_ascii=False, indent=2),
-            playbook=playbook.as_prompt() or "(empty playbook)",
+        base_prompt = self._build_prompt(
+            reflection=reflection,
+            playbook=playbook,
             question_context=question_context,
+            progress=progress,
         )
         prompt = base_prompt
         last_error: Optional[Exception] = None
         for attempt in range(self.max_retries):
             response = self.llm.complete(prompt, **kwargs)
             try:
-                data = _safe_json_loads(response.text)
-                delta = DeltaBatch.from_json(data)
-                return CuratorOutput(delta=delta, raw=data)
+                return self._parse_response(response.text)
             except ValueError as err:
                 last_error = err
                 if attempt + 1 >= self.max_retries:
                     break
-                prompt = (
-                    base_prompt
-                    + "\n\n提醒：仅输出有效 JSON，所有字符串请转义双引号或改用单引号，"
-                    "不要添加额外文本。"
-                )
+                prompt = self._retry_prompt(base_prompt)
         raise RuntimeError("Curator failed to produce valid JSON.") from last_error
 
+    async def acurate(
+        self,
+        *,
+        reflection: ReflectorOutput,
+        playbook: Playbook,
+        question_context: str,
+        progress: str,
+        **kwargs: Any,
+    ) -> CuratorOutput:
+        """Async variant of :meth:`curate` backed by ``llm.acomplete``."""
+        base_prompt = self._build_prompt(
+            reflection=reflection,
+            playbook=playbook,
+            question_context=question_context,
+            progress=progress,
+        )
+        prompt = base_prompt
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries):
+            response = await self.llm.acomplete(prompt, **kwargs)
+            try:
+                return self._parse_response(response.text)
+            except ValueError as err:
+                last_error = err
+                if attempt + 1 >= self.max_retries:
+                    break
+                prompt = self._retry_prompt(base_prompt)
+        raise RuntimeError("Curator failed to produce valid JSON.") from last_error
+
+    def _build_prompt(
+        self,
+        *,
+        reflection: ReflectorOutput,
+        playbook: Playbook,
+        question_context: str,
+        progress: str,
+    ) -> str:
+        return compile_template(self.prompt_template).format(
+            progress=progress,
+            stats=json.dumps(playbook.stats()),
+            reflection=json.dumps(reflection.raw, ensure_ascii=False, indent=2),
+            playbook=playbook.as_prompt() or "(empty playbook)",
+            question_context=question_context,
+        )
+
+    @staticmethod
+    def _retry_prompt(base_prompt: str) -> str:
+        return (
+            base_prompt
+            + "\n\n提醒：仅输出有效 JSON，所有字符串请转义双引号或改用单引号，"
+            "不要添加额外文本。"
+        )
+
+    @staticmethod
+    def _parse_response(text: str) -> CuratorOutput:
+        data = _safe_json_loads(text)
+        return CuratorOutput(delta=DeltaBatch.from_json(data), raw=data)
+
 
 def _make_playbook_excerpt(playbook: Playbook, bullet_ids: Sequence[str]) -> str:
     lines: List[str] = []
@@ -0,0 +1,63 @@
+"""Prompt templates parsed once and rendered without re-parsing."""
+
+from __future__ import annotations
+
+import functools
+import string
+from typing import Any, FrozenSet, List, Optional, Tuple
+
+
+class CompiledTemplate:
+    """
+    A ``str.format`` template split into literals and fields at construction.
+
+    :meth:`format` renders by filling the field slots and joining, which skips
+    the per-call parsing done by ``str.format``. Templates using positional
+    fields, attribute/index lookups, conversions or format specs are rendered
+    with ``str.format`` instead, so output is always identical.
+
+    Args:
+        template: Template text using ``{name}`` fields and ``{{``/``}}`` escapes
+
+    Attributes:
+        fields: Names of every field referenced by the template
+    """
+
+    __slots__ = ("template", "fields", "_pieces", "_fields")
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        pieces: List[str] = []
+        fields: List[Tuple[int, str]] = []
+        simple = True
+        for literal, name, spec, conversion in string.Formatter().parse(template):
+            if literal:
+                pieces.append(literal)
+            if name is None:
+                continue
+            if spec or conversion or not name.isidentifier():
+                simple = False
+            fields.append((len(pieces), name))
+            pieces.append("")
+        self.fields: FrozenSet[str] = frozenset(name for _, name in fields)
+        self._pieces: Optional[List[str]] = pieces if simple else None
+        self._fields: Tuple[Tuple[int, str], ...] = tuple(fields)
+
+    def format(self, **values: Any) -> str:
+        """Render the template; raises ``KeyError`` for a missing field."""
+        if self._pieces is None:
+            return self.template.format(**values)
+        pieces = self._pieces.copy()
+        for index, name in self._fields:
+            pieces[index] = str(values[name])
+        return "".join(pieces)
+
+
+@functools.lru_cache(maxsize=128)
+def compile_template(template: str) -> CompiledTemplate:
+    """Return the shared :class:`CompiledTemplate` for ``template``.
+
+    Lets code that keeps templates as plain, reassignable strings skip
+    re-parsing them on every render.
+    """
+    return CompiledTemplate(template)
@@ -1,10 +1,15 @@
+import asyncio
+import itertools
 import json
 import unittest
 
+import pytest
+
 from ace import (
     DummyLLMClient,
     EnvironmentResult,
     OfflineAdapter,
+    OnlineAdapter,
     Playbook,
     Sample,
     TaskEnvironment,
@@ -27,26 +32,213 @@ class SimpleQAEnvironment(TaskEnvironment):
         )
 
 
+def _queue_single_step(client: DummyLLMClient) -> None:
+    client.queue(
+        json.dumps(
+            {
+                "reasoning": "The answer is given in the playbook.",
+                "bullet_ids": [],
+                "final_answer": "42",
+            }
+        )
+    )
+    client.queue(
+        json.dumps(
+            {
+                "reasoning": "Prediction matches ground truth.",
+                "error_identification": "",
+                "root_cause_analysis": "",
+                "correct_approach": "Keep leveraging the playbook.",
+                "key_insight": "Store that 42 is the default answer.",
+                "bullet_tags": [],
+            }
+        )
+    )
+    client.queue(
+        json.dumps(
+            {
+                "reasoning": "Adding a reminder for future tasks.",
+                "operations": [
+                    {
+                        "type": "ADD",
+                        "section": "default_answers",
+                        "content": "If the question mentions life, universe, and everything, answer 42.",
+                        "metadata": {"helpful": 1},
+                    }
+                ],
+            }
+        )
+    )
+
+
 class OfflineAdapterTest(unittest.TestCase):
     def test_single_step_updates_playbook(self) -> None:
+        client = DummyLLMClient()
+        _queue_single_step(client)
+
+        playbook = Playbook()
+        generator = Generator(client)
+        reflector = Reflector(client)
+        curator = Curator(client)
+
+        adapter = OfflineAdapter(
+            playbook=playbook,
+            generator=generator,
+            reflector=reflector,
+            curator=curator,
+            max_refinement_rounds=1,
+        )
+
+        sample = Sample(
+            question="What is the answer to life, the universe, and everything?",
+            ground_truth="42",
+        )
+        environment = SimpleQAEnvironment()
+        results = adapter.run([sample], environment, epochs=1)
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].generator_output.final_answer, "42")
+        self.assertGreaterEqual(playbook.stats()["sections"], 1)
+        self.assertTrue(
+            any("life" in bullet.content for bullet in playbook.bullets())
+        )
+
+    def test_generator_salvages_json_wrapped_in_prose(self) -> None:
         client = DummyLLMClient()
+        client.queue(
+            'Sure! ```json\n{"reasoning": "r", "bullet_ids": ["a"],'
+            ' "final_answer": "42",}\n``` Hope this helps.'
+        )
+        output = Generator(client).generate(
+            question="q", context=None, playbook=Playbook()
+        )
+
+        self.assertEqual(output.final_answer, "42")
+        self.assertEqual(output.bullet_ids, ["a"])
+
+    def test_arun_processes_samples_concurrently(self) -> None:
+        class SlowClient(DummyLLMClient):
+            def __init__(self) -> None:
+                super().__init__()
+                self.in_flight = 0
+                self.peak = 0
+
+            async def acomplete(self, prompt, **kwargs):
+                response = self.complete(prompt, **kwargs)
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+                await asyncio.sleep(0.01)
+                self.in_flight -= 1
+                return response
+
+        # Both samples advance in lock-step, so each role's replies are adjacent
+        staged = DummyLLMClient()
+        _queue_single_step(staged)
+        client = SlowClient()
+        for reply in staged._responses:
+            client.queue(reply)
+            client.queue(reply)
+
+        playbook = Playbook()
+        adapter = OfflineAdapter(
+            playbook=playbook,
+            generator=Generator(client),
+            reflector=Reflector(client),
+            curator=Curator(client),
+        )
+        sample = Sample(
+            question="What is the answer to life, the universe, and everything?",
+            ground_truth="42",
+        )
+        results = asyncio.run(
+            adapter.arun([sample, sample], SimpleQAEnvironment(), max_concurrency=2)
+        )
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(client.peak, 2)
+        self.assertTrue(
+            all(result.generator_output.final_answer == "42" for result in results)
+        )
+        self.assertTrue(
+            any("life" in bullet.content for bullet in playbook.bullets())
+        )
+
+    def test_batched_run_preserves_sample_order(self) -> None:
+        client = DummyLLMClient()
+        for answer in ("4", "15"):
+            client.queue(
+                json.dumps(
+                    {"reasoning": "Arithmetic.", "bullet_ids": [], "final_answer": answer}
+                )
+            )
+        for _ in range(2):
+            client.queue(
+                json.dumps(
+                    {
+                        "reasoning": "Correct.",
+                        "error_identification": "",
+                        "root_cause_analysis": "",
+                        "correct_approach": "",
+                        "key_insight": "Compute directly.",
+                        "bullet_tags": [],
+                    }
+                )
+            )
+        for _ in range(2):
+            client.queue(json.dumps({"reasoning": "Nothing to add.", "operations": []}))
+
+        adapter = OfflineAdapter(
+            generator=Generator(client),
+            reflector=Reflector(client),
+            curator=Curator(client),
+        )
+        samples = [
+            Sample(question="What is 2+2?", ground_truth="4"),
+            Sample(question="What is 5*3?", ground_truth="15"),
+        ]
+        results = adapter.run(samples, SimpleQAEnvironment(), batch_size=2)
+
+        self.assertEqual(
+            [result.generator_output.final_answer for result in results], ["4", "15"]
+        )
+        self.assertTrue(
+            all(r.environment_result.metrics["accuracy"] == 1.0 for r in results)
+        )
+
+    @pytest.mark.usefixtures("isolated_cwd")
+    def test_fused_reflect_curate_uses_one_call_and_falls_back(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            json.dumps({"reasoning": "Recall.", "bullet_ids": [], "final_answer": "42"})
+        )
         client.queue(
             json.dumps(
                 {
-                    "reasoning": "The answer is given in the playbook.",
-                    "bullet_ids": [],
-                    "final_answer": "42",
+                    "reasoning": "Prediction matches ground truth.",
+                    "key_insight": "42 is the default answer.",
+                    "bullet_tags": [],
+                    "curator_reasoning": "Record the default.",
+                    "operations": [
+                        {
+                            "type": "ADD",
+                            "section": "default_answers",
+                            "content": "Answer 42 for questions about life.",
+                        }
+                    ],
                 }
             )
         )
+        # Second sample: the fused response is not JSON, so the adapter falls
+        # back to separate reflect and curate calls.
+        client.queue(
+            json.dumps({"reasoning": "Recall.", "bullet_ids": [], "final_answer": "42"})
+        )
+        client.queue("not json")
         client.queue(
             json.dumps(
                 {
                     "reasoning": "Prediction matches ground truth.",
-                    "error_identification": "",
-                    "root_cause_analysis": "",
-                    "correct_approach": "Keep leveraging the playbook.",
-                    "key_insight": "Store that 42 is the default answer.",
+                    "key_insight": "Keep answering 42.",
                     "bullet_tags": [],
                 }
             )
@@ -54,13 +246,87 @@ class OfflineAdapterTest(unittest.TestCase):
         client.queue(
             json.dumps(
                 {
-                    "reasoning": "Adding a reminder for future tasks.",
+                    "reasoning": "Add a reminder.",
+                    "operations": [
+                        {"type": "ADD", "section": "default_answers", "content": "42."}
+                    ],
+                }
+            )
+        )
+
+        playbook = Playbook()
+        adapter = OfflineAdapter(
+            playbook=playbook,
+            generator=Generator(client),
+            reflector=Reflector(client),
+            curator=Curator(client),
+            fuse_reflect_curate=True,
+        )
+        sample = Sample(question="What is the answer to life?", ground_truth="42")
+        results = adapter.run([sample, sample], SimpleQAEnvironment())
+
+        self.assertEqual(len(results), 2)
+        self.assertNotIn("operations", results[0].reflection.raw)
+        self.assertEqual(len(results[0].curator_output.delta.operations), 1)
+        self.assertEqual(len(results[1].curator_output.delta.operations), 1)
+        self.assertEqual(len(playbook.bullets()), 2)
+
+    def test_batched_run_honours_fused_reflect_curate(self) -> None:
+        client = DummyLLMClient()
+        for answer in ("4", "15"):
+            client.queue(
+                json.dumps(
+                    {"reasoning": "Arithmetic.", "bullet_ids": [], "final_answer": answer}
+                )
+            )
+        for _ in range(2):
+            client.queue(
+                json.dumps(
+                    {
+                        "reasoning": "Correct.",
+                        "key_insight": "Compute directly.",
+                        "bullet_tags": [],
+                        "curator_reasoning": "Nothing to add.",
+                        "operations": [],
+                    }
+                )
+            )
+
+        adapter = OfflineAdapter(
+            generator=Generator(client),
+            reflector=Reflector(client),
+            curator=Curator(client),
+            fuse_reflect_curate=True,
+        )
+        samples = [
+            Sample(question="What is 2+2?", ground_truth="4"),
+            Sample(question="What is 5*3?", ground_truth="15"),
+        ]
+        results = adapter.run(samples, SimpleQAEnvironment(), batch_size=2)
+
+        self.assertEqual(len(client._responses), 0)
+        self.assertEqual(
+            [result.reflection.key_insight for result in results],
+            ["Compute directly."] * 2,
+        )
+
+    def test_arun_honours_fused_reflect_curate(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            json.dumps({"reasoning": "Recall.", "bullet_ids": [], "final_answer": "42"})
+        )
+        client.queue(
+            json.dumps(
+                {
+                    "reasoning": "Prediction matches ground truth.",
+                    "key_insight": "42 is the default answer.",
+                    "bullet_tags": [],
+                    "curator_reasoning": "Record the default.",
                     "operations": [
                         {
                             "type": "ADD",
                             "section": "default_answers",
-                            "content": "If the question mentions life, universe, and everything, answer 42.",
-                            "metadata": {"helpful": 1},
+                            "content": "Answer 42 for questions about life.",
                         }
                     ],
                 }
@@ -68,31 +334,87 @@ class OfflineAdapterTest(unittest.TestCase):
         )
 
         playbook = Playbook()
-        generator = Generator(client)
-        reflector = Reflector(client)
-        curator = Curator(client)
-
         adapter = OfflineAdapter(
             playbook=playbook,
-            generator=generator,
-            reflector=reflector,
-            curator=curator,
-            max_refinement_rounds=1,
+            generator=Generator(client),
+            reflector=Reflector(client),
+            curator=Curator(client),
+            fuse_reflect_curate=True,
         )
+        sample = Sample(question="What is the answer to life?", ground_truth="42")
+        results = asyncio.run(adapter.arun([sample], SimpleQAEnvironment()))
+
+        self.assertEqual(len(client._responses), 0)
+        self.assertEqual(len(results[0].curator_output.delta.operations), 1)
+        self.assertEqual(len(playbook.bullets()), 1)
+
+    def test_identical_consecutive_reflections_are_deduplicated(self) -> None:
+        client = DummyLLMClient()
+        adapter = OfflineAdapter(
+            generator=Generator(client),
+            reflector=Reflector(client),
+            curator=Curator(client),
+        )
+        first = Reflector._parse_response(
+            json.dumps({"key_insight": "Check units.", "reasoning": "Same."})
+        )
+        reordered = Reflector._parse_response(
+            json.dumps({"reasoning": "Same.", "key_insight": "Check units."})
+        )
+        adapter._update_recent_reflections(first)
+        adapter._update_recent_reflections(reordered)
+
+        self.assertEqual(len(adapter._recent_reflections), 1)
+        self.assertNotIn("---", adapter._reflection_context())
+
+
+class OnlineAdapterTest(unittest.TestCase):
+    def test_run_yields_results_lazily(self) -> None:
+        client = DummyLLMClient()
+        _queue_single_step(client)
 
+        adapter = OnlineAdapter(
+            generator=Generator(client),
+            reflector=Reflector(client),
+            curator=Curator(client),
+        )
         sample = Sample(
             question="What is the answer to life, the universe, and everything?",
             ground_truth="42",
         )
-        environment = SimpleQAEnvironment()
-        results = adapter.run([sample], environment, epochs=1)
+        stream = adapter.run(iter([sample]), SimpleQAEnvironment())
+        # Nothing is processed until the stream is consumed
+        self.assertEqual(len(client._responses), 3)
 
-        self.assertEqual(len(results), 1)
-        self.assertEqual(results[0].generator_output.final_answer, "42")
-        self.assertGreaterEqual(playbook.stats()["sections"], 1)
-        self.assertTrue(
-            any("life" in bullet.content for bullet in playbook.bullets())
+        result = next(stream)
+        self.assertEqual(result.generator_output.final_answer, "42")
+        self.assertEqual(list(stream), [])
+
+    def test_arun_yields_from_infinite_stream(self) -> None:
+        client = DummyLLMClient()
+        _queue_single_step(client)
+
+        adapter = OnlineAdapter(
+            generator=Generator(client),
+            reflector=Reflector(client),
+            curator=Curator(client),
         )
+        sample = Sample(
+            question="What is the answer to life, the universe, and everything?",
+            ground_truth="42",
+        )
+
+        async def first_result():
+            stream = adapter.arun(
+                itertools.repeat(sample), SimpleQAEnvironment(), max_concurrency=1
+            )
+            try:
+                return await stream.__anext__()
+            finally:
+                await stream.aclose()
+
+        result = asyncio.run(first_result())
+        self.assertEqual(result.generator_output.final_answer, "42")
 
 
 if __name__ == "__main__":
@@ -40,6 +40,16 @@ class TestLangChainClient(unittest.TestCase):
 
         self.assertIn("LangChain is not installed", str(context.exception))
 
+    @patch('ace.llm_providers.langchain_client.LANGCHAIN_AVAILABLE', False)
+    def test_package_export_raises_install_hint(self):
+        """Test that the package-level name is the class, not None."""
+        from ace.llm_providers import LangChainLiteLLMClient
+
+        with self.assertRaises(ImportError) as context:
+            LangChainLiteLLMClient(model="test")
+
+        self.assertIn("LangChain is not installed", str(context.exception))
+
     def test_parameter_filtering(self):
         """Test that ACE-specific parameters are filtered."""
         from ace.llm_providers.langchain_client import LangChainLiteLLMClient
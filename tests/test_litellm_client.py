@@ -4,6 +4,8 @@ import unittest
 from unittest.mock import patch, MagicMock
 import logging
 
+import pytest
+
 
 class TestLiteLLMClient(unittest.TestCase):
     """Test LiteLLM client functionality."""
@@ -16,6 +18,19 @@ class TestLiteLLMClient(unittest.TestCase):
         except ImportError:
             self.fail("Failed to import LiteLLMClient")
 
+    def test_import_does_not_load_litellm(self):
+        """Test that importing the package and building a client defer LiteLLM."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, ace.llm_providers; "
+            "ace.llm_providers.LiteLLMClient(model='gpt-4', fallbacks=['gpt-4o']); "
+            "sys.exit('litellm' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code])
+        self.assertEqual(result.returncode, 0)
+
     @patch('ace.llm_providers.litellm_client.completion')
     def test_basic_completion(self, mock_completion):
         """Test basic completion functionality."""
@@ -58,6 +73,642 @@ class TestLiteLLMClient(unittest.TestCase):
             self.assertNotIn('refinement_round', call_kwargs)
             self.assertNotIn('max_refinement_rounds', call_kwargs)
 
+    @patch('ace.llm_providers.litellm_client.litellm.batch_completion')
+    def test_batch_complete_preserves_order(self, mock_batch):
+        """Test that batch completion submits all prompts in one call."""
+        from ace.llm_providers import LiteLLMClient
+
+        def make_response(text):
+            response = MagicMock()
+            response.choices = [MagicMock(message=MagicMock(content=text))]
+            response.usage = None
+            response.model = "gpt-4"
+            return response
+
+        mock_batch.return_value = [make_response("first"), make_response("second")]
+
+        client = LiteLLMClient(model="gpt-4")
+        responses = client.batch_complete(["a", "b"], refinement_round=0)
+
+        self.assertEqual([r.text for r in responses], ["first", "second"])
+        mock_batch.assert_called_once()
+        call_kwargs = mock_batch.call_args[1]
+        self.assertEqual(len(call_kwargs["messages"]), 2)
+        self.assertNotIn("refinement_round", call_kwargs)
+
+    @patch('ace.llm_providers.litellm_client.litellm.batch_completion')
+    def test_batch_complete_serves_cached_prompts_locally(self, mock_batch):
+        """Test that batch completion only sends prompts missing from the cache."""
+        from ace.llm_providers import LiteLLMClient
+
+        def make_response(text):
+            response = MagicMock()
+            response.choices = [MagicMock(message=MagicMock(content=text))]
+            response.usage = None
+            response.model = "gpt-4"
+            return response
+
+        mock_batch.side_effect = lambda **kwargs: [
+            make_response(messages[0]["content"].upper())
+            for messages in kwargs["messages"]
+        ]
+
+        client = LiteLLMClient(model="gpt-4", temperature=0)
+        client.batch_complete(["a"])
+        responses = client.batch_complete(["a", "b"])
+
+        self.assertEqual([r.text for r in responses], ["A", "B"])
+        sent = mock_batch.call_args[1]["messages"]
+        self.assertEqual(sent, [[{"role": "user", "content": "b"}]])
+
+    @patch('ace.llm_providers.litellm_client.acompletion')
+    def test_abatch_complete_preserves_order(self, mock_acompletion):
+        """Test that async batch completion fans out and keeps prompt order."""
+        import asyncio
+        from ace.llm_providers import LiteLLMClient
+
+        async def fake_acompletion(**kwargs):
+            prompt = kwargs["messages"][0]["content"]
+            await asyncio.sleep(0.01 if prompt == "a" else 0)
+            response = MagicMock()
+            response.choices = [MagicMock(message=MagicMock(content=prompt.upper()))]
+            response.usage = None
+            response.model = "gpt-4"
+            return response
+
+        mock_acompletion.side_effect = fake_acompletion
+
+        client = LiteLLMClient(model="gpt-4")
+        responses = asyncio.run(
+            client.abatch_complete(["a", "b", "c"], max_concurrency=2, refinement_round=0)
+        )
+
+        self.assertEqual([r.text for r in responses], ["A", "B", "C"])
+        self.assertEqual(mock_acompletion.call_count, 3)
+        self.assertNotIn("refinement_round", mock_acompletion.call_args[1])
+
+    @patch('ace.llm_providers.litellm_client.completion')
+    def test_clients_share_http_pool(self, mock_completion):
+        """Test that all clients hand LiteLLM the same pooled HTTP session."""
+        import litellm
+        from ace.llm_providers import LiteLLMClient
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="ok"))]
+        mock_response.usage = None
+        mock_response.model = "gpt-4"
+        mock_completion.return_value = mock_response
+
+        first = LiteLLMClient(model="gpt-4")
+        second = LiteLLMClient(model="gpt-4o")
+        try:
+            first.complete("a")
+            pool = litellm.client_session
+            second.complete("b")
+
+            self.assertIsNotNone(pool)
+            self.assertIs(litellm.client_session, pool)
+            self.assertIs(LiteLLMClient._HTTP_CLIENT, pool)
+        finally:
+            first.close()
+        self.assertIsNone(litellm.client_session)
+
+    def test_prewarm_opens_connections_on_running_loop(self):
+        """Test that prewarm issues HEAD requests through the shared async pool."""
+        import asyncio
+        import httpx
+        from unittest.mock import AsyncMock
+        from ace.llm_providers import LiteLLMClient, LiteLLMConfig
+
+        async def scenario():
+            with patch.object(httpx.AsyncClient, "head", new_callable=AsyncMock) as head:
+                client = LiteLLMClient(
+                    config=LiteLLMConfig(
+                        model="gpt-4",
+                        api_base="https://example.invalid",
+                        prewarm=True,
+                        max_keepalive_connections=3,
+                    )
+                )
+                await client._prewarm_task
+                await client.aclose()
+            return head
+
+        head = asyncio.run(scenario())
+        self.assertEqual(head.await_count, 3)
+        self.assertEqual(head.call_args[0][0], "https://example.invalid")
+
+    def test_async_pools_are_per_loop_and_closed_with_their_loop(self):
+        """Test that each loop gets its own pool, closed when the loop shuts down."""
+        import asyncio
+        import litellm
+        from ace._sync import run_sync
+        from ace.llm_providers import LiteLLMClient
+
+        client = LiteLLMClient(model="gpt-4")
+
+        async def pool_on_loop():
+            return await client._ensure_async_http_pool()
+
+        async def scenario():
+            own = await client._ensure_async_http_pool()
+            shared_alone = litellm.aclient_session
+            other = run_sync(pool_on_loop())
+            shared_both = litellm.aclient_session
+            run_sync(client.aclose())
+            return own, shared_alone, other, shared_both
+
+        own, shared_alone, other, shared_both = asyncio.run(scenario())
+
+        self.assertIs(shared_alone, own)
+        self.assertIsNot(other, own)
+        # Two loops use pooling at once, so neither pool is handed to LiteLLM
+        self.assertIsNone(shared_both)
+        self.assertTrue(own.is_closed)
+        self.assertTrue(other.is_closed)
+        self.assertEqual(len(LiteLLMClient._ASYNC_HTTP_CLIENTS), 0)
+
+    def test_exit_hook_closes_async_pool_of_running_loop(self):
+        """Test that the atexit hook closes pools owned by still-running loops."""
+        from ace._sync import run_sync
+        from ace.llm_providers import LiteLLMClient
+        from ace.llm_providers.litellm_client import _close_shared_http_pool
+
+        client = LiteLLMClient(model="gpt-4")
+
+        async def pool_on_loop():
+            return await client._ensure_async_http_pool()
+
+        pool = run_sync(pool_on_loop())
+        _close_shared_http_pool()
+
+        self.assertTrue(pool.is_closed)
+        self.assertNotIn(pool, LiteLLMClient._ASYNC_HTTP_CLIENTS.values())
+
+    @patch('ace.llm_providers.litellm_client.completion')
+    def test_deterministic_completions_are_cached(self, mock_completion):
+        """Test that temperature=0 requests are served from the cache."""
+        from ace.llm_providers import LiteLLMClient
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="Paris"))]
+        mock_response.usage = None
+        mock_response.model = "gpt-4"
+        mock_completion.return_value = mock_response
+
+        client = LiteLLMClient(model="gpt-4")
+        first = client.complete("Capital of France?")
+        second = client.complete("Capital of France?")
+        client.complete("Capital of France?", temperature=0.7)
+
+        self.assertEqual(first.text, second.text)
+        self.assertEqual(mock_completion.call_count, 2)
+        self.assertEqual(client.cache_stats(), {"hits": 1, "misses": 1})
+
+    @patch('ace.llm_providers.litellm_client.completion')
+    def test_refinement_rounds_bypass_the_cache(self, mock_completion):
+        """Test that later Reflector rounds reach the provider again."""
+        import json
+        from ace import GeneratorOutput, Playbook, Reflector
+        from ace.llm_providers import LiteLLMClient
+
+        def reply(insight):
+            response = MagicMock()
+            content = json.dumps({"reasoning": "r", "key_insight": insight})
+            response.choices = [MagicMock(message=MagicMock(content=content))]
+            response.usage = None
+            response.model = "gpt-4"
+            return response
+
+        mock_completion.side_effect = [reply(""), reply("Check the units.")]
+
+        client = LiteLLMClient(model="gpt-4")
+        output = Reflector(client).reflect(
+            question="q",
+            generator_output=GeneratorOutput(
+                reasoning="r", final_answer="a", bullet_ids=[], raw={}
+            ),
+            playbook=Playbook(),
+            ground_truth=None,
+            feedback=None,
+            max_refinement_rounds=2,
+        )
+
+        self.assertEqual(output.key_insight, "Check the units.")
+        self.assertEqual(mock_completion.call_count, 2)
+
+    @pytest.mark.usefixtures("isolated_cwd")
+    @patch('ace.llm_providers.litellm_client.completion')
+    @patch('ace.llm_providers.litellm_client.litellm.batch_completion')
+    def test_reflect_batch_fallback_moves_past_cached_bad_reply(
+        self, mock_batch, mock_completion
+    ):
+        """Test that an unparsable batched reflection is retried, not replayed."""
+        import json
+        from ace import GeneratorOutput, Playbook, Reflector
+        from ace.llm_providers import LiteLLMClient
+
+        def reply(content):
+            response = MagicMock()
+            response.choices = [MagicMock(message=MagicMock(content=content))]
+            response.usage = None
+            response.model = "gpt-4"
+            return response
+
+        mock_batch.return_value = [reply("not json")]
+        mock_completion.return_value = reply(
+            json.dumps({"reasoning": "r", "key_insight": "Check the units."})
+        )
+
+        client = LiteLLMClient(model="gpt-4")
+        outputs = Reflector(client).reflect_batch(
+            [
+                {
+                    "question": "q",
+                    "generator_output": GeneratorOutput(
+                        reasoning="r", final_answer="a", bullet_ids=[], raw={}
+                    ),
+                    "playbook": Playbook(),
+                    "ground_truth": None,
+                    "feedback": None,
+                }
+            ]
+        )
+
+        self.assertEqual(outputs[0].key_insight, "Check the units.")
+        # The replayed batch prompt is a cache hit; only the retry prompt is sent
+        self.assertEqual(mock_completion.call_count, 1)
+
+    @patch('ace.llm_providers.litellm_client.acompletion')
+    def test_concurrent_cache_misses_share_one_request(self, mock_acompletion):
+        """Test that identical in-flight async requests reach the provider once."""
+        import asyncio
+        from ace.llm_providers import LiteLLMClient
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="Paris"))]
+        mock_response.usage = None
+        mock_response.model = "gpt-4"
+
+        async def slow_completion(**kwargs):
+            await asyncio.sleep(0.01)
+            return mock_response
+
+        mock_acompletion.side_effect = slow_completion
+
+        client = LiteLLMClient(model="gpt-4")
+
+        async def ask_twice():
+            return await asyncio.gather(
+                client.acomplete("Capital of France?"),
+                client.acomplete("Capital of France?"),
+            )
+
+        responses = asyncio.run(ask_twice())
+
+        self.assertEqual([r.text for r in responses], ["Paris", "Paris"])
+        self.assertEqual(mock_acompletion.call_count, 1)
+
+    @patch('ace.llm_providers.litellm_client.completion')
+    def test_persistent_cache_survives_new_client(self, mock_completion):
+        """Test that cache_path serves responses to a fresh client."""
+        import os
+        import tempfile
+        from ace.llm_providers import LiteLLMClient, LiteLLMConfig
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="Paris"))]
+        mock_response.usage = None
+        mock_response.model = "gpt-4"
+        mock_response._hidden_params = {"response_cost": 0.001}
+        mock_completion.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "responses")
+            first = LiteLLMClient(config=LiteLLMConfig(model="gpt-4", cache_path=path))
+            first.complete("Capital of France?")
+            first.close()
+
+            second = LiteLLMClient(config=LiteLLMConfig(model="gpt-4", cache_path=path))
+            response = second.complete("Capital of France?")
+            second.close()
+
+        self.assertEqual(response.text, "Paris")
+        self.assertEqual(response.raw["cost"], 0.001)
+        self.assertEqual(mock_completion.call_count, 1)
+
+    @patch('ace.llm_providers.litellm_client.completion')
+    def test_prebuilt_messages_are_passed_through(self, mock_completion):
+        """Test that a messages kwarg replaces the prompt-built message list."""
+        from ace.llm_providers import LiteLLMClient
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="Hi"))]
+        mock_response.usage = None
+        mock_response.model = "gpt-4"
+        mock_completion.return_value = mock_response
+
+        messages = [
+            {"role": "system", "content": "Be brief."},
+            {"role": "user", "content": "Hello"},
+        ]
+        client = LiteLLMClient(model="gpt-4", temperature=0.5)
+        client.complete("", messages=messages)
+
+        self.assertIs(mock_completion.call_args[1]["messages"], messages)
+
+    @patch('ace.llm_providers.litellm_client.Router')
+    def test_router_shared_between_identical_clients(self, mock_router):
+        """Test that clients with the same fallbacks reuse one router."""
+        from ace.llm_providers import LiteLLMClient, LiteLLMConfig
+        from ace.llm_providers.litellm_client import _ROUTER_CACHE
+
+        self.addCleanup(_ROUTER_CACHE.clear)
+        mock_router.side_effect = lambda **kwargs: MagicMock()
+
+        first = LiteLLMClient(model="gpt-4", fallbacks=["gpt-3.5-turbo"], api_key="k")
+        second = LiteLLMClient(model="gpt-4", fallbacks=["gpt-3.5-turbo"], api_key="k")
+        other = LiteLLMClient(model="gpt-4", fallbacks=["gpt-4o"], api_key="k")
+        injected = LiteLLMClient(
+            config=LiteLLMConfig(model="gpt-4", shared_router=first.router)
+        )
+
+        self.assertIs(first.router, second.router)
+        self.assertIsNot(first.router, other.router)
+        self.assertIs(injected.router, first.router)
+        self.assertEqual(mock_router.call_count, 2)
+
+    @patch('ace.llm_providers.litellm_client.acompletion')
+    def test_sync_via_async_uses_async_path(self, mock_acompletion):
+        """Test that sync_via_async routes complete() through acompletion."""
+        import asyncio
+        from ace.llm_providers import LiteLLMClient, LiteLLMConfig
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="async"))]
+        mock_response.usage = None
+        mock_response.model = "gpt-4"
+        mock_acompletion.return_value = mock_response
+
+        client = LiteLLMClient(
+            config=LiteLLMConfig(model="gpt-4", sync_via_async=True)
+        )
+
+        async def inside_running_loop():
+            return client.complete("Test prompt")
+
+        self.assertEqual(client.complete("Test prompt").text, "async")
+        self.assertEqual(asyncio.run(inside_running_loop()).text, "async")
+        self.assertEqual(mock_acompletion.call_count, 1)  # second call cached
+
+    @patch('ace.llm_providers.litellm_client.acompletion')
+    def test_acomplete_with_stream_skips_empty_chunks(self, mock_acompletion):
+        """Test async streaming yields only non-empty content deltas."""
+        import asyncio
+        from ace.llm_providers import LiteLLMClient
+
+        def chunk(content):
+            return MagicMock(choices=[MagicMock(delta=MagicMock(content=content))])
+
+        async def stream():
+            for item in (chunk("Hel"), chunk(None), MagicMock(choices=[]), chunk("lo")):
+                yield item
+
+        mock_acompletion.return_value = stream()
+
+        client = LiteLLMClient(model="gpt-4")
+
+        async def collect():
+            return [c async for c in client.acomplete_with_stream("Hi")]
+
+        self.assertEqual(asyncio.run(collect()), ["Hel", "lo"])
+        self.assertTrue(mock_acompletion.call_args[1]["stream"])
+
+    @patch('ace.llm_providers.litellm_client.completion')
+    def test_closing_stream_early_closes_response(self, mock_completion):
+        """Test that abandoning a sync stream hangs up the provider stream."""
+        from ace.llm_providers import LiteLLMClient
+
+        mock_stream = MagicMock()
+        mock_stream.__iter__.return_value = iter(
+            [MagicMock(choices=[MagicMock(delta=MagicMock(content="{}"))])] * 3
+        )
+        mock_completion.return_value = mock_stream
+
+        client = LiteLLMClient(model="gpt-4")
+        chunks = client.complete_with_stream("Hi")
+        self.assertEqual(next(chunks), "{}")
+        chunks.close()
+
+        mock_stream.close.assert_called_once()
+
+    @patch('ace.llm_providers.litellm_client.acompletion')
+    def test_closing_async_stream_early_closes_response(self, mock_acompletion):
+        """Test that abandoning an async stream hangs up the provider stream."""
+        import asyncio
+        from ace.llm_providers import LiteLLMClient
+
+        closed = []
+
+        async def stream():
+            try:
+                while True:
+                    yield MagicMock(choices=[MagicMock(delta=MagicMock(content="{}"))])
+            finally:
+                closed.append(True)
+
+        mock_acompletion.return_value = stream()
+
+        client = LiteLLMClient(model="gpt-4")
+
+        async def first_chunk():
+            chunks = client.acomplete_with_stream("Hi")
+            first = await chunks.__anext__()
+            await chunks.aclose()
+            return first
+
+        self.assertEqual(asyncio.run(first_chunk()), "{}")
+        self.assertEqual(closed, [True])
+
+    @patch('ace.llm_providers.litellm_client.completion')
+    def test_usage_metadata_is_computed_on_access(self, mock_completion):
+        """Test that usage is only dumped when the metadata is read."""
+        from ace.llm_providers import LiteLLMClient
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="ok"))]
+        mock_response.usage.model_dump.return_value = {"total_tokens": 15}
+        mock_response.model = "gpt-4"
+        mock_completion.return_value = mock_response
+
+        client = LiteLLMClient(model="gpt-4", temperature=0.5)
+        response = client.complete("Test prompt")
+
+        mock_response.usage.model_dump.assert_not_called()
+        self.assertEqual(response.raw["usage"], {"total_tokens": 15})
+        self.assertEqual(response.raw.get("provider"), "openai")
+        self.assertEqual(set(response.raw), {"model", "usage", "cost", "provider"})
+        mock_response.usage.model_dump.assert_called_once()
+
+    @patch('ace.llm_providers.litellm_client.asyncio.sleep')
+    @patch('ace.llm_providers.litellm_client.acompletion')
+    def test_acomplete_retries_with_async_backoff(self, mock_acompletion, mock_sleep):
+        """Test that transient errors are retried with asyncio.sleep backoff."""
+        import asyncio
+        import litellm
+        from ace.llm_providers import LiteLLMClient
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="ok"))]
+        mock_response.usage = None
+        mock_response.model = "gpt-4"
+        mock_acompletion.side_effect = [
+            litellm.RateLimitError("slow down", llm_provider="openai", model="gpt-4"),
+            mock_response,
+        ]
+
+        client = LiteLLMClient(model="gpt-4")
+        response = asyncio.run(client.acomplete("Test prompt"))
+
+        self.assertEqual(response.text, "ok")
+        self.assertEqual(mock_acompletion.call_count, 2)
+        self.assertEqual(mock_acompletion.call_args[1]["num_retries"], 0)
+        mock_sleep.assert_awaited_once()
+
+    @patch('ace.llm_providers.litellm_client.asyncio.sleep')
+    @patch('ace.llm_providers.litellm_client.acompletion')
+    def test_attempt_timeout_retries_stalled_call(self, mock_acompletion, mock_sleep):
+        """Test that an attempt exceeding attempt_timeout is cancelled and retried."""
+        import asyncio
+        from ace.llm_providers import LiteLLMClient, LiteLLMConfig
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="ok"))]
+        mock_response.usage = None
+        mock_response.model = "gpt-4"
+        calls = []
+
+        async def fake_acompletion(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                await asyncio.Event().wait()  # never answers
+            return mock_response
+
+        mock_acompletion.side_effect = fake_acompletion
+
+        client = LiteLLMClient(
+            config=LiteLLMConfig(model="gpt-4", attempt_timeout=0.05)
+        )
+        response = asyncio.run(client.acomplete("Test prompt"))
+
+        self.assertEqual(response.text, "ok")
+        self.assertEqual(len(calls), 2)
+        mock_sleep.assert_awaited_once()
+
+    @patch('ace.llm_providers.litellm_client.completion')
+    def test_budget_stops_calls_once_spent(self, mock_completion):
+        """Test that calls are refused locally after max_budget is spent."""
+        from ace.llm_providers import BudgetExceeded, LiteLLMClient, LiteLLMConfig
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="ok"))]
+        mock_response.usage = None
+        mock_response.model = "gpt-4"
+        mock_response._hidden_params = {"response_cost": 0.6}
+        mock_completion.return_value = mock_response
+
+        client = LiteLLMClient(
+            config=LiteLLMConfig(model="gpt-4", temperature=0.5, max_budget=1.0)
+        )
+        client.complete("first")
+        client.complete("second")
+        with self.assertRaises(BudgetExceeded):
+            client.complete("third")
+
+        self.assertAlmostEqual(client.total_cost, 1.2)
+        self.assertEqual(mock_completion.call_count, 2)
+
+    @patch('ace.llm_providers.litellm_client.completion')
+    def test_circuit_breaker_opens_after_repeated_failures(self, mock_completion):
+        """Test that consecutive transient failures open the circuit breaker."""
+        import litellm
+        from ace.llm_providers import CircuitOpenError, LiteLLMClient, LiteLLMConfig
+
+        mock_completion.side_effect = litellm.RateLimitError(
+            "slow down", llm_provider="openai", model="gpt-4"
+        )
+        client = LiteLLMClient(
+            config=LiteLLMConfig(model="gpt-4", breaker_threshold=2)
+        )
+        for _ in range(2):
+            with self.assertRaises(litellm.RateLimitError):
+                client.complete("Test prompt")
+        with self.assertRaises(CircuitOpenError):
+            client.complete("Test prompt")
+
+        self.assertEqual(mock_completion.call_count, 2)
+
+    @patch('ace.llm_providers.litellm_client.asyncio.sleep')
+    @patch('ace.llm_providers.litellm_client.acompletion')
+    def test_rate_limit_spaces_out_requests(self, mock_acompletion, mock_sleep):
+        """Test that rate_limit_rpm delays calls once the budget is used up."""
+        import asyncio
+        from ace.llm_providers import LiteLLMClient, LiteLLMConfig
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="ok"))]
+        mock_response.usage = None
+        mock_response.model = "gpt-4"
+        mock_acompletion.return_value = mock_response
+
+        client = LiteLLMClient(
+            config=LiteLLMConfig(model="gpt-4", temperature=0.5, rate_limit_rpm=2)
+        )
+
+        async def scenario():
+            for _ in range(3):
+                await client.acomplete("Test prompt")
+
+        asyncio.run(scenario())
+
+        self.assertEqual(mock_acompletion.call_count, 3)
+        mock_sleep.assert_awaited_once()
+        self.assertAlmostEqual(mock_sleep.await_args[0][0], 30, delta=1)
+
+    @patch('ace.llm_providers.litellm_client.Router')
+    @patch('ace.llm_providers.litellm_client.acompletion')
+    def test_hedged_request_returns_faster_fallback(self, mock_acompletion, _router):
+        """Test that a hedged fallback wins when the primary model is slow."""
+        import asyncio
+        from ace.llm_providers import LiteLLMClient, LiteLLMConfig
+        from ace.llm_providers.litellm_client import _ROUTER_CACHE
+
+        self.addCleanup(_ROUTER_CACHE.clear)
+
+        async def fake_acompletion(**kwargs):
+            if kwargs["model"] == "gpt-4":
+                await asyncio.sleep(1)
+            response = MagicMock()
+            response.choices = [MagicMock(message=MagicMock(content=kwargs["model"]))]
+            response.usage = None
+            response.model = kwargs["model"]
+            return response
+
+        mock_acompletion.side_effect = fake_acompletion
+
+        client = LiteLLMClient(
+            config=LiteLLMConfig(
+                model="gpt-4",
+                fallbacks=["gpt-3.5-turbo"],
+                hedge_after_ms=10,
+                temperature=0.5,
+            )
+        )
+        response = asyncio.run(client.acomplete("Test prompt"))
+
+        self.assertEqual(response.text, "gpt-3.5-turbo")
+        self.assertEqual(mock_acompletion.call_count, 2)
+
 
 class TestClaudeParameterResolution(unittest.TestCase):
     """Test Claude-specific parameter resolution functionality."""
@@ -174,6 +825,9 @@ class TestClaudeParameterResolution(unittest.TestCase):
 
         self.assertIn("Invalid sampling_priority", str(context.exception))
 
+        with self.assertRaises(ValueError):
+            LiteLLMClient(model="gpt-4", sampling_priority="invalid_priority")
+
     @patch('ace.llm_providers.litellm_client.acompletion')
     async def test_async_claude_parameter_resolution(self, mock_acompletion):
         """Test that async completion also applies Claude parameter resolution."""
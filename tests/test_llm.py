@@ -0,0 +1,94 @@
+"""Tests for provider-agnostic LLM client wrappers."""
+
+import asyncio
+import threading
+import unittest
+from typing import List
+
+from ace import BatchingLLMClient, DummyLLMClient, LLMClient
+from ace.llm import LLMResponse
+
+
+class RecordingBatchClient(LLMClient):
+    def __init__(self) -> None:
+        super().__init__(model="recording")
+        self.batches: List[List[str]] = []
+
+    def complete(self, prompt, **kwargs):
+        raise AssertionError("prompts should arrive through batch_complete")
+
+    def batch_complete(self, prompts, **kwargs):
+        self.batches.append(list(prompts))
+        return [LLMResponse(text=prompt.upper()) for prompt in prompts]
+
+
+class BatchingLLMClientTest(unittest.TestCase):
+    def test_concurrent_threads_share_one_batch(self) -> None:
+        inner = RecordingBatchClient()
+        client = BatchingLLMClient(inner, max_batch_size=4, batch_timeout_ms=5000)
+        results = {}
+
+        def call(prompt: str) -> None:
+            results[prompt] = client.complete(prompt).text
+
+        threads = [threading.Thread(target=call, args=(f"p{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(results, {f"p{i}": f"P{i}" for i in range(4)})
+        self.assertEqual(len(inner.batches), 1)
+
+    def test_partial_batch_flushes_after_timeout_and_splits_by_kwargs(self) -> None:
+        inner = RecordingBatchClient()
+        client = BatchingLLMClient(inner, max_batch_size=8, batch_timeout_ms=10)
+
+        async def run():
+            return await asyncio.gather(
+                client.acomplete("a"),
+                client.acomplete("b"),
+                client.acomplete("c", temperature=0.5),
+            )
+
+        responses = asyncio.run(run())
+
+        self.assertEqual([r.text for r in responses], ["A", "B", "C"])
+        self.assertEqual(sorted(inner.batches), [["a", "b"], ["c"]])
+
+    def test_short_batch_reply_fails_unanswered_prompts(self) -> None:
+        class ShortBatchClient(RecordingBatchClient):
+            def batch_complete(self, prompts, **kwargs):
+                return super().batch_complete(prompts, **kwargs)[:1]
+
+        client = BatchingLLMClient(
+            ShortBatchClient(), max_batch_size=2, batch_timeout_ms=5000
+        )
+
+        async def run():
+            return await asyncio.gather(
+                client.acomplete("a"), client.acomplete("b"), return_exceptions=True
+            )
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(first.text, "A")
+        self.assertIsInstance(second, RuntimeError)
+
+
+class LLMClientBatchTest(unittest.TestCase):
+    def test_default_batch_complete_works_inside_running_loop(self) -> None:
+        client = DummyLLMClient()
+        client.queue("one")
+        client.queue("two")
+
+        async def run():
+            return client.batch_complete(["a", "b"])
+
+        responses = asyncio.run(run())
+
+        self.assertEqual([r.text for r in responses], ["one", "two"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,14 @@
+import asyncio
+import functools
 import json
 import unittest
 from pathlib import Path
 
+import pytest
+
 from ace import (
+    LOGIC_ACTION_PROMPTS,
+    LOGIC_DECISION_PROMPT,
     DummyLLMClient,
     FaultSpec,
     GeneratorOutput,
@@ -11,6 +17,8 @@ from ace import (
     Playbook,
     Sample,
 )
+from ace.llm import LLMResponse
+from ace.templating import CompiledTemplate, compile_template
 
 
 class LogicDiagnosisGeneratorTest(unittest.TestCase):
@@ -50,6 +58,472 @@ class LogicDiagnosisGeneratorTest(unittest.TestCase):
         self.assertEqual(final_payload["behavior"], "stuck-at-1")
         self.assertEqual(output.bullet_ids, ["b-001"])
 
+    def test_fenced_json_replies_are_accepted(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            "```json\n"
+            + json.dumps(
+                {"reasoning": "Simulate.", "action": "simulation", "objective": "Run"}
+            )
+            + "\n```"
+        )
+        client.queue(
+            "Here is the result:\n```\n"
+            + json.dumps(
+                {
+                    "reasoning": "Mismatch on PO1.",
+                    "bullet_ids": [],
+                    "final_answer": {"location": "N3", "behavior": "stuck-at-0"},
+                }
+            )
+            + "\n```"
+        )
+        generator = LogicDiagnosisGenerator(
+            client, response_format={"type": "json_object"}
+        )
+        output = generator.generate(question="", context="", playbook=Playbook())
+        self.assertEqual(output.raw["decision"]["action"], "simulation")
+        self.assertEqual(json.loads(output.final_answer)["location"], "N3")
+
+    def test_compiled_templates_match_str_format(self) -> None:
+        values = {
+            name: f"<{name}>"
+            for name in (
+                "available_actions",
+                "graph_guidance",
+                "playbook",
+                "reflection",
+                "question",
+                "context",
+                "decision_reasoning",
+                "objective",
+                "tester_responses",
+            )
+        }
+        templates = [LOGIC_DECISION_PROMPT, *LOGIC_ACTION_PROMPTS.values()]
+        templates.append("Score {value:.2f} for {{literal}} {name!r}")
+        values.update(value=0.5, name="N12")
+        for template in templates:
+            self.assertEqual(
+                CompiledTemplate(template).format(**values), template.format(**values)
+            )
+        self.assertIs(compile_template(templates[0]), compile_template(templates[0]))
+
+    def test_malformed_json_is_repaired_without_reprompting(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            'Decision: {"reasoning": "r", "action": "matching", "objective": "o",}'
+        )
+        # Truncated mid-object: the open string and brace are closed locally
+        client.queue(
+            '{"reasoning": "PO1 differs", "bullet_ids": ["b-1",], '
+            '"final_answer": "N7 stuck-at-1'
+        )
+        generator = LogicDiagnosisGenerator(client)
+        output = generator.generate(question="", context="", playbook=Playbook())
+        self.assertEqual(output.final_answer, "N7 stuck-at-1")
+        self.assertEqual(output.bullet_ids, ["b-1"])
+        self.assertEqual(len(client._responses), 0)
+
+    def test_prompt_caching_marks_playbook_prefix(self) -> None:
+        class RecordingClient(DummyLLMClient):
+            def __init__(self) -> None:
+                super().__init__()
+                self.calls = []
+
+            def complete(self, prompt, **kwargs):
+                self.calls.append((prompt, kwargs))
+                return super().complete(prompt, **kwargs)
+
+        client = RecordingClient()
+        client.queue(
+            json.dumps({"reasoning": "r", "action": "matching", "objective": "o"})
+        )
+        client.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "N1"})
+        )
+        playbook = Playbook()
+        playbook.add_bullet(section="cones", content="Trace the fan-in first.")
+        generator = LogicDiagnosisGenerator(client, prompt_caching=True)
+        generator.generate(question="Which gate?", context="", playbook=playbook)
+
+        for prompt, kwargs in client.calls:
+            cached, rest = kwargs["messages"][0]["content"]
+            self.assertEqual(cached["cache_control"], {"type": "ephemeral"})
+            self.assertTrue(cached["text"].endswith(playbook.as_prompt()))
+            self.assertEqual(cached["text"] + rest["text"], prompt)
+            self.assertIn("Which gate?", rest["text"])
+
+    def test_fused_generation_uses_one_call(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            json.dumps(
+                {
+                    "decision": {
+                        "reasoning": "r",
+                        "action": "simulation",
+                        "objective": "o",
+                    },
+                    "action_result": {
+                        "reasoning": "Simulation confirms N7.",
+                        "bullet_ids": ["b-1"],
+                        "final_answer": {"location": "N7", "behavior": "stuck-at-0"},
+                    },
+                }
+            )
+        )
+        generator = LogicDiagnosisGenerator(client, fused=True)
+        output = generator.generate(question="q", context="", playbook=Playbook())
+
+        self.assertEqual(output.bullet_ids, ["b-1"])
+        self.assertEqual(json.loads(output.final_answer)["location"], "N7")
+        self.assertEqual(output.raw["decision"]["action"], "simulation")
+        self.assertFalse(client._responses)
+
+    def test_fused_generation_falls_back_to_two_steps(self) -> None:
+        client = DummyLLMClient()
+        client.queue(json.dumps({"action": "matching"}))
+        client.queue(
+            json.dumps({"reasoning": "r", "action": "matching", "objective": "o"})
+        )
+        client.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "N1"})
+        )
+        generator = LogicDiagnosisGenerator(client, fused=True)
+        output = generator.generate(question="q", context="", playbook=Playbook())
+
+        self.assertEqual(output.final_answer, "N1")
+        self.assertEqual(output.raw["decision"]["action"], "matching")
+
+    def test_stream_json_stops_reading_after_object_closes(self) -> None:
+        class StreamingClient(DummyLLMClient):
+            def __init__(self) -> None:
+                super().__init__()
+                self.read = 0
+
+            def complete_with_stream(self, prompt, **kwargs):
+                text = self.complete(prompt).text + "\nHope this helps!"
+                for index in range(0, len(text), 5):
+                    self.read = index + 5
+                    yield text[index : index + 5]
+
+        client = StreamingClient()
+        client.queue(
+            json.dumps({"reasoning": "r", "action": "matching", "objective": "o"})
+        )
+        action_reply = json.dumps(
+            {"reasoning": "a {b}", "bullet_ids": [], "final_answer": "N1"}
+        )
+        client.queue(action_reply)
+        generator = LogicDiagnosisGenerator(client, stream_json=True)
+        output = generator.generate(question="q", context="", playbook=Playbook())
+
+        self.assertEqual(output.final_answer, "N1")
+        self.assertLess(client.read, len(action_reply) + 5)
+
+    def test_compact_prompts_render_with_same_fields(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            json.dumps({"reasoning": "r", "action": "simulation", "objective": "o"})
+        )
+        client.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "N1"})
+        )
+        verbose = LogicDiagnosisGenerator(DummyLLMClient())
+        compact = LogicDiagnosisGenerator(client, verbose_prompts=False)
+        output = compact.generate(
+            question="q", context="", playbook=Playbook(), tester_responses="[]"
+        )
+
+        self.assertEqual(output.final_answer, "N1")
+        self.assertEqual(compact.available_actions, verbose.available_actions)
+        self.assertLess(len(compact.decision_prompt), len(verbose.decision_prompt))
+
+    def test_schema_error_is_named_in_retry_prompt(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            json.dumps({"reasoning": "r", "action": "matching", "objective": "o"})
+        )
+        client.queue(json.dumps({"reasoning": "r", "bullet_ids": "b-1"}))
+        client.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": ["b-1"], "final_answer": "N1"})
+        )
+        prompts = []
+        original = client.complete
+
+        def recording_complete(prompt, **kwargs):
+            prompts.append(prompt)
+            return original(prompt, **kwargs)
+
+        client.complete = recording_complete
+        generator = LogicDiagnosisGenerator(client)
+        output = generator.generate(question="q", context="", playbook=Playbook())
+
+        self.assertEqual(output.bullet_ids, ["b-1"])
+        self.assertIn("missing required key `final_answer`", prompts[-1])
+
+    def test_prompt_prefix_is_reused_until_playbook_changes(self) -> None:
+        playbook = Playbook()
+        playbook.add_bullet(section="tips", content="Check fan-in first.")
+        generator = LogicDiagnosisGenerator(DummyLLMClient())
+        decision = generator._decision_from_data(
+            {"reasoning": "r", "action": "matching", "objective": "o"}
+        )
+        render = functools.partial(
+            generator._render_action_prompt,
+            decision=decision,
+            context="",
+            playbook=playbook,
+            reflection=None,
+            tester_responses=None,
+        )
+        render(question="q1")
+        second, _ = render(question="q2")
+        cached_prefix = generator._prefix_cache["matching"][1]
+        playbook.add_bullet(section="tips", content="Then simulate.")
+        third, _ = render(question="q2")
+
+        self.assertTrue(second.startswith(cached_prefix))
+        self.assertIn("q2", second)
+        self.assertIn("Then simulate.", third)
+        self.assertNotIn("Then simulate.", second)
+
+    def test_actions_route_to_configured_clients(self) -> None:
+        decider = DummyLLMClient()
+        decider.queue(
+            json.dumps({"reasoning": "r", "action": "submission", "objective": "o"})
+        )
+        small = DummyLLMClient()
+        small.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "N3"})
+        )
+        generator = LogicDiagnosisGenerator(
+            DummyLLMClient(),
+            decision_llm=decider,
+            action_llms={"submission": small},
+        )
+        output = generator.generate(question="q", context="", playbook=Playbook())
+
+        self.assertEqual(output.final_answer, "N3")
+        self.assertEqual(output.raw["decision"]["action"], "submission")
+
+    def test_agenerate_keeps_correct_speculative_action(self) -> None:
+        decider = DummyLLMClient()
+        decider.queue(
+            json.dumps({"reasoning": "r", "action": "submission", "objective": "o"})
+        )
+        closer = DummyLLMClient()
+        closer.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "N4"})
+        )
+        playbook = Playbook()
+        playbook.add_bullet(section="flow", content="Ready to submit once N4 holds.")
+        generator = LogicDiagnosisGenerator(
+            DummyLLMClient(), decision_llm=decider, action_llms={"submission": closer}
+        )
+        output = asyncio.run(
+            generator.agenerate(question="q", context="", playbook=playbook)
+        )
+
+        self.assertEqual(output.final_answer, "N4")
+        self.assertEqual(output.raw["decision"]["action"], "submission")
+
+    def test_agenerate_without_guess_runs_sequentially(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            json.dumps({"reasoning": "r", "action": "graph", "objective": "o"})
+        )
+        client.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": ["b"], "final_answer": "N5"})
+        )
+        generator = LogicDiagnosisGenerator(client)
+        output = asyncio.run(
+            generator.agenerate(question="q", context="", playbook=Playbook())
+        )
+
+        self.assertEqual(output.final_answer, "N5")
+        self.assertEqual(output.bullet_ids, ["b"])
+
+    def test_generate_batch_preserves_request_order(self) -> None:
+        class PromptEchoClient(DummyLLMClient):
+            def complete(self, prompt, **kwargs):
+                question = prompt.split("Task: ", 1)[1].split("\n", 1)[0]
+                if "`objective`" in prompt:
+                    payload = {"reasoning": "r", "action": "graph", "objective": "o"}
+                else:
+                    payload = {"reasoning": "r", "final_answer": question}
+                return LLMResponse(text=json.dumps(payload))
+
+        generator = LogicDiagnosisGenerator(PromptEchoClient())
+        outputs = generator.generate_batch(
+            [
+                {"question": f"q{index}", "context": "", "playbook": Playbook()}
+                for index in range(5)
+            ],
+            max_concurrency=2,
+        )
+
+        self.assertEqual(
+            [output.final_answer for output in outputs],
+            [f"q{index}" for index in range(5)],
+        )
+
+    def test_generate_batch_works_inside_running_loop(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            json.dumps({"reasoning": "r", "action": "graph", "objective": "o"})
+        )
+        client.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "N2"})
+        )
+        generator = LogicDiagnosisGenerator(client)
+
+        async def run():
+            return generator.generate_batch(
+                [{"question": "q", "context": "", "playbook": Playbook()}]
+            )
+
+        outputs = asyncio.run(run())
+
+        self.assertEqual([output.final_answer for output in outputs], ["N2"])
+
+    @pytest.mark.usefixtures("isolated_cwd")
+    def test_repair_llm_fixes_bad_reply_without_resending_prompt(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            json.dumps({"reasoning": "r", "action": "matching", "objective": "o"})
+        )
+        client.queue('reasoning: r; final_answer: N6')
+        repairer = DummyLLMClient()
+        repairer.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "N6"})
+        )
+        prompts = []
+        original = repairer.complete
+
+        def recording_complete(prompt, **kwargs):
+            prompts.append(prompt)
+            return original(prompt, **kwargs)
+
+        repairer.complete = recording_complete
+        generator = LogicDiagnosisGenerator(client, repair_llm=repairer)
+        output = generator.generate(question="q", context="", playbook=Playbook())
+
+        self.assertEqual(output.final_answer, "N6")
+        self.assertIn("reasoning: r; final_answer: N6", prompts[0])
+        self.assertNotIn("Playbook", prompts[0])
+
+    def test_repair_llm_fixes_unsupported_decision(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            json.dumps({"reasoning": "r", "action": "guess", "objective": "o"})
+        )
+        client.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "N8"})
+        )
+        repairer = DummyLLMClient()
+        repairer.queue(
+            json.dumps({"reasoning": "r", "action": "matching", "objective": "o"})
+        )
+        generator = LogicDiagnosisGenerator(client, repair_llm=repairer)
+        output = generator.generate(question="q", context="", playbook=Playbook())
+
+        self.assertEqual(output.final_answer, "N8")
+        self.assertEqual(output.raw["decision"]["action"], "matching")
+
+    def test_decision_with_python_literals_is_repaired_without_retry(self) -> None:
+        client = DummyLLMClient()
+        client.queue(
+            '```json\n{"reasoning": None, "action": "matching", "objective": "o",'
+            ' "confident": True,}\n```'
+        )
+        client.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "N2"})
+        )
+        generator = LogicDiagnosisGenerator(client)
+        output = generator.generate(question="q", context="", playbook=Playbook())
+
+        self.assertEqual(output.final_answer, "N2")
+        self.assertIs(output.raw["decision"]["confident"], True)
+
+    def test_playbook_top_k_embeds_relevant_bullets_only(self) -> None:
+        playbook = Playbook()
+        playbook.add_bullet(section="tips", content="Trace the cone of PO3 first.")
+        playbook.add_bullet(section="tips", content="Batch atalanta runs overnight.")
+        generator = LogicDiagnosisGenerator(DummyLLMClient(), playbook_top_k=1)
+
+        prompt, _ = generator._render_decision_prompt(
+            question="Which gate drives PO3?",
+            context="",
+            playbook=playbook,
+            reflection=None,
+        )
+
+        self.assertIn("cone of PO3", prompt)
+        self.assertNotIn("atalanta runs", prompt)
+
+    def test_logic_layer_does_not_load_litellm_client(self) -> None:
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, ace.logic; "
+            "sys.exit('ace.llm_providers.litellm_client' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code])
+        self.assertEqual(result.returncode, 0)
+
+    def test_response_cache_replays_identical_prompts(self) -> None:
+        from ace.cache import LLMCache
+
+        client = DummyLLMClient()
+        client.queue(
+            json.dumps({"reasoning": "r", "action": "matching", "objective": "o"})
+        )
+        client.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "N1"})
+        )
+        cache = LLMCache()
+        generator = LogicDiagnosisGenerator(client, response_cache=cache)
+        first = generator.generate(question="q", context="", playbook=Playbook())
+        second = generator.generate(question="q", context="", playbook=Playbook())
+
+        self.assertEqual(first.final_answer, second.final_answer)
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 2})
+
+    def test_response_cache_coalesces_concurrent_identical_calls(self) -> None:
+        from ace.cache import LLMCache
+
+        class SlowClient(DummyLLMClient):
+            async def acomplete(self, prompt, **kwargs):
+                await asyncio.sleep(0.01)
+                return self.complete(prompt, **kwargs)
+
+        client = SlowClient()
+        client.queue(
+            json.dumps({"reasoning": "r", "action": "graph", "objective": "o"})
+        )
+        client.queue(
+            json.dumps({"reasoning": "r", "bullet_ids": [], "final_answer": "N7"})
+        )
+        generator = LogicDiagnosisGenerator(client, response_cache=LLMCache())
+        request = {"question": "q", "context": "", "playbook": Playbook()}
+        outputs = generator.generate_batch([request] * 3)
+
+        # One decision and one action call serve all three identical requests
+        self.assertEqual([output.final_answer for output in outputs], ["N7"] * 3)
+
+    def test_compressed_response_cache_round_trips(self) -> None:
+        from ace.cache import LLMCache
+
+        cache = LLMCache(compress=True)
+        text = json.dumps({"reasoning": "fan-in " * 200, "final_answer": "N9"})
+        cache.put("k", LLMResponse(text=text, raw={"model": "m"}))
+        cached = cache.get("k")
+
+        self.assertEqual((cached.text, cached.raw), (text, {"model": "m"}))
+        self.assertLess(len(cache._entries["k"][1]), len(text) // 4)
+
     def test_graph_mode_disabled_blocks_graph_action(self) -> None:
         client = DummyLLMClient()
         client.queue(
@@ -83,6 +557,8 @@ class LogicDiagnosisEnvironmentTest(unittest.TestCase):
         self.assertIn("predicted", result.feedback)
 
     def test_load_tester_responses_parses_json_schema(self) -> None:
+        from ace.logic import TesterResponseColumns
+
         payload = [
             {
                 "input_patterns": [{"PI1": 0}],
@@ -107,6 +583,13 @@ class LogicDiagnosisEnvironmentTest(unittest.TestCase):
         self.assertEqual(len(responses), 2)
         self.assertEqual(responses[0].differences, ["PO1"])
 
+        columns = TesterResponseColumns.from_responses(responses)
+        self.assertEqual(columns.input_signals, ("PI1",))
+        self.assertEqual(columns.inputs, (0, 1))
+        self.assertEqual(columns.pattern_differences(1), ["PO1"])
+        self.assertEqual(columns.differing_outputs(), ["PO1"])
+        self.assertEqual(responses[0].compute_differences(), responses[0].differences)
+
 
 if __name__ == "__main__":
     unittest.main()
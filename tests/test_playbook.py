@@ -229,6 +229,42 @@ class TestPlaybook(unittest.TestCase):
         self.assertIn("Show your work", prompt)
         self.assertIn("helpful=5", prompt)
 
+    def test_as_prompt_cache_invalidated_on_mutation(self):
+        """Test that the cached prompt is refreshed after each mutation."""
+        first = self.playbook.as_prompt()
+        self.assertIs(first, self.playbook.as_prompt())
+
+        self.playbook.tag_bullet(self.bullet1.id, "helpful")
+        self.assertIn("helpful=6", self.playbook.as_prompt())
+
+        self.playbook.remove_bullet(self.bullet2.id)
+        self.assertNotIn("Show your work", self.playbook.as_prompt())
+
+    def test_fingerprint_tracks_rendered_content(self):
+        """Test that fingerprints change with the playbook and match copies."""
+        first = self.playbook.fingerprint()
+        copy = Playbook.loads(self.playbook.dumps())
+        self.assertEqual(first, copy.fingerprint())
+
+        self.playbook.tag_bullet(self.bullet1.id, "helpful")
+        self.assertNotEqual(first, self.playbook.fingerprint())
+
+    def test_relevant_prompt_keeps_top_matching_bullets(self):
+        """Test that only the bullets closest to the query are rendered."""
+        playbook = Playbook()
+        playbook.add_bullet("logic", "Simulate the fan-in cone of the failing output")
+        playbook.add_bullet("logic", "Prefer stuck-at-0 when outputs read low")
+        playbook.add_bullet("math", "Show your work step by step")
+
+        prompt = playbook.relevant_prompt("Which cone feeds the failing output?", k=1)
+
+        self.assertIn("fan-in cone", prompt)
+        self.assertNotIn("stuck-at-0", prompt)
+        self.assertNotIn("## math", prompt)
+        self.assertEqual(
+            playbook.relevant_prompt("anything", k=3), playbook.as_prompt()
+        )
+
     def test_stats(self):
         """Test playbook statistics."""
         stats = self.playbook.stats()
@@ -0,0 +1,86 @@
+"""Tests for the v2 prompt manager."""
+
+import unittest
+from datetime import date
+
+from ace import prompts
+from ace.prompts_v2 import PromptManager, validate_prompt_output
+
+
+class TestPromptManager(unittest.TestCase):
+    """Test prompt lookup and formatting."""
+
+    def setUp(self):
+        self.manager = PromptManager()
+
+    def test_format_generator_matches_str_format(self):
+        values = {
+            "question": "What is 2 + 2?",
+            "context": "Arithmetic",
+            "playbook": "[b-1] Add carefully.",
+            "reflection": "(none)",
+        }
+        for domain in (None, "math", "code"):
+            expected = self.manager.get_generator_prompt(domain=domain).format(
+                **values
+            )
+            self.assertEqual(
+                self.manager.format_generator(domain=domain, **values), expected
+            )
+
+    def test_generator_prompt_carries_current_date(self):
+        prompt = self.manager.get_generator_prompt()
+
+        self.assertIn(f"Current Date: {date.today().isoformat()}", prompt)
+        self.assertNotIn("{current_date}", prompt)
+
+    def test_v1_versions_return_legacy_prompts(self):
+        self.assertEqual(
+            self.manager.get_generator_prompt(version="1.0"), prompts.GENERATOR_PROMPT
+        )
+        self.assertEqual(
+            self.manager.get_reflector_prompt(version="1.0"), prompts.REFLECTOR_PROMPT
+        )
+        self.assertEqual(
+            self.manager.get_curator_prompt(version="1.0"), prompts.CURATOR_PROMPT
+        )
+
+    def test_repeated_lookups_are_still_tracked(self):
+        self.manager.get_curator_prompt()
+        self.manager.get_curator_prompt()
+        self.manager.get_reflector_prompt(version="1.0")
+
+        self.assertEqual(
+            self.manager.get_stats(), {"curator-2.0": 2, "reflector-1.0": 1}
+        )
+
+
+class TestValidatePromptOutput(unittest.TestCase):
+    """Test structural checks on role outputs."""
+
+    def test_reports_missing_fields_and_bad_enums(self):
+        valid, errors = validate_prompt_output(
+            '{"reasoning": "r", "bullet_tags": [{"id": "b-1", "tag": "great"}]}',
+            "reflector",
+        )
+
+        self.assertFalse(valid)
+        self.assertEqual(
+            errors,
+            ["Missing required field: error_identification", "Invalid tag: great"],
+        )
+
+    def test_accepts_valid_curator_output(self):
+        output = '{"reasoning": "r", "operations": [{"type": "ADD"}]}'
+
+        self.assertEqual(validate_prompt_output(output, "curator"), (True, []))
+
+    def test_rejects_invalid_json(self):
+        valid, errors = validate_prompt_output("not json", "generator")
+
+        self.assertFalse(valid)
+        self.assertTrue(errors[0].startswith("Invalid JSON"))
+
+
+if __name__ == "__main__":
+    unittest.main()